@@ -0,0 +1,296 @@
+"""
+Benchmark Fixture Generator
+Produces synthetic X.com search-result pages shaped like real captures
+
+Pages mirror the markup the scraper saves: cellInnerDiv rows wrapping
+article[data-testid="tweet"] blocks with User-Name, permalink/time,
+tweetText and engagement buttons, surrounded by the class-heavy div nesting,
+inline SVG icons and script/style noise that make real captures large.
+"""
+
+import os
+import zlib
+import random
+import argparse
+from datetime import datetime, timedelta, timezone
+from html import escape
+from typing import List, Optional, Dict, Any
+
+ENGLISH_WORDS = (
+    "india news today government policy people election report video watch breaking thread "
+    "protest border economy media world state minister statement truth fake viral share support "
+    "against campaign army rally delhi mumbai kashmir youth farmers debate sources claim"
+).split()
+
+HINDI_WORDS = "भारत सरकार खबर आज लोग चुनाव सच वीडियो देखें जनता देश नेता बयान समर्थन विरोध".split()
+
+# Terms from the default keyword table so the scoring stage sees realistic hit rates
+THREAT_TERMS = (
+    "attack bomb corrupt regime communal riot independence freedom ISI propaganda "
+    "आतंक हमला बम भ्रष्ट जिहाद अलगाववाद स्वतंत्रता चीन पाकिस्तान"
+).split()
+
+HASHTAGS = ["#India", "#BreakingNews", "#Kashmir", "#Propaganda", "#FakeNews", "#भारत", "#Election2024"]
+
+CSS_CLASSES = [
+    "css-175oi2r", "r-18u37iz", "r-1wbh5a2", "r-1udh08x", "r-kzbkwu", "r-1iusvr4", "r-16y2uox",
+    "r-1777fci", "r-13awgt0", "r-bnwqim", "r-417010", "r-1habvwh", "r-dnmrzs", "r-1ny4l3l"
+]
+
+ICON_SVG = (
+    '<svg viewBox="0 0 24 24" aria-hidden="true" class="r-4qtqp9 r-yyyyoo r-dnmrzs r-bnwqim r-lrvibr '
+    'r-m6rgpd r-1xvli5t r-1hdv0qi"><g><path d="M1.751 10c0-4.42 3.584-8 8.005-8h4.366c4.49 0 8.129 '
+    '3.64 8.129 8.13 0 2.96-1.607 5.68-4.196 7.11l-8.054 4.46v-3.69h-.067c-4.49.1-8.183-3.51-8.183-8.01z">'
+    '</path></g></svg>'
+)
+
+
+def _classes(rng: random.Random, count: int = 6) -> str:
+    return ' '.join(rng.sample(CSS_CLASSES, count))
+
+
+def _wrap(rng: random.Random, inner: str, depth: int) -> str:
+    """Nest content in anonymous styled divs the way React Native Web renders it"""
+    for _ in range(depth):
+        inner = f'<div class="{_classes(rng)}">{inner}</div>'
+    return inner
+
+
+def _format_count(value: int) -> str:
+    if value >= 1_000_000:
+        return f"{value / 1_000_000:.1f}M"
+    if value >= 10_000:
+        return f"{value / 1_000:.1f}K"
+    return f"{value:,}"
+
+
+def make_tweet(rng: random.Random, tweet_id: int, author: str, posted: datetime,
+               threat_rate: float = 0.1) -> Dict[str, Any]:
+    """Random tweet content: mixed English/Hindi text, hashtags and engagement counts"""
+    words = rng.choices(ENGLISH_WORDS if rng.random() < 0.7 else HINDI_WORDS, k=rng.randint(8, 45))
+    if rng.random() < threat_rate:
+        for _ in range(rng.randint(1, 3)):
+            words.insert(rng.randrange(len(words) + 1), rng.choice(THREAT_TERMS))
+    if rng.random() < 0.4:
+        words.append(rng.choice(HASHTAGS))
+    return {
+        'tweet_id': str(tweet_id),
+        'author': author,
+        'display_name': author.replace('_', ' ').title(),
+        'timestamp': posted.strftime('%Y-%m-%dT%H:%M:%S.000Z'),
+        'text': ' '.join(words),
+        'reply_count': int(rng.paretovariate(1.5)) - 1,
+        'retweet_count': int(rng.paretovariate(1.2) * 3) - 3,
+        'like_count': int(rng.paretovariate(1.1) * 10) - 10,
+        'view_count': int(rng.paretovariate(1.0) * 500)
+    }
+
+
+def _text_html(text: str) -> str:
+    parts = []
+    for word in text.split(' '):
+        if word.startswith('#'):
+            parts.append(f'<a dir="ltr" href="/hashtag/{escape(word[1:])}?src=hashtag_click" '
+                         f'class="css-1jxf684 r-bcqeeo r-qvutc0 r-poiln3">{escape(word)}</a>')
+        else:
+            parts.append(escape(word))
+    return '<span class="css-1jxf684 r-bcqeeo r-qvutc0 r-poiln3">' + ' '.join(parts) + '</span>'
+
+
+def _button(rng: random.Random, testid: str, count: int, noun: str) -> str:
+    label = f"{count:,} {noun}. {noun.rstrip('s').title()}" if count else noun.rstrip('s').title()
+    shown = _format_count(count) if count else ''
+    return (f'<button aria-label="{label}" role="button" class="{_classes(rng, 4)}" data-testid="{testid}" '
+            f'type="button">{_wrap(rng, ICON_SVG, 2)}<span class="css-1jxf684">{shown}</span></button>')
+
+
+def render_tweet(rng: random.Random, tweet: Dict[str, Any]) -> str:
+    """Markup for one timeline row"""
+    handle, tweet_id = tweet['author'], tweet['tweet_id']
+    permalink = f"/{handle}/status/{tweet_id}"
+    user_name = (
+        f'<div class="{_classes(rng)}" data-testid="User-Name">'
+        f'<a href="/{handle}" role="link" class="{_classes(rng, 4)}"><span>{escape(tweet["display_name"])}</span></a>'
+        f'<a href="/{handle}" role="link" tabindex="-1"><span>@{escape(handle)}</span></a>'
+        f'<a href="{permalink}" dir="ltr" aria-label="{tweet["timestamp"][:10]}" role="link">'
+        f'<time datetime="{tweet["timestamp"]}">{tweet["timestamp"][:10]}</time></a></div>'
+    )
+    text = (f'<div dir="auto" lang="{"hi" if not tweet["text"].isascii() else "en"}" '
+            f'class="{_classes(rng)}" data-testid="tweetText">{_text_html(tweet["text"])}</div>')
+    actions = (
+        f'<div aria-label="actions" role="group" class="{_classes(rng, 4)}">'
+        + _button(rng, 'reply', tweet['reply_count'], 'Replies')
+        + _button(rng, 'retweet', tweet['retweet_count'], 'reposts')
+        + _button(rng, 'like', tweet['like_count'], 'Likes')
+        + f'<a href="{permalink}/analytics" aria-label="{tweet["view_count"]:,} views. View post analytics" '
+          f'role="link">{ICON_SVG}<span>{_format_count(tweet["view_count"])}</span></a></div>'
+    )
+    avatar = (f'<div class="{_classes(rng, 3)}" data-testid="Tweet-User-Avatar"><img alt="" draggable="true" '
+              f'src="https://pbs.twimg.com/profile_images/{tweet_id}/avatar_normal.jpg"></div>')
+    article = (f'<article aria-labelledby="id__{tweet_id}" role="article" tabindex="0" '
+               f'class="{_classes(rng)}" data-testid="tweet">'
+               + _wrap(rng, avatar, 2) + _wrap(rng, user_name + text + actions, 4) + '</article>')
+    return f'<div data-testid="cellInnerDiv" style="transform: translateY(0px); position: absolute; width: 100%;">' \
+           f'{_wrap(rng, article, 3)}</div>'
+
+
+def render_page(rng: random.Random, tweets: List[Dict[str, Any]], query: str,
+                target_bytes: Optional[int] = None) -> str:
+    """Full search page; padded with app-shell noise up to target_bytes when given"""
+    head = (
+        '<!DOCTYPE html><html dir="ltr" lang="en"><head><meta charset="utf-8">'
+        f'<title>{escape(query)} - Search / X</title>'
+        '<style>' + ''.join(f'.{c}{{display:flex;flex-direction:column}}' for c in CSS_CLASSES) + '</style>'
+        '</head><body style="background-color: #FFFFFF;"><div id="react-root">'
+        '<div aria-label="Home timeline" class="css-175oi2r"><main role="main">'
+        f'<section aria-labelledby="accessible-list-1" role="region"><h1 id="accessible-list-1">Search timeline</h1>'
+        f'<div aria-label="Timeline: Search timeline"><div style="position: relative; min-height: {len(tweets) * 420}px;">'
+    )
+    tail = '</div></div></section></main></div></div>'
+    body = ''.join(render_tweet(rng, tweet) for tweet in tweets)
+
+    padding = ''
+    if target_bytes:
+        shortfall = target_bytes - len((head + body + tail).encode('utf-8')) - 40
+        if shortfall > 0:
+            # Hydration state and inline scripts dominate real captures; mimic them with JSON-ish filler
+            blob = '{"entities":{"users":{},"tweets":{}},"featureSwitch":{"config":{' + \
+                   ','.join(f'"flag_{i}":{{"value":{str(i % 2 == 0).lower()}}}' for i in range(64)) + '}}}'
+            padding = '<script nonce="bench">window.__INITIAL_STATE__=' + \
+                      (blob * (shortfall // len(blob) + 1))[:shortfall] + '</script>'
+    return head + body + tail + padding + '</body></html>'
+
+
+def _created_at(timestamp: str) -> str:
+    parsed = datetime.strptime(timestamp, '%Y-%m-%dT%H:%M:%S.000Z')
+    return parsed.strftime('%a %b %d %H:%M:%S +0000 %Y')
+
+
+def timeline_entry(tweet: Dict[str, Any]) -> Dict[str, Any]:
+    """One TimelineAddEntries item shaped like the SearchTimeline GraphQL response"""
+    return {
+        'entryId': f"tweet-{tweet['tweet_id']}",
+        'sortIndex': tweet['tweet_id'],
+        'content': {
+            'entryType': 'TimelineTimelineItem',
+            '__typename': 'TimelineTimelineItem',
+            'itemContent': {
+                'itemType': 'TimelineTweet',
+                '__typename': 'TimelineTweet',
+                'tweet_results': {'result': {
+                    '__typename': 'Tweet',
+                    'rest_id': tweet['tweet_id'],
+                    'core': {'user_results': {'result': {
+                        '__typename': 'User',
+                        'rest_id': str(zlib.crc32(tweet['author'].encode('utf-8'))),
+                        'legacy': {'screen_name': tweet['author'], 'name': tweet['display_name']}
+                    }}},
+                    'views': {'count': str(tweet['view_count']), 'state': 'EnabledWithCount'},
+                    'legacy': {
+                        'id_str': tweet['tweet_id'],
+                        'created_at': _created_at(tweet['timestamp']),
+                        'full_text': tweet['text'],
+                        'lang': 'en' if tweet['text'].isascii() else 'hi',
+                        'reply_count': tweet['reply_count'],
+                        'retweet_count': tweet['retweet_count'],
+                        'favorite_count': tweet['like_count'],
+                        'quote_count': 0,
+                        'entities': {'hashtags': [], 'user_mentions': [], 'urls': []}
+                    }
+                }},
+                'tweetDisplayType': 'Tweet'
+            }
+        }
+    }
+
+
+def timeline_payload(tweets: List[Dict[str, Any]], cursor: Optional[str] = None) -> Dict[str, Any]:
+    """SearchTimeline response body for one batch of results"""
+    entries = [timeline_entry(tweet) for tweet in tweets]
+    if cursor:
+        entries.append({
+            'entryId': f"cursor-bottom-{cursor}",
+            'sortIndex': '0',
+            'content': {'entryType': 'TimelineTimelineCursor', 'value': cursor, 'cursorType': 'Bottom'}
+        })
+    return {'data': {'search_by_raw_query': {'search_timeline': {'timeline': {
+        'instructions': [{'type': 'TimelineAddEntries', 'entries': entries}]
+    }}}}}
+
+
+def generate_timeline_payloads(pages: int = 5, tweets_per_page: int = 20, threat_rate: float = 0.1,
+                               authors: int = 200, seed: int = 42) -> List[Dict[str, Any]]:
+    """Consecutive SearchTimeline pages, each pointing at the next through its bottom cursor"""
+    rng = random.Random(seed)
+    handles = [f"user_{i:05d}" for i in range(authors)]
+    start = datetime(2024, 5, 1, tzinfo=timezone.utc)
+    next_id = 1_790_000_000_000_000_000
+    payloads = []
+    for page in range(pages):
+        tweets = []
+        for _ in range(tweets_per_page):
+            posted = start + timedelta(seconds=next_id % 10_000_000)
+            tweets.append(make_tweet(rng, next_id, rng.choice(handles), posted, threat_rate))
+            next_id += rng.randint(1, 5000)
+        payloads.append(timeline_payload(tweets, str(page + 1) if page + 1 < pages else None))
+    return payloads
+
+
+def generate_captures(out_dir: str, captures: int = 20, tweets_per_capture: int = 40,
+                      page_bytes: Optional[int] = None, overlap: float = 0.3, threat_rate: float = 0.1,
+                      authors: int = 500, seed: int = 42) -> List[str]:
+    """Write captures named like TwitterScraper output; returns their paths
+
+    overlap is the fraction of each page drawn from tweets already shown on
+    earlier pages, which is what the dedup stage sees when queries repeat.
+    """
+    rng = random.Random(seed)
+    os.makedirs(out_dir, exist_ok=True)
+    handles = [f"user_{i:05d}" for i in range(authors)]
+    queries = ["anti india campaign", "india propaganda", "fake news india", "india disinformation"]
+    start = datetime(2024, 5, 1, tzinfo=timezone.utc)
+    pool: List[Dict[str, Any]] = []
+    next_id = 1_790_000_000_000_000_000
+    paths = []
+
+    for index in range(captures):
+        tweets = []
+        for _ in range(tweets_per_capture):
+            if pool and rng.random() < overlap:
+                tweets.append(rng.choice(pool))
+                continue
+            posted = start + timedelta(seconds=next_id % 10_000_000)
+            tweet = make_tweet(rng, next_id, rng.choice(handles), posted, threat_rate)
+            next_id += rng.randint(1, 5000)
+            pool.append(tweet)
+            tweets.append(tweet)
+
+        query = queries[index % len(queries)]
+        captured = start + timedelta(hours=index)
+        name = f"twitter_search_{query.replace(' ', '_')}_{captured.strftime('%Y%m%d_%H%M%S')}.html"
+        path = os.path.join(out_dir, name)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(render_page(rng, tweets, query, page_bytes))
+        paths.append(path)
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate synthetic X.com search captures")
+    parser.add_argument('out_dir')
+    parser.add_argument('--captures', type=int, default=20)
+    parser.add_argument('--tweets', type=int, default=40, help="tweets per capture")
+    parser.add_argument('--page-kb', type=int, default=0, help="pad each page to this size")
+    parser.add_argument('--overlap', type=float, default=0.3)
+    parser.add_argument('--threat-rate', type=float, default=0.1)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    paths = generate_captures(args.out_dir, args.captures, args.tweets, args.page_kb * 1024 or None,
+                              args.overlap, args.threat_rate, seed=args.seed)
+    total = sum(os.path.getsize(path) for path in paths)
+    print(f"📝 Wrote {len(paths)} captures ({total / 1024 / 1024:.1f} MB) to {args.out_dir}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,267 @@
+"""
+Pipeline Benchmark Runner
+Times extraction, dedup, scoring and storage over generated captures
+
+Runs entirely offline: fixtures are generated into a temporary directory and
+every store/index is created there, so nothing touches the real data
+directory, the network or a Twitter login.
+
+    python -m benchmarks.run_pipeline --captures 50 --tweets 40 --page-kb 400
+    python -m benchmarks.run_pipeline --compare benchmarks/results/previous.json
+"""
+
+import os
+import sys
+import gc
+import json
+import time
+import shutil
+import platform
+import argparse
+import tempfile
+import threading
+import subprocess
+from datetime import datetime
+from typing import Optional, List, Dict, Any
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT_DIR)
+sys.path.append(os.path.join(ROOT_DIR, 'src'))
+
+from twitter.processor import BatchProcessor, FileResult
+from twitter.dedup import TweetDedupIndex
+from twitter.scoring import ThreatScorer
+from twitter.tweet_store import ParquetTweetStore
+
+from benchmarks.fixtures import generate_captures
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results')
+
+
+def _current_rss() -> Optional[int]:
+    """Resident set size of this process in bytes (Linux), None when unavailable"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def _max_rss(who: int) -> int:
+    if resource is None:
+        return 0
+    peak = resource.getrusage(who).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+class RssSampler:
+    """Tracks peak RSS while a stage runs
+
+    ru_maxrss is a lifetime high-water mark and cannot be reset between
+    stages, so the current RSS is sampled on a background thread instead;
+    without /proc the lifetime peak is reported.
+    """
+
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self.peak = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.peak = max(self.peak, _current_rss() or 0)
+
+    def __enter__(self):
+        rss = _current_rss()
+        if rss is not None:
+            self.peak = rss
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self.peak = max(self.peak, _current_rss() or 0)
+        else:
+            self.peak = _max_rss(resource.RUSAGE_SELF) if resource else 0
+
+
+class Stage:
+    """Timer plus throughput counters for one pipeline stage"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.tweets = 0
+        self.bytes = 0
+        self.seconds = 0.0
+        self.extra: Dict[str, Any] = {}
+        self._sampler = RssSampler()
+
+    def __enter__(self):
+        gc.collect()
+        self._sampler.__enter__()
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.seconds = time.perf_counter() - self._started
+        self._sampler.__exit__(exc_type, exc_val, exc_tb)
+
+    def result(self) -> Dict[str, Any]:
+        seconds = max(self.seconds, 1e-9)
+        result = {
+            'seconds': round(self.seconds, 4),
+            'tweets': self.tweets,
+            'bytes': self.bytes,
+            'tweets_per_s': round(self.tweets / seconds, 1),
+            'mb_per_s': round(self.bytes / seconds / 1024 / 1024, 2),
+            'peak_rss_mb': round(self._sampler.peak / 1024 / 1024, 1)
+        }
+        result.update(self.extra)
+        return result
+
+
+def _text_bytes(records) -> int:
+    return sum(len(record.text.encode('utf-8')) for record in records)
+
+
+def run_benchmark(work_dir: str, captures: int, tweets: int, page_bytes: Optional[int], workers: int,
+                  chunk_size: int, overlap: float, seed: int) -> Dict[str, Any]:
+    fixture_dir = os.path.join(work_dir, 'captures')
+    started = time.perf_counter()
+    paths = generate_captures(fixture_dir, captures, tweets, page_bytes, overlap=overlap, seed=seed)
+    fixture_bytes = sum(os.path.getsize(path) for path in paths)
+    print(f"📝 Generated {len(paths)} captures, {fixture_bytes / 1024 / 1024:.1f} MB "
+          f"in {time.perf_counter() - started:.1f}s")
+
+    stages: Dict[str, Stage] = {}
+
+    with Stage('extraction') as stage:
+        processor = BatchProcessor(workers=workers, chunk_size=chunk_size)
+        results: List[FileResult] = list(processor.iter_results(paths))
+        stage.tweets = sum(len(result.records) for result in results)
+        stage.bytes = fixture_bytes
+        stage.extra['failed_captures'] = sum(1 for result in results if not result.ok)
+        stage.extra['workers'] = processor.workers
+    stages['extraction'] = stage
+
+    with Stage('dedup') as stage:
+        with TweetDedupIndex(os.path.join(work_dir, 'dedup.db'), bloom_capacity=max(1000, captures * tweets)) as index:
+            fresh = []
+            for result in results:
+                records, _ = index.filter_new(result.records, result.query, result.captured_at)
+                fresh.append((result, records))
+                stage.tweets += len(result.records)
+                stage.bytes += _text_bytes(result.records)
+        stage.extra['unique_tweets'] = sum(len(records) for _, records in fresh)
+    stages['dedup'] = stage
+
+    with Stage('scoring') as stage:
+        scorer = ThreatScorer()
+        flagged = 0
+        for _, records in fresh:
+            if records:
+                flagged += len(scorer.score_records(records).flagged())
+            stage.tweets += len(records)
+            stage.bytes += _text_bytes(records)
+        stage.extra['flagged_tweets'] = flagged
+    stages['scoring'] = stage
+
+    with Stage('storage') as stage:
+        store = ParquetTweetStore(os.path.join(work_dir, 'tweets'))
+        for result, records in fresh:
+            stage.tweets += store.append(records, result.query or 'unknown', result.captured_at)
+            stage.bytes += _text_bytes(records)
+        stage.extra['stored_rows'] = store.read_table(columns=['tweet_id']).num_rows
+    stages['storage'] = stage
+
+    return {
+        'fixtures': {
+            'captures': len(paths),
+            'tweets_per_capture': tweets,
+            'bytes': fixture_bytes,
+            'page_bytes': page_bytes,
+            'overlap': overlap,
+            'seed': seed
+        },
+        'stages': {name: stage.result() for name, stage in stages.items()},
+        'children_peak_rss_mb': round(_max_rss(resource.RUSAGE_CHILDREN) / 1024 / 1024, 1) if resource else None
+    }
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__)), timeout=5).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def print_report(report: Dict[str, Any], baseline: Optional[Dict[str, Any]] = None) -> None:
+    print(f"\n{'stage':<12}{'seconds':>10}{'tweets/s':>12}{'MB/s':>9}{'peak RSS':>11}" + ("  vs baseline" if baseline else ''))
+    for name, stage in report['stages'].items():
+        line = (f"{name:<12}{stage['seconds']:>10.3f}{stage['tweets_per_s']:>12,.0f}"
+                f"{stage['mb_per_s']:>9.2f}{stage['peak_rss_mb']:>9.1f}MB")
+        previous = (baseline or {}).get('stages', {}).get(name)
+        if previous and previous.get('tweets_per_s'):
+            change = (stage['tweets_per_s'] / previous['tweets_per_s'] - 1) * 100
+            line += f"  {change:+.1f}% tweets/s"
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline benchmark of the tweet processing pipeline")
+    parser.add_argument('--captures', type=int, default=40)
+    parser.add_argument('--tweets', type=int, default=40, help="tweets per capture")
+    parser.add_argument('--page-kb', type=int, default=300, help="pad each capture to this size (0 = no padding)")
+    parser.add_argument('--overlap', type=float, default=0.3, help="fraction of repeated tweets per capture")
+    parser.add_argument('--workers', type=int, default=0, help="extraction processes (0 = PROCESS_WORKERS / cpu count)")
+    parser.add_argument('--chunk-size', type=int, default=0)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', help="result JSON path (default benchmarks/results/<timestamp>.json)")
+    parser.add_argument('--compare', help="previous result JSON to compare against")
+    parser.add_argument('--keep', action='store_true', help="keep the temporary work directory")
+    args = parser.parse_args()
+
+    work_dir = tempfile.mkdtemp(prefix='twitter-bench-')
+    try:
+        report = run_benchmark(work_dir, args.captures, args.tweets, args.page_kb * 1024 or None,
+                               args.workers or None, args.chunk_size or None, args.overlap, args.seed)
+    finally:
+        if args.keep:
+            print(f"📁 Work directory kept at {work_dir}")
+        else:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    report.update({
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'commit': _git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count()
+    })
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+    print_report(report, baseline)
+
+    output = args.output or os.path.join(RESULTS_DIR, f"pipeline_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"\n💾 Results written to {output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,183 @@
+"""
+Local X.com Stand-in
+Serves a search page that loads recorded SearchTimeline payloads, for offline capture runs
+
+The search page renders tweets from /i/api/graphql/<id>/SearchTimeline
+responses and requests the next payload (by bottom cursor) whenever the
+window is scrolled near the end, like the real timeline. Point the scraper
+at it with TWITTER_BASE_URL:
+
+    python -m benchmarks.standin --port 8765 --pages 5
+    TWITTER_BASE_URL=http://127.0.0.1:8765 CAPTURE_MODE=network HEADLESS_MODE=true \\
+        python src/twitter/main.py --single "india"
+
+Payloads come from a capture recorded in network mode (--replay file.jsonl)
+or are generated with benchmarks.fixtures.
+"""
+
+import os
+import sys
+import json
+import argparse
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import List, Dict, Any, Optional, Tuple
+from urllib.parse import urlparse, parse_qs
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT_DIR)
+
+from benchmarks.fixtures import generate_timeline_payloads
+
+SEARCH_PAGE = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>Search / X (stand-in)</title></head>
+<body>
+<div aria-label="Timeline: Search timeline"><div id="timeline"></div></div>
+<div style="height: 2000px"></div>
+<script>
+let cursor = '0', loading = false;
+function render(payload) {
+  const timeline = document.getElementById('timeline');
+  const walk = (node) => {
+    if (Array.isArray(node)) { node.forEach(walk); return; }
+    if (!node || typeof node !== 'object') return;
+    if (node.cursorType === 'Bottom') cursor = node.value;
+    if (node.tweet_results && node.tweet_results.result) {
+      const t = node.tweet_results.result, user = t.core.user_results.result.legacy;
+      const cell = document.createElement('div');
+      cell.setAttribute('data-testid', 'cellInnerDiv');
+      cell.innerHTML = '<article data-testid="tweet"><div data-testid="User-Name"><span></span>' +
+        '<a href="/' + user.screen_name + '/status/' + t.rest_id + '"><time datetime="' +
+        new Date(t.legacy.created_at).toISOString() + '"></time></a></div>' +
+        '<div data-testid="tweetText"></div></article>';
+      cell.querySelector('span').textContent = user.name;
+      cell.querySelector('[data-testid="tweetText"]').textContent = t.legacy.full_text;
+      timeline.appendChild(cell);
+      return;
+    }
+    Object.values(node).forEach(walk);
+  };
+  cursor = null;
+  walk(payload);
+}
+async function loadMore() {
+  if (loading || cursor === null) return;
+  loading = true;
+  try {
+    const response = await fetch('/i/api/graphql/standin/SearchTimeline?cursor=' + encodeURIComponent(cursor));
+    render(await response.json());
+  } finally {
+    loading = false;
+  }
+}
+window.addEventListener('scroll', () => {
+  if (window.innerHeight + window.scrollY >= document.body.scrollHeight - 1500) loadMore();
+});
+loadMore();
+</script>
+</body></html>
+"""
+
+
+class StandinState:
+    """Payloads served by cursor; cursor '0' is the first page"""
+
+    def __init__(self, payloads: List[Dict[str, Any]]):
+        self.payloads = payloads
+        self.requests: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def count(self, path: str) -> None:
+        with self._lock:
+            self.requests[path] = self.requests.get(path, 0) + 1
+
+    def payload(self, cursor: str) -> Optional[Dict[str, Any]]:
+        try:
+            index = int(cursor)
+        except ValueError:
+            return None
+        return self.payloads[index] if 0 <= index < len(self.payloads) else None
+
+
+def make_handler(state: StandinState):
+    class Handler(BaseHTTPRequestHandler):
+        def _send(self, status: int, body: bytes, content_type: str) -> None:
+            self.send_response(status)
+            self.send_header('Content-Type', content_type)
+            self.send_header('Content-Length', str(len(body)))
+            self.send_header('Cache-Control', 'no-store')
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            state.count(url.path)
+            if url.path.endswith('/SearchTimeline'):
+                cursor = parse_qs(url.query).get('cursor', ['0'])[0]
+                payload = state.payload(cursor)
+                if payload is None:
+                    self._send(404, b'{"errors":[{"message":"unknown cursor"}]}', 'application/json')
+                else:
+                    self._send(200, json.dumps(payload, separators=(',', ':')).encode('utf-8'), 'application/json')
+            elif url.path in ('/search', '/home', '/'):
+                self._send(200, SEARCH_PAGE.encode('utf-8'), 'text/html; charset=utf-8')
+            else:
+                self._send(404, b'not found', 'text/plain')
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+def load_replay(path: str) -> List[Dict[str, Any]]:
+    """Payloads from a network-mode capture, re-linked so each points to the next by cursor"""
+    with open(path, 'r', encoding='utf-8') as f:
+        payloads = [json.loads(line) for line in f if line.strip()]
+
+    def relink(node, cursor):
+        if isinstance(node, dict):
+            if node.get('cursorType') == 'Bottom':
+                node['value'] = cursor
+            for value in node.values():
+                relink(value, cursor)
+        elif isinstance(node, list):
+            for item in node:
+                relink(item, cursor)
+
+    for index, payload in enumerate(payloads):
+        relink(payload, str(index + 1))
+    return payloads
+
+
+def start_server(payloads: List[Dict[str, Any]], host: str = '127.0.0.1',
+                 port: int = 0) -> Tuple[ThreadingHTTPServer, StandinState]:
+    """Serve payloads on a background thread; port 0 picks a free port (see server.server_address)"""
+    state = StandinState(payloads)
+    server = ThreadingHTTPServer((host, port), make_handler(state))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, state
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve a local X.com search stand-in")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--replay', help="network-mode capture (.jsonl) to serve")
+    parser.add_argument('--pages', type=int, default=5, help="generated payload pages")
+    parser.add_argument('--tweets', type=int, default=20, help="tweets per generated page")
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    payloads = load_replay(args.replay) if args.replay else \
+        generate_timeline_payloads(args.pages, args.tweets, seed=args.seed)
+    server, _ = start_server(payloads, args.host, args.port)
+    print(f"🛰️ Serving {len(payloads)} timeline payloads at http://{args.host}:{server.server_address[1]}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
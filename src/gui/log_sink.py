@@ -0,0 +1,97 @@
+"""
+GUI Log Sink Module
+Bounded, thread-safe log buffer flushed into the Tk activity log in batches
+"""
+
+import logging
+import tkinter as tk
+from collections import deque
+from datetime import datetime
+from typing import Optional, List
+
+
+class LogSink:
+    """Collects log lines from any thread and shows them in a Text widget
+
+    write() only appends to a deque, so scraper threads and logging handlers
+    never touch Tk. flush() runs on the Tk thread (once per
+    check_message_queue tick) and inserts everything pending with a single
+    insert. The widget is trimmed to `max_lines` by line index, using a
+    running line count instead of re-reading its contents. `history` keeps
+    the same last `max_lines` lines for copying or saving.
+    """
+
+    def __init__(self, widget: Optional[tk.Text] = None, max_lines: int = 1000):
+        self.widget = widget
+        self.max_lines = max_lines
+        self.history: deque = deque(maxlen=max_lines)
+        # Lines beyond max_lines would be trimmed right away, so the backlog is bounded too
+        self._pending: deque = deque(maxlen=max_lines)
+        self._widget_lines = 0
+        self.written = 0
+        self.dropped = 0
+
+    def attach(self, widget: tk.Text) -> None:
+        self.widget = widget
+        self._widget_lines = 0
+
+    def write(self, message: str, timestamp: Optional[float] = None) -> None:
+        """Queue a message; safe to call from any thread"""
+        moment = datetime.fromtimestamp(timestamp) if timestamp is not None else datetime.now()
+        prefix = f"[{moment.strftime('%H:%M:%S')}] "
+        for line in str(message).splitlines() or ['']:
+            if len(self._pending) == self._pending.maxlen:
+                self.dropped += 1
+            self._pending.append(prefix + line)
+            self.written += 1
+
+    def flush(self) -> int:
+        """Move pending lines into the widget; call from the Tk thread. Returns lines added"""
+        if not self._pending or self.widget is None:
+            return 0
+        batch: List[str] = []
+        while self._pending:
+            try:
+                batch.append(self._pending.popleft())
+            except IndexError:
+                break
+        self.history.extend(batch)
+
+        widget = self.widget
+        # Follow new output only if the user has not scrolled up to read older lines
+        at_bottom = widget.yview()[1] >= 0.999
+        widget.insert(tk.END, '\n'.join(batch) + '\n')
+        self._widget_lines += len(batch)
+
+        excess = self._widget_lines - self.max_lines
+        if excess > 0:
+            widget.delete('1.0', f'{excess + 1}.0')
+            self._widget_lines = self.max_lines
+        if at_bottom:
+            widget.see(tk.END)
+        return len(batch)
+
+    def clear(self) -> None:
+        self._pending.clear()
+        self.history.clear()
+        if self.widget is not None:
+            self.widget.delete('1.0', tk.END)
+        self._widget_lines = 0
+
+
+class LogSinkHandler(logging.Handler):
+    """Forwards log records (e.g. from the scraper thread) to a LogSink"""
+
+    def __init__(self, sink: LogSink, level: int = logging.INFO):
+        super().__init__(level)
+        self.sink = sink
+        self.setFormatter(logging.Formatter('%(message)s'))
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            message = self.format(record)
+            if record.levelno >= logging.WARNING:
+                message = f"{record.levelname}: {message}"
+            self.sink.write(message, record.created)
+        except Exception:
+            self.handleError(record)
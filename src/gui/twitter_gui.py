@@ -9,7 +9,6 @@ import threading
 import asyncio
 import os
 import sys
-from datetime import datetime
 from typing import List, Optional
 import queue
 import json
@@ -21,9 +20,17 @@ logger = logging.getLogger(__name__)
 # Add parent directory to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-# Import the simplified scraper (TwitterDatabase removed in simplified version)
 from twitter.scraper import TwitterScraper
 from twitter.config import TwitterConfig
+from twitter.database import TwitterDatabase
+from twitter.processor import BatchProcessor
+from twitter.pipeline import IngestPipeline, INGEST_CHECKPOINT
+from twitter.tweet_store import ParquetTweetStore
+from twitter.dedup import TweetDedupIndex
+from twitter.analysis import AnalysisConsumers, attach_record_pipeline
+from twitter.browser_pool import BrowserPool
+from twitter.rate_control import RateController
+from gui.log_sink import LogSink, LogSinkHandler
 
 class TwitterScraperGUI:
     def __init__(self, root):
@@ -44,16 +51,33 @@ class TwitterScraperGUI:
         self.scraping_thread = None
         self.is_scraping = False
         
-        # TODO: Database functionality removed in simplified version
-        # Next developer should implement TwitterDatabase for queue management
-        # self.db = TwitterDatabase()
+        # Long-lived event loop holding the browser pool, so browsers stay warm between runs
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.browser_pool: Optional[BrowserPool] = None
+        self.rate_controller: Optional[RateController] = None
+        
+        # Persistent task queue
+        self.db = TwitterDatabase()
+        
+        # Activity log buffer, shown in batches; scraper log records are forwarded into it
+        self.log_sink = LogSink(max_lines=1000)
+        self.log_handler = LogSinkHandler(self.log_sink)
+        logging.getLogger('twitter').addHandler(self.log_handler)
         
         # Setup GUI
         self.setup_gui()
         
+        # Tasks this GUI claimed before it was closed or killed mid-task go back to the queue
+        requeued = self.db.requeue_running('gui')
+        if requeued:
+            self.add_log(f"Requeued {requeued} task(s) left running by the previous session")
+        
         # Start message queue checker
         self.check_message_queue()
         
+        # Shut the browser pool down with the window
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+        
     def setup_gui(self):
         """Setup the GUI components"""
         
@@ -262,6 +286,7 @@ class TwitterScraperGUI:
             wrap=tk.WORD
         )
         self.log_text.pack(fill='both', expand=True, padx=10, pady=10)
+        self.log_sink.attach(self.log_text)
         
         # Add initial log message
         self.add_log("Application started - Ready for scraping")
@@ -332,18 +357,8 @@ class TwitterScraperGUI:
         ).pack(side='right')
     
     def add_log(self, message: str):
-        """Add message to log with timestamp"""
-        timestamp = datetime.now().strftime("%H:%M:%S")
-        log_entry = f"[{timestamp}] {message}\n"
-        
-        # Insert at the end
-        self.log_text.insert(tk.END, log_entry)
-        self.log_text.see(tk.END)  # Auto-scroll to bottom
-        
-        # Keep only last 1000 lines
-        lines = self.log_text.get('1.0', tk.END).split('\n')
-        if len(lines) > 1000:
-            self.log_text.delete('1.0', f'{len(lines) - 1000}.0')
+        """Add message to log with timestamp (shown on the next message queue tick)"""
+        self.log_sink.write(message)
     
     def update_status(self, status: str):
         """Update status display"""
@@ -358,14 +373,8 @@ class TwitterScraperGUI:
             return
         
         try:
-            # TODO: Database functionality removed in simplified version
-            # Next developer should implement task queue management with TwitterDatabase
-            # For now, just add to a simple list for immediate processing
-            if not hasattr(self, 'pending_queries'):
-                self.pending_queries = []
-            
-            if query not in self.pending_queries:
-                self.pending_queries.append(query)
+            task_id = self.db.add_task(query)
+            if task_id is not None:
                 self.add_log(f"Added to queue: '{query}'")
             else:
                 self.add_log(f"Query already in queue: '{query}'")
@@ -378,16 +387,9 @@ class TwitterScraperGUI:
         """Add all default queries to queue"""
         try:
             queries = TwitterConfig.DEFAULT_SEARCH_QUERIES
-            if not hasattr(self, 'pending_queries'):
-                self.pending_queries = []
-            
-            count = 0
-            for query in queries:
-                if query not in self.pending_queries:
-                    self.pending_queries.append(query)
-                    count += 1
+            task_ids = self.db.add_tasks(queries)
             
-            self.add_log(f"Added {count} default queries to queue")
+            self.add_log(f"Added {len(task_ids)} default queries to queue")
             self.update_status_display()
         except Exception as e:
             messagebox.showerror("Error", f"Failed to add default queries: {str(e)}")
@@ -409,53 +411,41 @@ class TwitterScraperGUI:
     def run_html_processing_thread(self):
         """Run HTML processing in separate thread"""
         try:
-            # Create new event loop for this thread
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            
-            # Run HTML processing
-            result = loop.run_until_complete(self.process_html_async())
-            
-            # Update GUI on completion
-            self.message_queue.put(('log', f"✅ HTML processing completed: {result} files processed"))
-            self.message_queue.put(('status', f"HTML processing completed: {result} files"))
-            
-        except Exception as e:
-            self.message_queue.put(('error', f"HTML processing error: {str(e)}"))
-    
-    async def process_html_async(self):
-        """Async HTML processing execution"""
-        try:
-            # TODO: Database functionality removed in simplified version
-            # Next developer should implement TwitterDataProcessor with database
-            # For now, just scan for HTML files in data directory
-            
-            import os
-            import glob
+            processor = BatchProcessor()
+            pipeline = IngestPipeline(processor, ParquetTweetStore(), dedup=TweetDedupIndex())
+            # Flagged tweets, clusters, bursts and emerging terms are logged by the detectors and reach the
+            # activity log through the log sink
+            influence = AnalysisConsumers(keep_results=False).attach(pipeline).influence
+            captures = pipeline.find_new_captures()
+            self.message_queue.put(('log', f"📂 Found {len(captures)} new captures, using {processor.workers} worker processes"))
             
-            html_dir = os.path.join("data", "twitter")
-            if not os.path.exists(html_dir):
-                return 0
-            
-            html_files = glob.glob(os.path.join(html_dir, "*.html"))
+            def report(result, stats):
+                name = os.path.basename(result.path)
+                if result.ok:
+                    self.message_queue.put(('log', f"📄 {name}: {len(result.records)} tweets"))
+                else:
+                    self.message_queue.put(('log', f"❌ {name}: {result.error}"))
             
-            # TODO: Process HTML files with BeautifulSoup when database is added
-            # This is just a placeholder for the next developer
+            stats = pipeline.run(captures, on_result=report, checkpoint=INGEST_CHECKPOINT)
             
-            return len(html_files)
+            # Update GUI on completion
+            self.message_queue.put(('log', f"🐦 Extracted {stats.tweets} tweets, {stats.duplicates} already seen, stored {stats.stored} ({stats.failed} captures failed)"))
+            for row in influence.author_scores(limit=5).itertuples():
+                self.message_queue.put(('log', f"⭐ @{row.author}: influence {row.score:.3f} over {row.tweets} tweets"))
+            self.message_queue.put(('log', f"✅ HTML processing completed: {stats.captures} files processed"))
+            self.message_queue.put(('status', f"HTML processing completed: {stats.captures} files"))
             
         except Exception as e:
             logger.error(f"HTML processing error: {str(e)}")
-            raise
+            self.message_queue.put(('error', f"HTML processing error: {str(e)}"))
     
     def clear_queue(self):
         """Clear all pending tasks from queue"""
         if messagebox.askyesno("Confirm", "Clear all pending tasks from queue?"):
             try:
-                # This would require a new method in TwitterDatabase
-                # For now, just log the action
-                self.add_log("Queue clear requested - Feature not implemented yet")
-                messagebox.showinfo("Info", "Queue clear feature will be added in next update")
+                removed = self.db.clear_pending()
+                self.add_log(f"🗑️ Cleared {removed} pending tasks from queue")
+                self.update_status_display()
             except Exception as e:
                 messagebox.showerror("Error", f"Failed to clear queue: {str(e)}")
     
@@ -529,15 +519,19 @@ class TwitterScraperGUI:
         self.update_status("Stopping scraper...")
         self.add_log("Stop requested - scraper will stop after current task")
     
+    def get_loop(self) -> asyncio.AbstractEventLoop:
+        """Return the background event loop, starting it on first use"""
+        if self.loop is None:
+            self.loop = asyncio.new_event_loop()
+            threading.Thread(target=self.loop.run_forever, name="browser-loop", daemon=True).start()
+        return self.loop
+    
     def run_scraper_thread(self):
         """Run scraper in separate thread"""
         try:
-            # Create new event loop for this thread
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            
-            # Run scraper
-            loop.run_until_complete(self.run_scraper_async())
+            # Runs on the shared loop; this thread only waits for the result
+            future = asyncio.run_coroutine_threadsafe(self.run_scraper_async(), self.get_loop())
+            future.result()
             
         except Exception as e:
             self.message_queue.put(('error', f"Scraping error: {str(e)}"))
@@ -549,7 +543,21 @@ class TwitterScraperGUI:
         try:
             settings = TwitterConfig.get_scraper_settings()
             
-            async with TwitterScraper(headless=settings['headless']) as scraper:
+            # Reuse warm browsers unless the headless setting changed since the last run
+            if self.browser_pool and self.browser_pool.headless != settings['headless']:
+                await self.browser_pool.close()
+                self.browser_pool = None
+            if self.browser_pool is None:
+                self.browser_pool = BrowserPool(headless=settings['headless'])
+            
+            # Pacing adapts from outcomes and carries over between runs
+            if self.rate_controller is None:
+                self.rate_controller = RateController()
+            
+            async with TwitterScraper(headless=settings['headless'], pool=self.browser_pool,
+                                      rate=self.rate_controller) as scraper:
+                scraper.db = self.db
+                attach_record_pipeline(scraper)
                 self.message_queue.put(('status', "Logging in to Twitter..."))
                 
                 # Login
@@ -561,38 +569,31 @@ class TwitterScraperGUI:
                 
                 # Process queue with status updates
                 completed_count = 0
-                pending_tasks = self.db.get_pending_tasks()
-                total_tasks = len(pending_tasks)
+                total_tasks = len(self.db.get_pending_tasks())
+                i = 0
                 
-                for i, task in enumerate(pending_tasks, 1):
-                    if not self.is_scraping:  # Check stop flag
-                        self.message_queue.put(('status', "Scraping stopped by user"))
+                while self.is_scraping:
+                    task = self.db.claim_next_task(worker_id='gui')
+                    if task is None:
                         break
-                    
-                    if task.id is None:  # Skip tasks without valid ID
-                        continue
+                    i += 1
                     
                     self.message_queue.put(('status', f"Processing task {i}/{total_tasks}: {task.query}"))
                     
-                    try:
-                        self.db.update_task_status(task.id, 'running')
-                        result_file = await scraper.search_and_scrape(task.query, task.id)
-                        
-                        if result_file:
-                            self.db.update_task_status(task.id, 'completed', result_file)
-                            completed_count += 1
-                            self.message_queue.put(('log', f"✅ Completed: {task.query}"))
-                        else:
-                            self.db.update_task_status(task.id, 'failed', error_message="Search failed")
-                            self.message_queue.put(('log', f"❌ Failed: {task.query}"))
-                        
-                        # Delay between tasks
-                        if i < total_tasks and self.is_scraping:
-                            await scraper.random_delay(10, 15)
-                            
-                    except Exception as e:
-                        self.db.update_task_status(task.id, 'failed', error_message=str(e))
-                        self.message_queue.put(('log', f"❌ Error in {task.query}: {str(e)}"))
+                    if await scraper.run_task(task):
+                        completed_count += 1
+                        self.message_queue.put(('log', f"✅ Completed: {task.query}"))
+                    elif not scraper.session_valid:
+                        self.message_queue.put(('error', "Session expired; log in again and restart scraping"))
+                        break
+                    else:
+                        self.message_queue.put(('log', f"❌ Failed: {task.query}"))
+                    
+                    # The next search waits for the rate controller instead of a fixed delay
+                    self.message_queue.put(('log', f"⏱️ Pacing: {self.rate_controller.describe()}"))
+                
+                if not self.is_scraping:
+                    self.message_queue.put(('status', "Scraping stopped by user"))
                 
                 self.message_queue.put(('status', f"Completed {completed_count}/{total_tasks} tasks"))
                 
@@ -618,6 +619,9 @@ class TwitterScraperGUI:
         except queue.Empty:
             pass
         
+        # One widget update per tick for everything logged since the last one
+        self.log_sink.flush()
+        
         # Schedule next check
         self.root.after(100, self.check_message_queue)
     
@@ -634,6 +638,20 @@ class TwitterScraperGUI:
         # Show completion message
         messagebox.showinfo("Complete", "Scraping process completed!\nCheck the activity log for details.")
     
+    def on_close(self):
+        """Close pooled browsers and stop the background loop before exiting"""
+        self.is_scraping = False
+        logging.getLogger('twitter').removeHandler(self.log_handler)
+        if self.loop is not None:
+            if self.browser_pool is not None:
+                future = asyncio.run_coroutine_threadsafe(self.browser_pool.close(), self.loop)
+                try:
+                    future.result(timeout=self.browser_pool.close_timeout + 5)
+                except Exception as e:
+                    logger.warning(f"Browser pool shutdown failed: {e}")
+            self.loop.call_soon_threadsafe(self.loop.stop)
+        self.root.destroy()
+    
     def open_data_folder(self):
         """Open the data folder"""
         settings = TwitterConfig.get_scraper_settings()
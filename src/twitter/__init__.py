@@ -3,15 +3,20 @@ Twitter Module
 Enhanced Twitter scraper with SQLite queue and improved reliability
 """
 
-from .scraper import TwitterScraper, TwitterCredentials, TwitterDatabase, ScrapingTask
+from .scraper import TwitterScraper, TwitterCredentials
+from .database import TwitterDatabase, ScrapingTask
 from .config import TwitterConfig
+from .extractor import TweetExtractor, TweetRecord, extract_tweets
 
 __all__ = [
     'TwitterScraper',
     'TwitterCredentials', 
     'TwitterDatabase',
     'ScrapingTask',
-    'TwitterConfig'
+    'TwitterConfig',
+    'TweetExtractor',
+    'TweetRecord',
+    'extract_tweets'
 ]
 
 __version__ = '1.0.0'
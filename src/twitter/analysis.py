@@ -0,0 +1,96 @@
+"""
+Analysis Consumers Module
+One set of analysis stages (threat scoring, near-duplicates, coordination, graph, influence, trends)
+for every ingestion pipeline, whether it reads saved captures or live network captures
+"""
+
+import logging
+from typing import Optional, List
+
+from .config import TwitterConfig
+from .extractor import TweetRecord
+from .pipeline import IngestPipeline
+from .tweet_store import ParquetTweetStore
+from .dedup import TweetDedupIndex
+from .scoring import ThreatScorer
+from .similarity import NearDuplicateIndex, DuplicateCluster
+from .coordination import CoordinationDetector, BurstEvent
+from .graph import InteractionGraph
+from .influence import InfluenceScorer
+from .trends import TrendTracker, TrendingTerm
+
+logger = logging.getLogger(__name__)
+
+
+class AnalysisConsumers:
+    """The analysis stages fed by one pipeline, plus what they found during the run
+
+    New records go to the threat scorer, near-duplicate index, coordination
+    detector and trend tracker. The interaction graph and influence scorer are
+    registered with include_duplicates=True, since retweets and re-captures
+    still change their state. Long-lived scrapers pass keep_results=False so
+    findings are only logged, not accumulated for the life of the process.
+    """
+
+    def __init__(self, threshold: Optional[float] = None, keep_results: bool = True):
+        self.scorer = ThreatScorer()
+        self.threshold = threshold if threshold is not None else TwitterConfig.get_analysis_settings()['threat_threshold']
+        self.near_duplicates = NearDuplicateIndex()
+        self.detector = CoordinationDetector()
+        self.graph = InteractionGraph()
+        self.influence = InfluenceScorer()
+        self.trends = TrendTracker()
+        self.keep_results = keep_results
+
+        self.flagged: List[TweetRecord] = []
+        self.clusters: List[DuplicateCluster] = []
+        self.bursts: List[BurstEvent] = []
+        self.emerging: List[TrendingTerm] = []
+
+    def attach(self, pipeline: IngestPipeline) -> 'AnalysisConsumers':
+        pipeline.add_consumer(self.score)
+        pipeline.add_consumer(self.cluster)
+        pipeline.add_consumer(self.detect)
+        pipeline.add_consumer(self.graph.consume, include_duplicates=True)
+        pipeline.add_consumer(self.influence.consume, include_duplicates=True)
+        pipeline.add_consumer(self.track)
+        return self
+
+    def score(self, records: List[TweetRecord], query: Optional[str], captured_at: Optional[str]) -> None:
+        scores = self.scorer.score_records(records)
+        flagged = [records[i] for i in scores.flagged(self.threshold)]
+        if flagged:
+            logger.info(f"🚨 {len(flagged)} tweets at or above threat score {self.threshold} for '{query}'")
+        if self.keep_results:
+            self.flagged.extend(flagged)
+
+    def cluster(self, records: List[TweetRecord], query: Optional[str], captured_at: Optional[str]) -> None:
+        clusters = self.near_duplicates.consume(records, query, captured_at)
+        if self.keep_results:
+            self.clusters.extend(clusters)
+
+    def detect(self, records: List[TweetRecord], query: Optional[str], captured_at: Optional[str]) -> None:
+        bursts = self.detector.consume(records, query, captured_at)
+        if self.keep_results:
+            self.bursts.extend(bursts)
+
+    def track(self, records: List[TweetRecord], query: Optional[str], captured_at: Optional[str]) -> None:
+        emerging = self.trends.consume(records, query, captured_at)
+        if self.keep_results:
+            self.emerging.extend(emerging)
+
+
+def record_pipeline() -> IngestPipeline:
+    """Dedup, tweet store and analysis for tweets captured live in network mode"""
+    pipeline = IngestPipeline(store=ParquetTweetStore(), dedup=TweetDedupIndex())
+    AnalysisConsumers(keep_results=False).attach(pipeline)
+    return pipeline
+
+
+def attach_record_pipeline(scraper, pipeline: Optional[IngestPipeline] = None) -> Optional[IngestPipeline]:
+    """In network capture mode, feed the scraper's captured tweets through `pipeline` (a new one by default)"""
+    if scraper.capture_mode != 'network':
+        return None
+    pipeline = pipeline or record_pipeline()
+    scraper.record_sink = pipeline.ingest_records
+    return pipeline
@@ -0,0 +1,315 @@
+"""
+HTML Archive Module
+Compressed, content-addressed storage for search captures with a SQLite index
+"""
+
+import io
+import os
+import re
+import gzip
+import sqlite3
+import asyncio
+import hashlib
+import logging
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional, List, Dict, Any, Iterator, Union, IO, Tuple
+
+from .config import TwitterConfig
+
+try:
+    import zstandard
+except ImportError:  # Optional dependency, gzip is always available
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+# Loose capture names written by TwitterScraper.search_and_scrape
+_CAPTURE_FILENAME = re.compile(r'^twitter_search_(?P<query>.*)_(?P<ts>\d{8}_\d{6})\.(?:html|jsonl)$')
+
+
+def parse_capture_filename(path: str) -> Tuple[str, str]:
+    """Recover (query, captured_at) from a loose capture's name, falling back to its mtime"""
+    name = os.path.basename(path)
+    match = _CAPTURE_FILENAME.match(name)
+    if match:
+        query = match.group('query').replace('_', ' ')
+        captured_at = datetime.strptime(match.group('ts'), '%Y%m%d_%H%M%S').isoformat()
+    else:
+        query = os.path.splitext(name)[0]
+        captured_at = datetime.fromtimestamp(os.path.getmtime(path)).isoformat(timespec='seconds')
+    return query, captured_at
+
+
+def available_codec(preferred: Optional[str] = None) -> str:
+    """Pick the compression codec, falling back to gzip when zstandard is missing"""
+    codec = (preferred or 'zstd').lower()
+    if codec == 'zstd' and zstandard is None:
+        return 'gzip'
+    if codec not in ('zstd', 'gzip'):
+        raise ValueError(f"Unsupported archive codec: {codec}")
+    return codec
+
+
+def compress(data: bytes, codec: str) -> bytes:
+    if codec == 'zstd':
+        return zstandard.ZstdCompressor(level=9).compress(data)
+    return gzip.compress(data, compresslevel=6)
+
+
+def open_decompressed(payload: bytes, codec: str) -> IO[bytes]:
+    """Streaming reader over a compressed payload"""
+    if codec == 'zstd':
+        if zstandard is None:
+            raise RuntimeError("zstandard is required to read zstd archive entries")
+        return zstandard.ZstdDecompressor().stream_reader(io.BytesIO(payload))
+    return gzip.GzipFile(fileobj=io.BytesIO(payload), mode='rb')
+
+
+@dataclass
+class ArchiveEntry:
+    """Index row describing one stored capture"""
+    id: int
+    query: str
+    captured_at: str
+    hash: str
+    size: int
+    length: int
+    pack: str
+    offset: int
+    codec: str
+    filename: Optional[str] = None
+
+    @property
+    def label(self) -> str:
+        return self.filename or f"archive:{self.hash[:12]}"
+
+    def read_compressed(self) -> bytes:
+        with open(self.pack, 'rb') as f:
+            f.seek(self.offset)
+            return f.read(self.length)
+
+    def open(self) -> IO[bytes]:
+        """Open the capture as a decompressing byte stream"""
+        return open_decompressed(self.read_compressed(), self.codec)
+
+    def read_bytes(self) -> bytes:
+        with self.open() as stream:
+            return stream.read()
+
+
+class HtmlArchive:
+    """Append-only pack files plus an index of captures
+
+    Each distinct payload is compressed once and appended to the current pack
+    file; identical captures only add an index row pointing at the existing
+    blob. The index records query, capture time, size, hash and pack offset so
+    captures can be looked up without listing the directory.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS blobs (
+            hash TEXT PRIMARY KEY,
+            pack TEXT NOT NULL,
+            offset INTEGER NOT NULL,
+            length INTEGER NOT NULL,
+            size INTEGER NOT NULL,
+            codec TEXT NOT NULL
+        ) WITHOUT ROWID;
+        CREATE TABLE IF NOT EXISTS captures (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            query TEXT NOT NULL,
+            captured_at TEXT NOT NULL,
+            hash TEXT NOT NULL REFERENCES blobs(hash),
+            filename TEXT
+        );
+        CREATE INDEX IF NOT EXISTS idx_captures_query_time ON captures (query, captured_at);
+        CREATE INDEX IF NOT EXISTS idx_captures_time ON captures (captured_at);
+        CREATE INDEX IF NOT EXISTS idx_captures_hash ON captures (hash, id);
+        CREATE TABLE IF NOT EXISTS checkpoints (
+            name TEXT PRIMARY KEY,
+            capture_id INTEGER NOT NULL
+        ) WITHOUT ROWID;
+    """
+
+    def __init__(self, root: Optional[str] = None, codec: Optional[str] = None,
+                 pack_size_limit: Optional[int] = None):
+        settings = TwitterConfig.get_archive_settings()
+        self.root = root or settings['root']
+        self.codec = available_codec(codec or settings['codec'])
+        self.pack_size_limit = pack_size_limit or settings['pack_size_limit']
+        self.index_path = os.path.join(self.root, 'index.db')
+        os.makedirs(self.root, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.executescript(self.SCHEMA)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self.index_path, timeout=30.0, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        conn.execute('PRAGMA synchronous=NORMAL')
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _pack_name(number: int) -> str:
+        return f"pack-{number:05d}.bin"
+
+    def _current_pack(self, conn: sqlite3.Connection) -> str:
+        """Name of the latest pack file, rolling over once it passes the size limit"""
+        pack = conn.execute("SELECT MAX(pack) FROM blobs").fetchone()[0]
+        if pack is None:
+            return self._pack_name(1)
+        path = os.path.join(self.root, pack)
+        if os.path.exists(path) and os.path.getsize(path) >= self.pack_size_limit:
+            number = int(re.search(r'pack-(\d+)\.bin$', pack).group(1)) + 1
+            return self._pack_name(number)
+        return pack
+
+    def _entry(self, row: sqlite3.Row) -> ArchiveEntry:
+        fields = {key: row[key] for key in row.keys()}
+        fields['pack'] = os.path.join(self.root, fields['pack'])
+        return ArchiveEntry(**fields)
+
+    def has(self, content_hash: str) -> bool:
+        with self._connect() as conn:
+            return conn.execute("SELECT 1 FROM blobs WHERE hash = ?", (content_hash,)).fetchone() is not None
+
+    def put(self, content: Union[str, bytes], query: str, captured_at: Optional[str] = None,
+            filename: Optional[str] = None) -> ArchiveEntry:
+        """Store a capture, reusing the blob when an identical payload already exists"""
+        data = content.encode('utf-8') if isinstance(content, str) else content
+        content_hash = hashlib.sha256(data).hexdigest()
+        captured_at = captured_at or datetime.now().isoformat(timespec='seconds')
+
+        # Compress outside the write lock; skipped entirely for known payloads
+        payload = None if self.has(content_hash) else compress(data, self.codec)
+
+        with self._connect() as conn:
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                exists = conn.execute("SELECT 1 FROM blobs WHERE hash = ?", (content_hash,)).fetchone()
+                if not exists:
+                    if payload is None:
+                        payload = compress(data, self.codec)
+                    pack = self._current_pack(conn)
+                    with open(os.path.join(self.root, pack), 'ab') as f:
+                        offset = f.tell()
+                        f.write(payload)
+                    conn.execute(
+                        "INSERT INTO blobs (hash, pack, offset, length, size, codec) VALUES (?, ?, ?, ?, ?, ?)",
+                        (content_hash, pack, offset, len(payload), len(data), self.codec)
+                    )
+                cursor = conn.execute(
+                    "INSERT INTO captures (query, captured_at, hash, filename) VALUES (?, ?, ?, ?)",
+                    (query, captured_at, content_hash, filename)
+                )
+                capture_id = cursor.lastrowid
+                conn.execute('COMMIT')
+            except Exception:
+                conn.execute('ROLLBACK')
+                raise
+
+        entry = self.get_entry(capture_id)
+        if exists:
+            logger.info(f"♻️ Duplicate capture for '{query}' stored as reference to {content_hash[:12]}")
+        else:
+            logger.info(f"🗜️ Archived '{query}': {len(data):,} → {len(payload):,} bytes ({self.codec})")
+        return entry
+
+    async def put_async(self, content: Union[str, bytes], query: str, captured_at: Optional[str] = None,
+                        filename: Optional[str] = None) -> ArchiveEntry:
+        """Store a capture without blocking the event loop"""
+        return await asyncio.to_thread(self.put, content, query, captured_at, filename)
+
+    _ENTRY_SQL = """
+        SELECT c.id, c.query, c.captured_at, c.hash, c.filename,
+               b.size, b.length, b.pack, b.offset, b.codec
+        FROM captures c JOIN blobs b ON b.hash = c.hash
+    """
+
+    def get_entry(self, capture_id: int) -> Optional[ArchiveEntry]:
+        with self._connect() as conn:
+            row = conn.execute(self._ENTRY_SQL + " WHERE c.id = ?", (capture_id,)).fetchone()
+        return self._entry(row) if row else None
+
+    def find(self, query: Optional[str] = None, since: Optional[str] = None, until: Optional[str] = None,
+             limit: Optional[int] = None, unique: bool = False, after_id: Optional[int] = None) -> List[ArchiveEntry]:
+        """Look up captures by query and capture time (ISO strings)
+
+        With unique=True only the latest capture of each distinct payload is
+        returned, so identical captures are processed once. after_id skips
+        captures indexed at or before that id, whatever their capture time.
+        """
+        clauses, params = [], []
+        if query is not None:
+            clauses.append("c.query = ?")
+            params.append(query)
+        if since is not None:
+            clauses.append("c.captured_at >= ?")
+            params.append(since)
+        if until is not None:
+            clauses.append("c.captured_at < ?")
+            params.append(until)
+        if after_id is not None:
+            clauses.append("c.id > ?")
+            params.append(after_id)
+        if unique:
+            clauses.append("c.id = (SELECT MAX(id) FROM captures WHERE hash = c.hash)")
+
+        sql = self._ENTRY_SQL
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY c.captured_at, c.id"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+
+        with self._connect() as conn:
+            return [self._entry(row) for row in conn.execute(sql, params)]
+
+    def get_checkpoint(self, name: str) -> int:
+        """Highest capture id a named consumer of the archive has finished with (0 if none)"""
+        with self._connect() as conn:
+            row = conn.execute("SELECT capture_id FROM checkpoints WHERE name = ?", (name,)).fetchone()
+        return row['capture_id'] if row else 0
+
+    def set_checkpoint(self, name: str, capture_id: int) -> None:
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO checkpoints (name, capture_id) VALUES (?, ?) "
+                "ON CONFLICT(name) DO UPDATE SET capture_id = excluded.capture_id",
+                (name, capture_id)
+            )
+
+    def read(self, entry: ArchiveEntry) -> str:
+        return entry.read_bytes().decode('utf-8')
+
+    def stats(self) -> Dict[str, Any]:
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT COUNT(*) AS blobs, COALESCE(SUM(size), 0) AS raw, COALESCE(SUM(length), 0) AS stored FROM blobs"
+            ).fetchone()
+            captures = conn.execute("SELECT COUNT(*) FROM captures").fetchone()[0]
+        return {
+            'captures': captures,
+            'blobs': row['blobs'],
+            'raw_bytes': row['raw'],
+            'stored_bytes': row['stored']
+        }
+
+    def import_files(self, paths: List[str], remove: bool = False) -> int:
+        """Move loose twitter_search_*.html captures into the archive"""
+        imported = 0
+        for path in paths:
+            query, captured_at = parse_capture_filename(path)
+            with open(path, 'rb') as f:
+                self.put(f.read(), query, captured_at, filename=os.path.basename(path))
+            if remove:
+                os.remove(path)
+            imported += 1
+        return imported
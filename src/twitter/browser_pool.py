@@ -0,0 +1,270 @@
+"""
+Browser Pool Module
+Keeps Chromium processes warm across scraping jobs and recycles them by job count or memory
+"""
+
+import os
+import time
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from typing import Optional, List, Dict, Any
+
+from playwright.async_api import async_playwright, Browser
+
+from .config import TwitterConfig
+
+logger = logging.getLogger(__name__)
+
+LAUNCH_ARGS = [
+    '--no-first-run',
+    '--no-default-browser-check',
+    '--disable-blink-features=AutomationControlled',
+    '--disable-features=VizDisplayCompositor',
+    '--disable-web-security',
+    '--no-sandbox',
+    '--disable-dev-shm-usage'
+]
+
+_PAGE_SIZE = os.sysconf('SC_PAGE_SIZE') if hasattr(os, 'sysconf') else 4096
+
+
+# Compared by identity, so list lookups never confuse two launch placeholders
+@dataclass(eq=False)
+class PooledBrowser:
+    """One Chromium process handed out by the pool"""
+    browser: Browser
+    number: int
+    launched_at: float = field(default_factory=time.monotonic)
+    jobs: int = 0
+    leased: bool = False
+    retired: bool = False
+
+    @property
+    def age(self) -> float:
+        return time.monotonic() - self.launched_at
+
+
+class BrowserPool:
+    """Warm Chromium processes shared by successive TwitterScraper sessions
+
+    A single async_playwright instance launches up to `size` browsers on
+    demand. acquire() hands out an idle browser (or waits for one), and the
+    caller opens its own context on it, so sessions never share cookies or
+    pages. On release() a browser is retired once it has served `max_jobs`
+    jobs or its processes use more than `max_memory_mb` of RSS, and the next
+    acquire() launches a replacement. close() waits for leased browsers up
+    to `close_timeout` seconds, then closes everything and stops Playwright.
+
+    The pool belongs to the event loop it was first used on.
+    """
+
+    def __init__(self, headless: Optional[bool] = None, size: Optional[int] = None,
+                 max_jobs: Optional[int] = None, max_memory_mb: Optional[float] = None,
+                 close_timeout: Optional[float] = None):
+        settings = TwitterConfig.get_pool_settings()
+        self.headless = headless if headless is not None else TwitterConfig.get_scraper_settings()['headless']
+        self.size = max(1, size or settings['size'])
+        self.max_jobs = max_jobs if max_jobs is not None else settings['max_jobs']
+        self.max_memory_mb = max_memory_mb if max_memory_mb is not None else settings['max_memory_mb']
+        self.close_timeout = close_timeout if close_timeout is not None else settings['close_timeout']
+
+        self._playwright = None
+        self._browsers: List[PooledBrowser] = []
+        self._condition: Optional[asyncio.Condition] = None
+        # Guards starting and stopping the one Playwright driver shared by all browsers
+        self._driver_lock: Optional[asyncio.Lock] = None
+        self._launched = 0
+        self._closing = False
+        self.stats: Dict[str, int] = {'launched': 0, 'reused': 0, 'recycled': 0, 'crashed': 0}
+
+    @property
+    def closed(self) -> bool:
+        return self._closing
+
+    def _lock(self) -> asyncio.Condition:
+        if self._condition is None:
+            self._condition = asyncio.Condition()
+        return self._condition
+
+    def _driver_guard(self) -> asyncio.Lock:
+        if self._driver_lock is None:
+            self._driver_lock = asyncio.Lock()
+        return self._driver_lock
+
+    async def _driver(self):
+        """The Playwright driver, started by the first launch; concurrent launches share it"""
+        async with self._driver_guard():
+            if self._closing:
+                raise RuntimeError("Browser pool is closed")
+            if self._playwright is None:
+                self._playwright = await async_playwright().start()
+            return self._playwright
+
+    async def _launch(self) -> PooledBrowser:
+        playwright = await self._driver()
+        browser = await playwright.chromium.launch(headless=self.headless, args=LAUNCH_ARGS)
+        self._launched += 1
+        self.stats['launched'] += 1
+        pooled = PooledBrowser(browser, self._launched)
+        logger.info(f"🚀 Launched browser #{pooled.number} ({len(self._browsers)}/{self.size} in pool)")
+        return pooled
+
+    async def acquire(self) -> PooledBrowser:
+        """Lease a browser, launching one if the pool is below its size"""
+        condition = self._lock()
+        async with condition:
+            while True:
+                if self._closing:
+                    raise RuntimeError("Browser pool is closed")
+                pooled = self._take_idle()
+                if pooled is not None:
+                    return pooled
+                if len(self._browsers) < self.size:
+                    break
+                await condition.wait()
+            # Reserve the slot before launching so concurrent acquires don't overshoot size
+            placeholder = PooledBrowser(None, 0, leased=True)
+            self._browsers.append(placeholder)
+
+        try:
+            pooled = await self._launch()
+        except Exception:
+            async with condition:
+                if placeholder in self._browsers:
+                    self._browsers.remove(placeholder)
+                condition.notify_all()
+            raise
+        async with condition:
+            # close() may have started, or already swapped the list out, while the browser launched
+            closing = self._closing
+            if placeholder in self._browsers:
+                if closing:
+                    self._browsers.remove(placeholder)
+                else:
+                    self._browsers[self._browsers.index(placeholder)] = pooled
+                    pooled.leased = True
+            else:
+                closing = True
+            condition.notify_all()
+        if closing:
+            try:
+                await pooled.browser.close()
+            except Exception as e:
+                logger.debug(f"Closing browser #{pooled.number} failed: {e}")
+            raise RuntimeError("Browser pool is closed")
+        return pooled
+
+    def _take_idle(self) -> Optional[PooledBrowser]:
+        for pooled in list(self._browsers):
+            if pooled.leased:
+                continue
+            if not pooled.browser.is_connected():
+                logger.warning(f"⚠️ Browser #{pooled.number} disconnected, replacing it")
+                self.stats['crashed'] += 1
+                self._browsers.remove(pooled)
+                continue
+            pooled.leased = True
+            self.stats['reused'] += 1
+            return pooled
+        return None
+
+    async def release(self, pooled: PooledBrowser, jobs: int = 1) -> None:
+        """Return a leased browser, counting its jobs and retiring it when it is due"""
+        pooled.jobs += max(1, jobs)
+        reason = await self._retire_reason(pooled)
+        if reason:
+            logger.info(f"♻️ Recycling browser #{pooled.number}: {reason}")
+            self.stats['recycled'] += 1
+            await self._discard(pooled)
+        condition = self._lock()
+        async with condition:
+            pooled.leased = False
+            condition.notify_all()
+
+    async def _retire_reason(self, pooled: PooledBrowser) -> Optional[str]:
+        if self._closing:
+            return None
+        if not pooled.browser.is_connected():
+            self.stats['crashed'] += 1
+            return "disconnected"
+        if self.max_jobs and pooled.jobs >= self.max_jobs:
+            return f"{pooled.jobs} jobs"
+        if self.max_memory_mb:
+            memory = await self.memory_mb(pooled)
+            if memory is not None and memory > self.max_memory_mb:
+                return f"{memory:.0f} MB RSS"
+        return None
+
+    async def _discard(self, pooled: PooledBrowser) -> None:
+        pooled.retired = True
+        condition = self._lock()
+        async with condition:
+            if pooled in self._browsers:
+                self._browsers.remove(pooled)
+        try:
+            await pooled.browser.close()
+        except Exception as e:
+            logger.debug(f"Closing browser #{pooled.number} failed: {e}")
+
+    async def memory_mb(self, pooled: PooledBrowser) -> Optional[float]:
+        """Resident memory of the browser and its renderer/GPU processes, where /proc is available"""
+        if not os.path.isdir('/proc'):
+            return None
+        try:
+            session = await pooled.browser.new_browser_cdp_session()
+            try:
+                info = await session.send('SystemInfo.getProcessInfo')
+            finally:
+                await session.detach()
+        except Exception as e:
+            logger.debug(f"Process info unavailable for browser #{pooled.number}: {e}")
+            return None
+
+        total = 0
+        for process in info.get('processInfo', []):
+            try:
+                with open(f"/proc/{int(process['id'])}/statm", 'r') as f:
+                    total += int(f.read().split()[1]) * _PAGE_SIZE
+            except (OSError, ValueError, KeyError, IndexError):
+                continue
+        return total / (1024 * 1024) if total else None
+
+    async def close(self) -> None:
+        """Wait for leased browsers (up to close_timeout), close all of them and stop Playwright"""
+        condition = self._lock()
+        async with condition:
+            self._closing = True
+            condition.notify_all()
+            try:
+                await asyncio.wait_for(
+                    condition.wait_for(lambda: not any(p.leased for p in self._browsers)), self.close_timeout
+                )
+            except asyncio.TimeoutError:
+                logger.warning(f"⚠️ Closing browser pool with browsers still leased after {self.close_timeout:.0f}s")
+            browsers, self._browsers = self._browsers, []
+
+        for pooled in browsers:
+            if pooled.browser is not None:
+                try:
+                    await pooled.browser.close()
+                except Exception as e:
+                    logger.debug(f"Closing browser #{pooled.number} failed: {e}")
+        async with self._driver_guard():
+            if self._playwright is not None:
+                await self._playwright.stop()
+                self._playwright = None
+        logger.info(f"🧹 Browser pool closed ({self.summary()})")
+
+    def summary(self) -> str:
+        return ', '.join(f"{name} {count}" for name, count in self.stats.items())
+
+    def info(self) -> Dict[str, Any]:
+        return {
+            'size': self.size,
+            'browsers': [
+                {'number': p.number, 'jobs': p.jobs, 'age': round(p.age, 1), 'leased': p.leased}
+                for p in self._browsers if p.browser is not None
+            ],
+            **self.stats
+        }
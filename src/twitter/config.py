@@ -39,6 +39,24 @@ class TwitterConfig:
         'reply_button': '[data-testid="reply"]'
     }
     
+    # Request blocking profiles for the browser context (see routing.RequestBlocker)
+    RESOURCE_PROFILES = {
+        'full': {
+            'block_types': [],
+            'block_patterns': []
+        },
+        'text-only': {
+            # Playwright resource types; documents, scripts, xhr/fetch and stylesheets still load
+            'block_types': ['image', 'media', 'font', 'texttrack', 'ping', 'eventsource', 'manifest'],
+            'block_patterns': [
+                r'://[^/]*\.?(google-analytics|googletagmanager|doubleclick|ads-twitter|analytics\.twitter)\.com/',
+                r'://video\.twimg\.com/',
+                r'/1\.1/jot/',
+                r'/i/api/1\.1/live_pipeline/'
+            ]
+        }
+    }
+    
     @classmethod
     def get_credentials(cls) -> Dict[str, str]:
         """Get Twitter credentials from environment"""
@@ -57,7 +75,183 @@ class TwitterConfig:
             'scroll_count': int(os.getenv('SCROLL_COUNT', '3')),
             'max_retries': int(os.getenv('MAX_RETRIES', '3')),
             'data_dir': os.getenv('DATA_DIR', 'data'),
-            'db_path': os.getenv('DB_PATH', 'data/twitter_data.db')
+            'db_path': os.getenv('DB_PATH', 'data/twitter_data.db'),
+            'concurrent_pages': int(os.getenv('CONCURRENT_PAGES', '3')),
+            'capture_mode': os.getenv('CAPTURE_MODE', 'full').lower(),
+            'incremental_max_scrolls': int(os.getenv('INCREMENTAL_MAX_SCROLLS', '20')),
+            'idle_scroll_limit': int(os.getenv('IDLE_SCROLL_LIMIT', '2')),
+            'base_url': os.getenv('TWITTER_BASE_URL', 'https://x.com').rstrip('/'),
+            'timeline_url_pattern': os.getenv('TIMELINE_URL_PATTERN', r'/i/api/graphql/[^/]+/SearchTimeline'),
+            'network_html_fallback': os.getenv('NETWORK_HTML_FALLBACK', 'true').lower() == 'true',
+            'resource_profile': os.getenv('RESOURCE_PROFILE', 'text-only').lower(),
+            'ready_min_tweets': int(os.getenv('READY_MIN_TWEETS', '3')),
+            'ready_timeout': float(os.getenv('READY_TIMEOUT', '15')),
+            'scroll_ready_timeout': float(os.getenv('SCROLL_READY_TIMEOUT', '5')),
+            'scroll_delay_min': float(os.getenv('SCROLL_DELAY_MIN', '1')),
+            'scroll_delay_max': float(os.getenv('SCROLL_DELAY_MAX', '2'))
+        }
+    
+    @classmethod
+    def get_rate_settings(cls) -> Dict[str, Any]:
+        """Get adaptive search pacing settings from environment (rates in searches per minute)"""
+        return {
+            'initial_rate': float(os.getenv('RATE_INITIAL_PER_MIN', '6')),
+            'min_rate': float(os.getenv('RATE_MIN_PER_MIN', '1')),
+            'max_rate': float(os.getenv('RATE_MAX_PER_MIN', '20')),
+            'burst': float(os.getenv('RATE_BURST', '2')),
+            'increase': float(os.getenv('RATE_INCREASE_PER_MIN', '0.5')),
+            'decrease': float(os.getenv('RATE_DECREASE_FACTOR', '0.5')),
+            'cooldown': float(os.getenv('RATE_DECREASE_COOLDOWN', '30')),
+            'jitter': float(os.getenv('RATE_JITTER', '0.3')),
+            'retry_base': float(os.getenv('RETRY_BASE_SECONDS', '2')),
+            'retry_max': float(os.getenv('RETRY_MAX_SECONDS', '60')),
+            'window': float(os.getenv('RATE_WINDOW_SECONDS', '600'))
+        }
+    
+    @classmethod
+    def get_metrics_settings(cls) -> Dict[str, Any]:
+        """Get scraper metrics export settings from environment"""
+        return {
+            'export': os.getenv('METRICS_EXPORT', 'off').lower(),
+            'path': os.getenv('METRICS_PATH') or None
+        }
+    
+    @classmethod
+    def get_session_settings(cls) -> Dict[str, Any]:
+        """Get saved session settings from environment"""
+        data_dir = os.getenv('DATA_DIR', 'data')
+        return {
+            'session_file': os.getenv('SESSION_FILE', os.path.join(data_dir, 'twitter_session.json')),
+            'verify_cache_path': os.getenv('SESSION_VERIFY_CACHE', os.path.join(data_dir, 'twitter_session_verified.json')),
+            'verify_ttl': float(os.getenv('SESSION_VERIFY_TTL', '1800')),
+            'max_age_days': float(os.getenv('SESSION_MAX_AGE_DAYS', '30'))
+        }
+    
+    @classmethod
+    def get_worker_settings(cls) -> Dict[str, Any]:
+        """Get queue worker and supervisor settings from environment"""
+        return {
+            'workers': int(os.getenv('WORKER_COUNT', '2')),
+            'heartbeat_interval': float(os.getenv('WORKER_HEARTBEAT_SECONDS', '10')),
+            'heartbeat_timeout': float(os.getenv('WORKER_HEARTBEAT_TIMEOUT', '120')),
+            # Claims by holders without a live heartbeat (GUI, CLI) are released after this long; 0 disables
+            'claim_timeout': float(os.getenv('TASK_CLAIM_TIMEOUT', '3600')),
+            'poll_interval': float(os.getenv('WORKER_POLL_SECONDS', '5')),
+            'session_tasks': int(os.getenv('WORKER_SESSION_TASKS', '20')),
+            'drain_timeout': float(os.getenv('WORKER_DRAIN_TIMEOUT', '180')),
+            'restart_backoff_max': float(os.getenv('WORKER_RESTART_BACKOFF_MAX', '60'))
+        }
+    
+    @classmethod
+    def get_pool_settings(cls) -> Dict[str, Any]:
+        """Get browser pool settings from environment"""
+        return {
+            'size': int(os.getenv('BROWSER_POOL_SIZE', '1')),
+            'max_jobs': int(os.getenv('BROWSER_MAX_JOBS', '50')),
+            'max_memory_mb': float(os.getenv('BROWSER_MAX_MEMORY_MB', '1500')),
+            'close_timeout': float(os.getenv('BROWSER_CLOSE_TIMEOUT', '30'))
+        }
+    
+    @classmethod
+    def get_processing_settings(cls) -> Dict[str, Any]:
+        """Get HTML batch processing settings from environment"""
+        return {
+            'workers': int(os.getenv('PROCESS_WORKERS', '0')) or (os.cpu_count() or 1),
+            'chunk_size': int(os.getenv('PROCESS_CHUNK_SIZE', '8')),
+            'html_dir': os.getenv('HTML_DIR', os.path.join(os.getenv('DATA_DIR', 'data'), 'twitter'))
+        }
+    
+    @classmethod
+    def get_archive_settings(cls) -> Dict[str, Any]:
+        """Get HTML archive settings from environment"""
+        return {
+            'html_storage': os.getenv('HTML_STORAGE', 'archive').lower(),
+            'root': os.getenv('ARCHIVE_DIR', os.path.join(os.getenv('DATA_DIR', 'data'), 'twitter', 'archive')),
+            'codec': os.getenv('ARCHIVE_CODEC', 'zstd').lower(),
+            'pack_size_limit': int(float(os.getenv('ARCHIVE_PACK_MB', '256')) * 1024 * 1024)
+        }
+    
+    @classmethod
+    def get_storage_settings(cls) -> Dict[str, Any]:
+        """Get extracted tweet storage settings from environment"""
+        db_dir = os.path.dirname(os.getenv('DB_PATH', 'data/twitter_data.db'))
+        return {
+            'tweet_store_dir': os.getenv('TWEET_STORE_DIR', os.path.join(os.getenv('DATA_DIR', 'data'), 'tweets')),
+            'dedup_db_path': os.getenv('DEDUP_DB_PATH', os.path.join(db_dir, 'tweet_dedup.db')),
+            'dedup_bloom_capacity': int(os.getenv('DEDUP_BLOOM_CAPACITY', '5000000'))
+        }
+    
+    @classmethod
+    def get_analysis_settings(cls) -> Dict[str, Any]:
+        """Get tweet analysis settings from environment"""
+        return {
+            'keywords_path': os.getenv('THREAT_KEYWORDS_PATH', os.path.join(os.path.dirname(__file__), 'threat_keywords.json')),
+            'keyword_reload_interval': float(os.getenv('KEYWORD_RELOAD_SECONDS', '5')),
+            'threat_threshold': float(os.getenv('THREAT_THRESHOLD', '0.6'))
+        }
+    
+    @classmethod
+    def get_similarity_settings(cls) -> Dict[str, Any]:
+        """Get near-duplicate (MinHash / LSH) detection settings from environment"""
+        db_dir = os.path.dirname(os.getenv('DB_PATH', 'data/twitter_data.db'))
+        return {
+            'db_path': os.getenv('SIMILARITY_DB_PATH', os.path.join(db_dir, 'tweet_similarity.db')),
+            'num_perm': int(os.getenv('SIMILARITY_NUM_PERM', '128')),
+            'bands': int(os.getenv('SIMILARITY_BANDS', '16')),
+            'shingle_size': int(os.getenv('SIMILARITY_SHINGLE_SIZE', '5')),
+            'threshold': float(os.getenv('SIMILARITY_THRESHOLD', '0.8')),
+            'min_chars': int(os.getenv('SIMILARITY_MIN_CHARS', '30')),
+            'min_authors': int(os.getenv('SIMILARITY_MIN_AUTHORS', '2')),
+            'max_candidates': int(os.getenv('SIMILARITY_MAX_CANDIDATES', '200'))
+        }
+    
+    @classmethod
+    def get_coordination_settings(cls) -> Dict[str, Any]:
+        """Get coordinated posting (burst) detection settings from environment"""
+        return {
+            'window_seconds': float(os.getenv('COORDINATION_WINDOW_SECONDS', '300')),
+            'bucket_seconds': float(os.getenv('COORDINATION_BUCKET_SECONDS', '10')),
+            'min_authors': int(os.getenv('COORDINATION_MIN_AUTHORS', '10')),
+            'max_keys': int(os.getenv('COORDINATION_MAX_KEYS', '5000')),
+            'registers': int(os.getenv('COORDINATION_REGISTERS', '64')),
+            'min_text_chars': int(os.getenv('COORDINATION_MIN_TEXT_CHARS', '30'))
+        }
+    
+    @classmethod
+    def get_graph_settings(cls) -> Dict[str, Any]:
+        """Get account interaction graph settings from environment"""
+        db_dir = os.path.dirname(os.getenv('DB_PATH', 'data/twitter_data.db'))
+        return {
+            'db_path': os.getenv('GRAPH_DB_PATH', os.path.join(db_dir, 'interaction_graph.db')),
+            'k_hop_limit': int(os.getenv('GRAPH_K_HOP_LIMIT', '10000')),
+            'pagerank_damping': float(os.getenv('GRAPH_PAGERANK_DAMPING', '0.85'))
+        }
+    
+    @classmethod
+    def get_influence_settings(cls) -> Dict[str, Any]:
+        """Get influence scoring weights and time decay settings from environment"""
+        return {
+            'weights': {
+                'views': float(os.getenv('INFLUENCE_WEIGHT_VIEWS', '0.2')),
+                'forwards': float(os.getenv('INFLUENCE_WEIGHT_FORWARDS', '0.35')),
+                'replies': float(os.getenv('INFLUENCE_WEIGHT_REPLIES', '0.2')),
+                'reactions': float(os.getenv('INFLUENCE_WEIGHT_REACTIONS', '0.25'))
+            },
+            'half_life_hours': float(os.getenv('INFLUENCE_HALF_LIFE_HOURS', '24')),
+            'window_hours': float(os.getenv('INFLUENCE_WINDOW_HOURS', '168'))
+        }
+    
+    @classmethod
+    def get_trend_settings(cls) -> Dict[str, Any]:
+        """Get hashtag / mention trend tracking settings from environment"""
+        return {
+            'bucket_seconds': float(os.getenv('TREND_BUCKET_SECONDS', '3600')),
+            'baseline_buckets': int(os.getenv('TREND_BASELINE_BUCKETS', '24')),
+            'sketch_width': int(os.getenv('TREND_SKETCH_WIDTH', '4096')),
+            'sketch_depth': int(os.getenv('TREND_SKETCH_DEPTH', '4')),
+            'top_k': int(os.getenv('TREND_TOP_K', '200')),
+            'min_count': int(os.getenv('TREND_MIN_COUNT', '20')),
+            'min_ratio': float(os.getenv('TREND_MIN_RATIO', '3'))
         }
     
     @classmethod
@@ -0,0 +1,268 @@
+"""
+Coordinated Posting Module
+Streaming detection of many accounts pushing the same hashtag or text within a short window
+"""
+
+import re
+import time
+import hashlib
+import logging
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Optional, List, Dict, Any, Iterable, Tuple
+
+import numpy as np
+
+from .config import TwitterConfig
+from .extractor import TweetRecord
+from .similarity import normalize_text
+
+logger = logging.getLogger(__name__)
+
+HASHTAG = 'hashtag'
+TEXT = 'text'
+
+_HASHTAG_PATTERN = re.compile(r'#([\w\u0900-\u097F]+)')
+
+
+def extract_hashtags(text: Optional[str]) -> List[str]:
+    """Distinct lower-cased hashtags in order of appearance, without '#'"""
+    return list(dict.fromkeys(tag.lower() for tag in _HASHTAG_PATTERN.findall(text or '')))
+
+
+def text_fingerprint(text: Optional[str], min_chars: int) -> Optional[str]:
+    """Hash of the normalized text (see similarity.normalize_text), or None for short texts"""
+    normalized = normalize_text(text)
+    if len(normalized) < min_chars:
+        return None
+    return hashlib.blake2b(normalized.encode('utf-8'), digest_size=8).hexdigest()
+
+
+def parse_timestamp(value: Optional[str]) -> Optional[float]:
+    """Epoch seconds of a tweet timestamp ('2024-05-13T10:00:00.000Z') or capture time"""
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value.replace('Z', '+00:00')).timestamp()
+    except ValueError:
+        return None
+
+
+@dataclass
+class BurstEvent:
+    """Distinct authors on one hashtag or text crossed the threshold inside the window"""
+    kind: str
+    key: str
+    authors: int
+    posts: int
+    window_start: str
+    window_end: str
+    sample_authors: List[str] = field(default_factory=list)
+    sample_text: str = ''
+    query: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'kind': self.kind,
+            'key': self.key,
+            'authors': self.authors,
+            'posts': self.posts,
+            'window_start': self.window_start,
+            'window_end': self.window_end,
+            'sample_authors': self.sample_authors,
+            'sample_text': self.sample_text,
+            'query': self.query
+        }
+
+
+class _KeyWindow:
+    """Ring of time buckets for one key; each bucket holds a post count and distinct-author registers"""
+
+    __slots__ = ('buckets', 'posts', 'registers', 'newest', 'alerted_bucket', 'alerted_authors',
+                 'recent_authors', 'sample_text')
+
+    def __init__(self, slots: int, registers: int, sample_size: int):
+        # Absolute bucket number held by each slot; -1 marks an empty slot
+        self.buckets = np.full(slots, -1, dtype=np.int64)
+        self.posts = np.zeros(slots, dtype=np.int32)
+        self.registers = np.zeros((slots, registers), dtype=np.uint8)
+        self.newest = -1
+        self.alerted_bucket = -1
+        self.alerted_authors = 0
+        self.recent_authors: deque = deque(maxlen=sample_size)
+        self.sample_text = ''
+
+
+class CoordinationDetector:
+    """Sliding-window counter of distinct authors per hashtag and per text
+
+    Time is cut into `bucket_seconds` buckets and each key keeps a ring of
+    window_seconds / bucket_seconds of them, holding a post count and a small
+    HyperLogLog register array of author hashes. The distinct authors in the
+    window are estimated from the element-wise maximum of the live buckets'
+    registers (linear counting at the small counts that matter here, which is
+    close to exact), so a key costs the same memory whether it saw ten posts
+    or ten million. At most `max_keys` keys are tracked; the least recently
+    active is dropped first.
+
+    Windows use tweet timestamps, not arrival time, since one capture holds
+    posts from a span of time. Each key's window ends at the newest post seen
+    for it; posts older than that window are ignored (`late`), so history is
+    never re-scanned.
+
+    A BurstEvent is raised when a key's distinct authors reach `min_authors`,
+    and again only after the window has moved past the previous alert or the
+    author count has doubled since.
+    """
+
+    def __init__(self, window_seconds: Optional[float] = None, bucket_seconds: Optional[float] = None,
+                 min_authors: Optional[int] = None, max_keys: Optional[int] = None,
+                 registers: Optional[int] = None, min_text_chars: Optional[int] = None,
+                 sample_size: int = 20):
+        settings = TwitterConfig.get_coordination_settings()
+        self.window_seconds = window_seconds or settings['window_seconds']
+        self.bucket_seconds = bucket_seconds or settings['bucket_seconds']
+        self.slots = max(1, int(round(self.window_seconds / self.bucket_seconds)))
+        self.min_authors = min_authors or settings['min_authors']
+        self.max_keys = max_keys or settings['max_keys']
+        self.registers = registers or settings['registers']
+        if self.registers & (self.registers - 1) or not 16 <= self.registers <= 256:
+            raise ValueError(f"registers must be a power of two between 16 and 256, got {self.registers}")
+        self._index_bits = self.registers.bit_length() - 1
+        self.min_text_chars = min_text_chars if min_text_chars is not None else settings['min_text_chars']
+        self.sample_size = sample_size
+
+        self._keys: 'OrderedDict[Tuple[str, str], _KeyWindow]' = OrderedDict()
+        self.observed = 0
+        self.late = 0
+        self.evicted = 0
+
+    def _author_register(self, author: str) -> Tuple[int, int]:
+        """(register index, rank) of an author hash"""
+        value = int.from_bytes(hashlib.blake2b(author.lower().encode('utf-8'), digest_size=8).digest(), 'little')
+        index = value & (self.registers - 1)
+        rest = value >> self._index_bits
+        remaining_bits = 64 - self._index_bits
+        rank = remaining_bits - rest.bit_length() + 1 if rest else remaining_bits + 1
+        return index, rank
+
+    def _window(self, key: Tuple[str, str]) -> _KeyWindow:
+        window = self._keys.get(key)
+        if window is None:
+            if len(self._keys) >= self.max_keys:
+                self._keys.popitem(last=False)
+                self.evicted += 1
+            window = self._keys[key] = _KeyWindow(self.slots, self.registers, self.sample_size)
+        else:
+            self._keys.move_to_end(key)
+        return window
+
+    def _estimate(self, registers: np.ndarray) -> float:
+        """HyperLogLog cardinality estimate with the small-range (linear counting) correction"""
+        m = self.registers
+        zeros = int(np.count_nonzero(registers == 0))
+        alpha = {16: 0.673, 32: 0.697, 64: 0.709}.get(m, 0.7213 / (1 + 1.079 / m))
+        estimate = alpha * m * m / float(np.sum(np.exp2(-registers.astype(np.float64))))
+        if estimate <= 2.5 * m and zeros:
+            return m * np.log(m / zeros)
+        return estimate
+
+    def observe(self, kind: str, key: str, author: str, timestamp: float, text: str = '',
+                query: Optional[str] = None) -> Optional[BurstEvent]:
+        """Count one post; returns a BurstEvent if it pushes the key over the threshold"""
+        self.observed += 1
+        bucket = int(timestamp // self.bucket_seconds)
+        window = self._window((kind, key))
+        if window.newest >= 0 and bucket <= window.newest - self.slots:
+            self.late += 1
+            return None
+
+        slot = bucket % self.slots
+        if window.buckets[slot] != bucket:
+            window.buckets[slot] = bucket
+            window.posts[slot] = 0
+            window.registers[slot] = 0
+        index, rank = self._author_register(author)
+        if rank > window.registers[slot, index]:
+            window.registers[slot, index] = rank
+        window.posts[slot] += 1
+        window.newest = max(window.newest, bucket)
+        if author not in window.recent_authors:
+            window.recent_authors.append(author)
+        if text and not window.sample_text:
+            window.sample_text = text[:200]
+
+        live = window.buckets > window.newest - self.slots
+        posts = int(window.posts[live].sum())
+        # Cannot reach the threshold yet; skips the estimate for the long tail of quiet keys
+        if posts < self.min_authors:
+            return None
+        authors = int(round(self._estimate(window.registers[live].max(axis=0))))
+        if authors < self.min_authors:
+            return None
+        if window.alerted_bucket > window.newest - self.slots and authors < 2 * window.alerted_authors:
+            return None
+        window.alerted_bucket = window.newest
+        window.alerted_authors = authors
+
+        first_bucket = int(window.buckets[live].min())
+        return BurstEvent(
+            kind=kind,
+            key=key,
+            authors=authors,
+            posts=posts,
+            window_start=_isoformat(first_bucket * self.bucket_seconds),
+            window_end=_isoformat((window.newest + 1) * self.bucket_seconds),
+            sample_authors=list(window.recent_authors),
+            sample_text=window.sample_text,
+            query=query
+        )
+
+    def add(self, records: Iterable[TweetRecord], query: Optional[str] = None,
+            captured_at: Optional[str] = None) -> List[BurstEvent]:
+        """Feed a batch of records in timestamp order; returns the burst events raised"""
+        fallback = parse_timestamp(captured_at) or time.time()
+        timed = sorted(
+            ((parse_timestamp(record.timestamp) or fallback, record) for record in records),
+            key=lambda item: item[0]
+        )
+        events = []
+        for timestamp, record in timed:
+            keys = [(HASHTAG, f"#{tag}") for tag in extract_hashtags(record.text)]
+            fingerprint = text_fingerprint(record.text, self.min_text_chars)
+            if fingerprint:
+                keys.append((TEXT, fingerprint))
+            for kind, key in keys:
+                event = self.observe(kind, key, record.author, timestamp, record.text, query)
+                if event:
+                    events.append(event)
+        return events
+
+    def consume(self, records: List[TweetRecord], query: Optional[str],
+                captured_at: Optional[str]) -> List[BurstEvent]:
+        """IngestPipeline consumer: count records and log burst events"""
+        events = self.add(records, query, captured_at)
+        for event in events:
+            label = event.key if event.kind == HASHTAG else repr(event.sample_text[:80])
+            logger.warning(f"📣 Coordinated {event.kind} burst: {label} from ~{event.authors} accounts "
+                           f"({event.posts} posts, {event.window_start} – {event.window_end})")
+        return events
+
+    def memory_bytes(self) -> int:
+        """Approximate size of the counters (excluding author samples)"""
+        per_key = self.slots * (8 + 4 + self.registers)
+        return len(self._keys) * per_key
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'keys': len(self._keys),
+            'observed': self.observed,
+            'late': self.late,
+            'evicted': self.evicted,
+            'memory_bytes': self.memory_bytes()
+        }
+
+
+def _isoformat(epoch_seconds: float) -> str:
+    return datetime.fromtimestamp(epoch_seconds, timezone.utc).isoformat(timespec='seconds')
@@ -0,0 +1,324 @@
+"""
+Twitter Database Module
+SQLite-backed persistent task queue shared by the GUI, CLI and worker processes
+"""
+
+import os
+import sqlite3
+import logging
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Optional, List, Dict, Iterable, Iterator
+
+from .config import TwitterConfig
+
+logger = logging.getLogger(__name__)
+
+TASK_STATUSES = ('pending', 'running', 'completed', 'failed')
+
+
+@dataclass
+class ScrapingTask:
+    """A queued search query"""
+    id: Optional[int]
+    query: str
+    status: str = 'pending'
+    priority: int = 0
+    attempts: int = 0
+    created_at: Optional[str] = None
+    started_at: Optional[str] = None
+    completed_at: Optional[str] = None
+    result_file: Optional[str] = None
+    error_message: Optional[str] = None
+    worker_id: Optional[str] = None
+
+    @classmethod
+    def from_row(cls, row: sqlite3.Row) -> 'ScrapingTask':
+        return cls(**{key: row[key] for key in row.keys()})
+
+
+@dataclass
+class WorkerStatus:
+    """Last heartbeat of a queue worker process"""
+    worker_id: str
+    pid: Optional[int]
+    status: str
+    started_at: str
+    heartbeat_at: str
+    current_task: Optional[int] = None
+    completed: int = 0
+    failed: int = 0
+
+    @classmethod
+    def from_row(cls, row: sqlite3.Row) -> 'WorkerStatus':
+        return cls(**{key: row[key] for key in row.keys()})
+
+    def heartbeat_age(self) -> float:
+        return (datetime.now() - datetime.fromisoformat(self.heartbeat_at)).total_seconds()
+
+
+class TwitterDatabase:
+    """Persistent scraping task queue
+
+    Every operation opens a short-lived connection so the queue can be used
+    from the Tk thread, scraper threads and separate worker processes at the
+    same time. WAL mode lets readers proceed while a writer holds the lock,
+    and claim_next_task() takes the write lock up front so two workers can
+    never claim the same task.
+
+    Tasks claimed by a process that died mid-task would stay 'running'
+    forever. Worker processes are covered by their heartbeats
+    (requeue_stale); any other claim (GUI, CLI) older than `claim_timeout`
+    seconds is returned to the queue the next time tasks are added or claimed.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS tasks (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            query TEXT NOT NULL,
+            status TEXT NOT NULL DEFAULT 'pending',
+            priority INTEGER NOT NULL DEFAULT 0,
+            attempts INTEGER NOT NULL DEFAULT 0,
+            created_at TEXT NOT NULL,
+            started_at TEXT,
+            completed_at TEXT,
+            result_file TEXT,
+            error_message TEXT,
+            worker_id TEXT
+        );
+        CREATE INDEX IF NOT EXISTS idx_tasks_status_priority
+            ON tasks (status, priority DESC, id);
+        CREATE TABLE IF NOT EXISTS workers (
+            worker_id TEXT PRIMARY KEY,
+            pid INTEGER,
+            status TEXT NOT NULL,
+            started_at TEXT NOT NULL,
+            heartbeat_at TEXT NOT NULL,
+            current_task INTEGER,
+            completed INTEGER NOT NULL DEFAULT 0,
+            failed INTEGER NOT NULL DEFAULT 0
+        );
+    """
+
+    def __init__(self, db_path: Optional[str] = None, timeout: float = 30.0, claim_timeout: Optional[float] = None):
+        self.db_path = db_path or TwitterConfig.get_scraper_settings()['db_path']
+        self.timeout = timeout
+        worker_settings = TwitterConfig.get_worker_settings()
+        self.claim_timeout = claim_timeout if claim_timeout is not None else worker_settings['claim_timeout']
+        self.heartbeat_timeout = worker_settings['heartbeat_timeout']
+        directory = os.path.dirname(self.db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._init_schema()
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self.db_path, timeout=self.timeout, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        conn.execute('PRAGMA synchronous=NORMAL')
+        conn.execute(f'PRAGMA busy_timeout={int(self.timeout * 1000)}')
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    @contextmanager
+    def _transaction(self, immediate: bool = False) -> Iterator[sqlite3.Connection]:
+        with self._connect() as conn:
+            conn.execute('BEGIN IMMEDIATE' if immediate else 'BEGIN')
+            try:
+                yield conn
+            except Exception:
+                conn.execute('ROLLBACK')
+                raise
+            conn.execute('COMMIT')
+
+    def _init_schema(self) -> None:
+        with self._connect() as conn:
+            mode = conn.execute('PRAGMA journal_mode=WAL').fetchone()[0]
+            if mode.lower() != 'wal':
+                logger.warning(f"SQLite WAL mode unavailable, using {mode}")
+            conn.executescript(self.SCHEMA)
+
+    @staticmethod
+    def _now() -> str:
+        return datetime.now().isoformat()
+
+    def _release_abandoned(self, conn: sqlite3.Connection) -> int:
+        """Requeue claims older than claim_timeout whose holder is not a worker with a live heartbeat"""
+        if not self.claim_timeout:
+            return 0
+        now = datetime.now()
+        released = conn.execute(
+            "UPDATE tasks SET status = 'pending', started_at = NULL, worker_id = NULL "
+            "WHERE status = 'running' AND started_at < ? AND (worker_id IS NULL OR worker_id NOT IN ("
+            "SELECT worker_id FROM workers WHERE heartbeat_at >= ? AND status NOT IN ('stopped', 'lost')))",
+            ((now - timedelta(seconds=self.claim_timeout)).isoformat(),
+             (now - timedelta(seconds=self.heartbeat_timeout)).isoformat())
+        ).rowcount
+        if released:
+            logger.warning(f"♻️ Requeued {released} task(s) claimed more than {self.claim_timeout:.0f}s ago")
+        return released
+
+    def add_task(self, query: str, priority: int = 0, skip_duplicates: bool = True) -> Optional[int]:
+        """Queue a single query; returns the task id or None if already queued"""
+        ids = self.add_tasks([query], priority=priority, skip_duplicates=skip_duplicates)
+        return ids[0] if ids else None
+
+    def add_tasks(self, queries: Iterable[str], priority: int = 0, skip_duplicates: bool = True) -> List[int]:
+        """Queue several queries in one transaction and return the new task ids"""
+        queries = [q.strip() for q in queries if q and q.strip()]
+        if not queries:
+            return []
+
+        with self._transaction(immediate=True) as conn:
+            self._release_abandoned(conn)
+            if skip_duplicates:
+                queued = {
+                    row['query'] for row in conn.execute(
+                        "SELECT query FROM tasks WHERE status IN ('pending', 'running')"
+                    )
+                }
+                queries = [q for q in dict.fromkeys(queries) if q not in queued]
+            if not queries:
+                return []
+
+            start = conn.execute("SELECT COALESCE(MAX(id), 0) FROM tasks").fetchone()[0]
+            now = self._now()
+            conn.executemany(
+                "INSERT INTO tasks (query, priority, created_at) VALUES (?, ?, ?)",
+                [(q, priority, now) for q in queries]
+            )
+            rows = conn.execute(
+                "SELECT id FROM tasks WHERE id > ? ORDER BY id", (start,)
+            ).fetchall()
+        return [row['id'] for row in rows]
+
+    def claim_next_task(self, worker_id: Optional[str] = None) -> Optional[ScrapingTask]:
+        """Atomically move the highest-priority pending task to 'running' and return it"""
+        with self._transaction(immediate=True) as conn:
+            self._release_abandoned(conn)
+            row = conn.execute(
+                "SELECT id FROM tasks WHERE status = 'pending' ORDER BY priority DESC, id LIMIT 1"
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute(
+                "UPDATE tasks SET status = 'running', started_at = ?, worker_id = ?, attempts = attempts + 1 "
+                "WHERE id = ?",
+                (self._now(), worker_id, row['id'])
+            )
+            task = conn.execute("SELECT * FROM tasks WHERE id = ?", (row['id'],)).fetchone()
+        return ScrapingTask.from_row(task)
+
+    def update_task_status(self, task_id: int, status: str, result_file: Optional[str] = None,
+                           error_message: Optional[str] = None, worker_id: Optional[str] = None) -> int:
+        """Record a task state change; returns the number of rows changed.
+
+        Moving a task out of 'running' only applies while `worker_id` still holds
+        the claim, so a worker whose claim was released and re-claimed elsewhere
+        cannot overwrite the new owner's result.
+        """
+        if status not in TASK_STATUSES:
+            raise ValueError(f"Unknown task status: {status}")
+
+        now = self._now()
+        with self._transaction() as conn:
+            if status == 'running':
+                changed = conn.execute(
+                    "UPDATE tasks SET status = ?, started_at = ?, attempts = attempts + 1 WHERE id = ?",
+                    (status, now, task_id)
+                ).rowcount
+            elif status == 'pending':
+                changed = conn.execute(
+                    "UPDATE tasks SET status = ?, started_at = NULL, worker_id = NULL "
+                    "WHERE id = ? AND status = 'running' AND worker_id IS ?",
+                    (status, task_id, worker_id)
+                ).rowcount
+            else:
+                changed = conn.execute(
+                    "UPDATE tasks SET status = ?, completed_at = ?, result_file = COALESCE(?, result_file), "
+                    "error_message = ? WHERE id = ? AND status = 'running' AND worker_id IS ?",
+                    (status, now, result_file, error_message, task_id, worker_id)
+                ).rowcount
+        if not changed:
+            logger.warning(f"⚠️ Task {task_id} is no longer claimed by {worker_id}; '{status}' not recorded")
+        return changed
+
+    def get_task(self, task_id: int) -> Optional[ScrapingTask]:
+        with self._connect() as conn:
+            row = conn.execute("SELECT * FROM tasks WHERE id = ?", (task_id,)).fetchone()
+        return ScrapingTask.from_row(row) if row else None
+
+    def get_pending_tasks(self, limit: Optional[int] = None) -> List[ScrapingTask]:
+        """Pending tasks in the order they will be claimed"""
+        sql = "SELECT * FROM tasks WHERE status = 'pending' ORDER BY priority DESC, id"
+        params = ()
+        if limit is not None:
+            sql += " LIMIT ?"
+            params = (limit,)
+        with self._connect() as conn:
+            return [ScrapingTask.from_row(row) for row in conn.execute(sql, params)]
+
+    def count_by_status(self) -> Dict[str, int]:
+        with self._connect() as conn:
+            counts = {row['status']: row['n'] for row in conn.execute(
+                "SELECT status, COUNT(*) AS n FROM tasks GROUP BY status"
+            )}
+        return {status: counts.get(status, 0) for status in TASK_STATUSES}
+
+    def clear_pending(self) -> int:
+        """Delete all pending tasks; returns how many were removed"""
+        with self._transaction(immediate=True) as conn:
+            return conn.execute("DELETE FROM tasks WHERE status = 'pending'").rowcount
+
+    def requeue_running(self, worker_id: Optional[str] = None) -> int:
+        """Return running tasks (optionally of one worker) to the pending state"""
+        sql = "UPDATE tasks SET status = 'pending', started_at = NULL, worker_id = NULL WHERE status = 'running'"
+        params = ()
+        if worker_id is not None:
+            sql += " AND worker_id = ?"
+            params = (worker_id,)
+        with self._transaction(immediate=True) as conn:
+            return conn.execute(sql, params).rowcount
+
+    def heartbeat(self, worker_id: str, status: str, pid: Optional[int] = None,
+                  current_task: Optional[int] = None, completed: int = 0, failed: int = 0) -> None:
+        """Record that a worker is alive and what it is doing"""
+        now = self._now()
+        with self._transaction() as conn:
+            conn.execute(
+                "INSERT INTO workers (worker_id, pid, status, started_at, heartbeat_at, current_task, completed, failed) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(worker_id) DO UPDATE SET pid = excluded.pid, status = excluded.status, "
+                "heartbeat_at = excluded.heartbeat_at, current_task = excluded.current_task, "
+                "completed = excluded.completed, failed = excluded.failed, "
+                "started_at = CASE WHEN workers.pid IS excluded.pid THEN workers.started_at ELSE excluded.started_at END",
+                (worker_id, pid, status, now, now, current_task, completed, failed)
+            )
+
+    def get_workers(self) -> List[WorkerStatus]:
+        with self._connect() as conn:
+            return [WorkerStatus.from_row(row) for row in conn.execute("SELECT * FROM workers ORDER BY worker_id")]
+
+    def get_worker(self, worker_id: str) -> Optional[WorkerStatus]:
+        with self._connect() as conn:
+            row = conn.execute("SELECT * FROM workers WHERE worker_id = ?", (worker_id,)).fetchone()
+        return WorkerStatus.from_row(row) if row else None
+
+    def requeue_stale(self, max_age: float) -> int:
+        """Return tasks held by workers silent for more than `max_age` seconds to the pending state"""
+        cutoff = (datetime.now() - timedelta(seconds=max_age)).isoformat()
+        with self._transaction(immediate=True) as conn:
+            stale = [row['worker_id'] for row in conn.execute(
+                "SELECT worker_id FROM workers WHERE heartbeat_at < ? AND status != 'stopped'", (cutoff,)
+            )]
+            if not stale:
+                return 0
+            marks = ','.join('?' * len(stale))
+            conn.execute(f"UPDATE workers SET status = 'lost', current_task = NULL WHERE worker_id IN ({marks})", stale)
+            return conn.execute(
+                "UPDATE tasks SET status = 'pending', started_at = NULL, worker_id = NULL "
+                f"WHERE status = 'running' AND worker_id IN ({marks})", stale
+            ).rowcount
@@ -0,0 +1,212 @@
+"""
+Tweet Deduplication Module
+Persistent index of seen tweets keyed by tweet id and content hash, fronted by a Bloom filter
+"""
+
+import os
+import math
+import sqlite3
+import hashlib
+import logging
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Optional, List, Dict, Any, Iterable, Iterator, Tuple
+
+from .config import TwitterConfig
+from .extractor import TweetRecord
+
+logger = logging.getLogger(__name__)
+
+NEW = 'new'
+DUPLICATE = 'duplicate'
+CHANGED = 'changed'
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over integer keys using double hashing"""
+
+    def __init__(self, capacity: int, error_rate: float = 0.01):
+        capacity = max(1, capacity)
+        bits = int(-capacity * math.log(error_rate) / (math.log(2) ** 2))
+        self.size = max(8, bits)
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, key: int) -> Iterator[int]:
+        digest = hashlib.blake2b(key.to_bytes(8, 'little', signed=True), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        for i in range(self.hash_count):
+            yield (h1 + i * h2) % self.size
+
+    def add(self, key: int) -> None:
+        for position in self._positions(key):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, key: int) -> bool:
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+
+
+def tweet_key(tweet_id: str) -> int:
+    """Numeric index key; non-numeric ids are hashed into the signed 64-bit range"""
+    if tweet_id.isdigit() and int(tweet_id) < 2 ** 63:
+        return int(tweet_id)
+    return -int.from_bytes(hashlib.blake2b(tweet_id.encode('utf-8'), digest_size=8).digest(), 'little') // 2
+
+
+def content_hash(record: TweetRecord) -> bytes:
+    """Hash of author and normalized text; engagement counts are ignored on purpose"""
+    normalized = ' '.join((record.text or '').split()).lower()
+    return hashlib.blake2b(f"{record.author}\x00{normalized}".encode('utf-8'), digest_size=8).digest()
+
+
+class TweetDedupIndex:
+    """Persistent first-seen/last-seen index of tweets across captures and queries
+
+    Lookups first consult an in-memory Bloom filter of fixed size: a negative
+    answer means the tweet is definitely new and needs no disk lookup, a
+    positive one is confirmed against the SQLite primary key. Memory use is
+    bounded by the filter capacity; past it the false-positive rate rises but
+    answers stay exact.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS seen (
+            tweet_id INTEGER PRIMARY KEY,
+            content_hash BLOB NOT NULL,
+            first_seen TEXT NOT NULL,
+            last_seen TEXT NOT NULL,
+            seen_count INTEGER NOT NULL DEFAULT 1
+        );
+        CREATE TABLE IF NOT EXISTS seen_queries (
+            tweet_id INTEGER NOT NULL,
+            query TEXT NOT NULL,
+            first_seen TEXT NOT NULL,
+            PRIMARY KEY (tweet_id, query)
+        ) WITHOUT ROWID;
+    """
+
+    def __init__(self, db_path: Optional[str] = None, bloom_capacity: Optional[int] = None,
+                 bloom_error_rate: float = 0.01):
+        settings = TwitterConfig.get_storage_settings()
+        self.db_path = db_path or settings['dedup_db_path']
+        directory = os.path.dirname(self.db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        # Shared across threads (asyncio.to_thread callers); access is serialized by the lock
+        self._lock = threading.RLock()
+        self.conn = sqlite3.connect(self.db_path, timeout=30.0, isolation_level=None, check_same_thread=False)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.executescript(self.SCHEMA)
+
+        self.bloom = BloomFilter(bloom_capacity or settings['dedup_bloom_capacity'], bloom_error_rate)
+        self._load_bloom()
+
+    def _load_bloom(self) -> None:
+        count = 0
+        for (key,) in self.conn.execute("SELECT tweet_id FROM seen"):
+            self.bloom.add(key)
+            count += 1
+        if count:
+            logger.info(f"🧮 Dedup index loaded: {count:,} known tweets")
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        with self._lock:
+            self.conn.execute('BEGIN IMMEDIATE')
+            try:
+                yield self.conn
+            except Exception:
+                self.conn.execute('ROLLBACK')
+                raise
+            self.conn.execute('COMMIT')
+
+    def _lookup(self, key: int) -> Optional[bytes]:
+        if key not in self.bloom:
+            return None
+        with self._lock:
+            row = self.conn.execute("SELECT content_hash FROM seen WHERE tweet_id = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def check(self, record: TweetRecord) -> str:
+        """Classify a record as new, duplicate or changed without recording it"""
+        stored = self._lookup(tweet_key(record.tweet_id))
+        if stored is None:
+            return NEW
+        return DUPLICATE if stored == content_hash(record) else CHANGED
+
+    def record(self, records: Iterable[TweetRecord], query: Optional[str] = None,
+               seen_at: Optional[str] = None) -> List[str]:
+        """Check and record a batch in one transaction; returns a status per record"""
+        seen_at = seen_at or datetime.now().isoformat(timespec='seconds')
+        statuses = []
+        batch_seen: Dict[int, bytes] = {}
+
+        with self._transaction() as conn:
+            for record in records:
+                key = tweet_key(record.tweet_id)
+                digest = content_hash(record)
+                stored = batch_seen.get(key)
+                if stored is None:
+                    stored = self._lookup(key)
+
+                if stored is None:
+                    conn.execute(
+                        "INSERT INTO seen (tweet_id, content_hash, first_seen, last_seen) VALUES (?, ?, ?, ?)",
+                        (key, digest, seen_at, seen_at)
+                    )
+                    self.bloom.add(key)
+                    statuses.append(NEW)
+                else:
+                    conn.execute(
+                        "UPDATE seen SET content_hash = ?, seen_count = seen_count + 1, "
+                        "first_seen = MIN(first_seen, ?), last_seen = MAX(last_seen, ?) WHERE tweet_id = ?",
+                        (digest, seen_at, seen_at, key)
+                    )
+                    statuses.append(DUPLICATE if stored == digest else CHANGED)
+                batch_seen[key] = digest
+
+                if query:
+                    conn.execute(
+                        "INSERT OR IGNORE INTO seen_queries (tweet_id, query, first_seen) VALUES (?, ?, ?)",
+                        (key, query, seen_at)
+                    )
+        return statuses
+
+    def filter_new(self, records: List[TweetRecord], query: Optional[str] = None,
+                   seen_at: Optional[str] = None, include_changed: bool = True) -> Tuple[List[TweetRecord], int]:
+        """Record a batch and return (records not seen before, duplicate count)"""
+        statuses = self.record(records, query, seen_at)
+        keep = {NEW, CHANGED} if include_changed else {NEW}
+        fresh = [record for record, status in zip(records, statuses) if status in keep]
+        return fresh, len(records) - len(fresh)
+
+    def info(self, tweet_id: str) -> Optional[Dict[str, Any]]:
+        """First/last seen times, sighting count and matching queries for a tweet"""
+        key = tweet_key(tweet_id)
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT first_seen, last_seen, seen_count FROM seen WHERE tweet_id = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            queries = [q for (q,) in self.conn.execute(
+                "SELECT query FROM seen_queries WHERE tweet_id = ? ORDER BY first_seen", (key,)
+            )]
+        return {'first_seen': row[0], 'last_seen': row[1], 'seen_count': row[2], 'queries': queries}
+
+    def count(self) -> int:
+        with self._lock:
+            return self.conn.execute("SELECT COUNT(*) FROM seen").fetchone()[0]
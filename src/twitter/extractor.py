@@ -0,0 +1,248 @@
+"""
+Tweet Extraction Module
+Streams saved X.com search pages into structured tweet records without building a full DOM
+"""
+
+import re
+import logging
+from dataclasses import dataclass, field, asdict
+from typing import Optional, List, Dict, Any, Iterator, Iterable, IO, Tuple, Union
+
+from lxml import etree
+
+from .config import TwitterConfig
+
+logger = logging.getLogger(__name__)
+
+# Bytes fed to the pull parser per read
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+_SELECTOR_PATTERN = re.compile(r'^\[\s*([\w-]+)\s*=\s*["\']?([^"\'\]]+)["\']?\s*\]$')
+_STATUS_HREF = re.compile(r'^/([^/]+)/status/(\d+)')
+_PROFILE_HREF = re.compile(r'^/(\w{1,15})/?$')
+_COUNT_PATTERN = re.compile(r'([\d][\d,.]*)\s*([KkMmBb]?)')
+_COUNT_MULTIPLIERS = {'': 1, 'k': 1_000, 'm': 1_000_000, 'b': 1_000_000_000}
+
+
+@dataclass
+class TweetRecord:
+    """Structured tweet extracted from a saved search page"""
+    tweet_id: str
+    author: str
+    timestamp: Optional[str] = None
+    text: str = ''
+    display_name: Optional[str] = None
+    reply_count: int = 0
+    retweet_count: int = 0
+    like_count: int = 0
+    view_count: int = 0
+    # Handles (without '@') this tweet interacts with
+    mentions: List[str] = field(default_factory=list)
+    in_reply_to: Optional[str] = None
+    # Set when the tweet appeared in the timeline as someone's retweet
+    retweeted_by: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert record to a plain dictionary"""
+        return asdict(self)
+
+
+def parse_count(value: Optional[str]) -> int:
+    """Parse engagement counts such as '12', '1,234', '4.5K' or '2M'"""
+    if not value:
+        return 0
+    match = _COUNT_PATTERN.search(value)
+    if not match:
+        return 0
+    number, suffix = match.groups()
+    multiplier = _COUNT_MULTIPLIERS[suffix.lower()]
+    try:
+        if multiplier == 1:
+            return int(number.replace(',', '').split('.')[0])
+        return int(float(number.replace(',', '')) * multiplier)
+    except ValueError:
+        return 0
+
+
+def _parse_attribute_selector(selector: str) -> Tuple[str, str]:
+    """Split an attribute selector like '[data-testid="tweet"]' into name and value"""
+    match = _SELECTOR_PATTERN.match(selector.strip())
+    if not match:
+        raise ValueError(f"Unsupported tweet selector: {selector}")
+    return match.group(1), match.group(2)
+
+
+def _text_with_alt(element) -> str:
+    """Collect element text in document order, keeping emoji rendered as <img alt="...">"""
+    parts = []
+
+    def walk(node):
+        if not isinstance(node.tag, str):
+            return
+        if node.tag == 'img':
+            parts.append(node.get('alt') or '')
+        elif node.text:
+            parts.append(node.text)
+        for child in node:
+            walk(child)
+            if child.tail:
+                parts.append(child.tail)
+
+    walk(element)
+    return ''.join(parts)
+
+
+class TweetExtractor:
+    """Incremental extractor for tweet blocks in saved search HTML
+
+    Pages are fed to lxml's HTML pull parser in chunks. Each tweet element is
+    converted into a TweetRecord as soon as it closes, and every finished
+    element is cleared so memory stays bounded by a single tweet subtree.
+    """
+
+    COUNT_TESTIDS = {
+        'reply': 'reply_count',
+        'retweet': 'retweet_count',
+        'unretweet': 'retweet_count',
+        'like': 'like_count',
+        'unlike': 'like_count'
+    }
+
+    def __init__(self, tweet_selector: Optional[str] = None, chunk_size: int = DEFAULT_CHUNK_SIZE):
+        selector = tweet_selector or TwitterConfig.SELECTORS['tweet_selector']
+        self.attr_name, self.attr_value = _parse_attribute_selector(selector)
+        self.chunk_size = chunk_size
+
+    def iter_file(self, path: str) -> Iterator[TweetRecord]:
+        """Yield tweets from an HTML file on disk"""
+        with open(path, 'rb') as f:
+            yield from self.iter_stream(f)
+
+    def iter_stream(self, stream: IO) -> Iterator[TweetRecord]:
+        """Yield tweets from a binary or text file-like object"""
+        def chunks():
+            while True:
+                chunk = stream.read(self.chunk_size)
+                if not chunk:
+                    break
+                yield chunk
+        yield from self.iter_chunks(chunks())
+
+    def iter_html(self, html: Union[str, bytes]) -> Iterator[TweetRecord]:
+        """Yield tweets from an in-memory HTML document"""
+        step = self.chunk_size
+        yield from self.iter_chunks(html[i:i + step] for i in range(0, len(html), step))
+
+    def iter_chunks(self, chunks: Iterable[Union[str, bytes]]) -> Iterator[TweetRecord]:
+        """Feed HTML chunks through the pull parser and yield tweets as they complete"""
+        parser = etree.HTMLPullParser(events=('start', 'end'), encoding='utf-8')
+        state = {'depth': 0, 'seen_ids': set()}
+
+        for chunk in chunks:
+            if isinstance(chunk, str):
+                chunk = chunk.encode('utf-8')
+            parser.feed(chunk)
+            yield from self._drain(parser, state)
+
+        parser.close()
+        yield from self._drain(parser, state)
+
+    def _drain(self, parser, state: Dict[str, Any]) -> Iterator[TweetRecord]:
+        """Process pending parser events, yielding each tweet once it is closed"""
+        for event, element in parser.read_events():
+            is_tweet = element.get(self.attr_name) == self.attr_value
+            if event == 'start':
+                if is_tweet:
+                    state['depth'] += 1
+                continue
+
+            if is_tweet:
+                state['depth'] -= 1
+                if state['depth'] == 0:
+                    record = self._build_record(element)
+                    if record and record.tweet_id not in state['seen_ids']:
+                        state['seen_ids'].add(record.tweet_id)
+                        yield record
+
+            # Release finished subtrees that are not part of an open tweet
+            if state['depth'] == 0:
+                element.clear(keep_tail=True)
+                parent = element.getparent()
+                if parent is not None:
+                    while element.getprevious() is not None:
+                        del parent[0]
+
+    def _build_record(self, tweet) -> Optional[TweetRecord]:
+        """Convert one tweet element into a TweetRecord"""
+        tweet_id = None
+        author = None
+        timestamp = None
+
+        # The permalink wraps the <time> element: /<handle>/status/<id>
+        for time_el in tweet.iter('time'):
+            timestamp = time_el.get('datetime')
+            link = time_el.getparent()
+            href = link.get('href', '') if link is not None else ''
+            match = _STATUS_HREF.match(href)
+            if match:
+                author, tweet_id = match.groups()
+            break
+
+        if tweet_id is None:
+            for link in tweet.iter('a'):
+                match = _STATUS_HREF.match(link.get('href', ''))
+                if match:
+                    author, tweet_id = match.groups()
+                    break
+
+        if tweet_id is None:
+            logger.debug("Skipping tweet block without a status link")
+            return None
+
+        record = TweetRecord(tweet_id=tweet_id, author=author, timestamp=timestamp)
+        replying = False
+
+        for node in tweet.iter():
+            testid = node.get('data-testid')
+            if not testid:
+                if node.tag == 'a' and node.get('href', '').endswith('/analytics'):
+                    record.view_count = parse_count(node.get('aria-label') or _text_with_alt(node))
+                elif node.text and node.text.strip() == 'Replying to':
+                    replying = True
+                elif replying and node.tag == 'a':
+                    # The first profile link after "Replying to" is the replied-to account
+                    match = _PROFILE_HREF.match(node.get('href', ''))
+                    if match:
+                        record.in_reply_to = match.group(1)
+                        replying = False
+                continue
+
+            if testid == 'tweetText' and not record.text:
+                record.text = _text_with_alt(node).strip()
+                replying = False
+                for link in node.iter('a'):
+                    match = _PROFILE_HREF.match(link.get('href', ''))
+                    if match and ''.join(link.itertext()).startswith('@') and match.group(1) not in record.mentions:
+                        record.mentions.append(match.group(1))
+            elif testid == 'socialContext' and record.retweeted_by is None:
+                # "<name> reposted", inside a link to the reposting profile
+                context = ''.join(node.itertext()).lower()
+                link = next((a for a in node.iterancestors('a')), None)
+                match = _PROFILE_HREF.match(link.get('href', '')) if link is not None else None
+                if match and ('repost' in context or 'retweet' in context):
+                    record.retweeted_by = match.group(1)
+            elif testid == 'User-Name' and record.display_name is None:
+                spans = [s.strip() for s in node.itertext() if s.strip()]
+                if spans:
+                    record.display_name = spans[0]
+            elif testid in self.COUNT_TESTIDS:
+                field = self.COUNT_TESTIDS[testid]
+                label = node.get('aria-label') or _text_with_alt(node)
+                setattr(record, field, parse_count(label))
+
+        return record
+
+
+def extract_tweets(path: str, tweet_selector: Optional[str] = None) -> Iterator[TweetRecord]:
+    """Convenience wrapper: stream tweet records from a saved HTML file"""
+    return TweetExtractor(tweet_selector).iter_file(path)
@@ -0,0 +1,410 @@
+"""
+Interaction Graph Module
+Mention / reply / retweet graph between accounts with indexed neighborhood queries and CSR analytics
+"""
+
+import os
+import sqlite3
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Optional, List, Dict, Any, Iterable, Iterator, Sequence, Tuple, Union
+
+import numpy as np
+
+from .config import TwitterConfig
+from .coordination import parse_timestamp
+from .dedup import tweet_key
+from .extractor import TweetRecord
+
+logger = logging.getLogger(__name__)
+
+MENTION = 1
+REPLY = 2
+RETWEET = 3
+EDGE_KINDS = {'mention': MENTION, 'reply': REPLY, 'retweet': RETWEET}
+
+OUT = 'out'
+IN = 'in'
+BOTH = 'both'
+
+# Keeps IN (...) lists under SQLite's bound-parameter limit
+_CHUNK = 500
+
+
+def record_edges(record: TweetRecord) -> List[Tuple[str, str, int]]:
+    """(source, target, kind) interactions of one tweet
+
+    Edges point from the account that acts to the account acted upon:
+    author → mentioned, author → replied-to, retweeter → author.
+    """
+    author = record.author
+    edges = [(author, handle, MENTION) for handle in record.mentions if handle.lower() != author.lower()]
+    if record.in_reply_to and record.in_reply_to.lower() != author.lower():
+        edges.append((author, record.in_reply_to, REPLY))
+    if record.retweeted_by and record.retweeted_by.lower() != author.lower():
+        edges.append((record.retweeted_by, author, RETWEET))
+    return edges
+
+
+def _chunks(values: Sequence, size: int = _CHUNK) -> Iterator[Sequence]:
+    for i in range(0, len(values), size):
+        yield values[i:i + size]
+
+
+def _gather(indptr: np.ndarray, indices: np.ndarray, rows: np.ndarray) -> np.ndarray:
+    """Concatenated CSR rows without a Python loop over them"""
+    starts = indptr[rows]
+    lengths = indptr[rows + 1] - starts
+    total = int(lengths.sum())
+    if not total:
+        return indices[:0]
+    # Position i of the output reads indices[starts[row] + (i - offset of row)]
+    offsets = np.repeat(starts - np.cumsum(lengths) + lengths, lengths)
+    return indices[offsets + np.arange(total)]
+
+
+class GraphSnapshot:
+    """Immutable CSR view of the interaction graph for one time window
+
+    Nodes are renumbered densely (0..n-1); `node_ids` maps them back to
+    graph node ids. Parallel edges are merged and counted in `weights`.
+    Both the outgoing and the incoming adjacency are kept, so neighborhood
+    walks in either direction are array slices.
+    """
+
+    def __init__(self, node_ids: np.ndarray, src: np.ndarray, dst: np.ndarray, weights: np.ndarray):
+        self.node_ids = node_ids
+        self.size = len(node_ids)
+        self.src = src
+        self.dst = dst
+        self.weights = weights
+        self._index = {int(node_id): i for i, node_id in enumerate(node_ids)}
+        self.out_indptr, self.out_indices, self.out_weights = self._csr(src, dst, weights)
+        self.in_indptr, self.in_indices, self.in_weights = self._csr(dst, src, weights)
+
+    def _csr(self, rows: np.ndarray, cols: np.ndarray, weights: np.ndarray) -> Tuple[np.ndarray, ...]:
+        order = np.argsort(rows, kind='stable')
+        indptr = np.zeros(self.size + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=self.size), out=indptr[1:])
+        return indptr, cols[order], weights[order]
+
+    @property
+    def edge_count(self) -> int:
+        return len(self.src)
+
+    def index_of(self, node_id: int) -> Optional[int]:
+        return self._index.get(node_id)
+
+    def neighbors(self, indexes: Union[int, np.ndarray], direction: str = BOTH) -> np.ndarray:
+        """Distinct dense indexes adjacent to one node or to any of an array of nodes"""
+        indexes = np.atleast_1d(np.asarray(indexes, dtype=np.int64))
+        parts = []
+        if direction in (OUT, BOTH):
+            parts.append(_gather(self.out_indptr, self.out_indices, indexes))
+        if direction in (IN, BOTH):
+            parts.append(_gather(self.in_indptr, self.in_indices, indexes))
+        return np.unique(np.concatenate(parts))
+
+    def k_hop(self, index: int, k: int, direction: str = BOTH) -> Dict[int, int]:
+        """Dense index → hop distance for every node within k hops (the start node at 0)"""
+        hops = np.full(self.size, -1, dtype=np.int32)
+        hops[index] = 0
+        frontier = np.array([index], dtype=np.int64)
+        for hop in range(1, k + 1):
+            if not len(frontier):
+                break
+            reached = self.neighbors(frontier, direction)
+            reached = reached[hops[reached] < 0]
+            hops[reached] = hop
+            frontier = reached
+        found = np.flatnonzero(hops >= 0)
+        return dict(zip(found.tolist(), hops[found].tolist()))
+
+    def degree(self, direction: str = BOTH, weighted: bool = True) -> np.ndarray:
+        weights = self.weights if weighted else np.ones_like(self.weights)
+        degree = np.zeros(self.size, dtype=np.float64)
+        if direction in (OUT, BOTH):
+            degree += np.bincount(self.src, weights, minlength=self.size)
+        if direction in (IN, BOTH):
+            degree += np.bincount(self.dst, weights, minlength=self.size)
+        return degree
+
+    def pagerank(self, damping: float = 0.85, max_iter: int = 100, tol: float = 1e-8) -> np.ndarray:
+        """Weighted PageRank by power iteration; rank flows along edges (towards the amplified account)"""
+        n = self.size
+        if n == 0:
+            return np.zeros(0)
+        out_weight = np.bincount(self.src, self.weights, minlength=n)
+        share = self.weights / out_weight[self.src]
+        dangling = out_weight == 0
+        rank = np.full(n, 1.0 / n)
+        for _ in range(max_iter):
+            flow = np.bincount(self.dst, rank[self.src] * share, minlength=n)
+            updated = damping * (flow + rank[dangling].sum() / n) + (1.0 - damping) / n
+            converged = np.abs(updated - rank).sum() < tol
+            rank = updated
+            if converged:
+                break
+        return rank
+
+    def components(self) -> np.ndarray:
+        """Weakly connected component label per node (the smallest dense index in the component)"""
+        labels = np.arange(self.size, dtype=np.int64)
+        if not self.edge_count:
+            return labels
+        while True:
+            previous = labels.copy()
+            # Hook each endpoint to the smaller label, then jump pointers until labels are roots
+            np.minimum.at(labels, self.src, labels[self.dst])
+            np.minimum.at(labels, self.dst, labels[self.src])
+            while True:
+                jumped = labels[labels]
+                if np.array_equal(jumped, labels):
+                    break
+                labels = jumped
+            if np.array_equal(labels, previous):
+                return labels
+
+
+class InteractionGraph:
+    """Persistent directed multigraph of account interactions
+
+    Accounts get compact integer ids in `nodes`; each interaction is one row
+    of `edges` keyed by the tweet it came from, so re-ingesting a capture
+    adds nothing. Covering indexes on (src, ts, ...) and (dst, ts, ...)
+    answer neighborhood and k-hop lookups for a time window from the index
+    alone, and the (ts, ...) index feeds snapshot(), which loads a window
+    into CSR arrays for ranking and component analysis.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS nodes (
+            node_id INTEGER PRIMARY KEY,
+            handle TEXT NOT NULL UNIQUE COLLATE NOCASE
+        );
+        CREATE TABLE IF NOT EXISTS edges (
+            tweet_key INTEGER NOT NULL,
+            src INTEGER NOT NULL,
+            dst INTEGER NOT NULL,
+            kind INTEGER NOT NULL,
+            ts INTEGER,
+            PRIMARY KEY (tweet_key, src, dst, kind)
+        ) WITHOUT ROWID;
+        CREATE INDEX IF NOT EXISTS idx_edges_src ON edges(src, ts, dst, kind);
+        CREATE INDEX IF NOT EXISTS idx_edges_dst ON edges(dst, ts, src, kind);
+        CREATE INDEX IF NOT EXISTS idx_edges_ts ON edges(ts, src, dst, kind);
+    """
+
+    def __init__(self, db_path: Optional[str] = None, k_hop_limit: Optional[int] = None):
+        settings = TwitterConfig.get_graph_settings()
+        self.db_path = db_path or settings['db_path']
+        self.k_hop_limit = k_hop_limit or settings['k_hop_limit']
+        self.damping = settings['pagerank_damping']
+        directory = os.path.dirname(self.db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.RLock()
+        self.conn = sqlite3.connect(self.db_path, timeout=30.0, isolation_level=None, check_same_thread=False)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.executescript(self.SCHEMA)
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        with self._lock:
+            self.conn.execute('BEGIN IMMEDIATE')
+            try:
+                yield self.conn
+            except Exception:
+                self.conn.execute('ROLLBACK')
+                raise
+            self.conn.execute('COMMIT')
+
+    def _node_ids(self, conn: sqlite3.Connection, handles: Iterable[str], create: bool = True) -> Dict[str, int]:
+        """Lower-cased handle → node id, adding unknown handles when `create` is set"""
+        handles = list(dict.fromkeys(handles))
+        if create:
+            conn.executemany("INSERT OR IGNORE INTO nodes (handle) VALUES (?)", [(h,) for h in handles])
+        ids = {}
+        for chunk in _chunks(handles):
+            placeholders = ','.join('?' * len(chunk))
+            ids.update((handle.lower(), node_id) for node_id, handle in conn.execute(
+                f"SELECT node_id, handle FROM nodes WHERE handle IN ({placeholders})", chunk
+            ))
+        return ids
+
+    def add(self, records: Iterable[TweetRecord]) -> int:
+        """Insert the interactions of a batch of tweets; returns the number of new edges"""
+        rows = []
+        for record in records:
+            edges = record_edges(record)
+            if edges:
+                ts = parse_timestamp(record.timestamp)
+                rows.extend((tweet_key(record.tweet_id), src, dst, kind, int(ts) if ts else None)
+                            for src, dst, kind in edges)
+        if not rows:
+            return 0
+
+        with self._transaction() as conn:
+            ids = self._node_ids(conn, [h for row in rows for h in (row[1], row[2])])
+            before = conn.total_changes
+            conn.executemany(
+                "INSERT OR IGNORE INTO edges (tweet_key, src, dst, kind, ts) VALUES (?, ?, ?, ?, ?)",
+                [(key, ids[src.lower()], ids[dst.lower()], kind, ts) for key, src, dst, kind, ts in rows]
+            )
+            return conn.total_changes - before
+
+    def consume(self, records: List[TweetRecord], query: Optional[str], captured_at: Optional[str]) -> int:
+        """IngestPipeline consumer"""
+        return self.add(records)
+
+    def node_id(self, handle: str) -> Optional[int]:
+        with self._lock:
+            row = self.conn.execute("SELECT node_id FROM nodes WHERE handle = ?", (handle.lstrip('@'),)).fetchone()
+        return row[0] if row else None
+
+    def handles(self, node_ids: Iterable[int]) -> Dict[int, str]:
+        node_ids = [int(i) for i in node_ids]
+        result = {}
+        with self._lock:
+            for chunk in _chunks(node_ids):
+                placeholders = ','.join('?' * len(chunk))
+                result.update(self.conn.execute(
+                    f"SELECT node_id, handle FROM nodes WHERE node_id IN ({placeholders})", chunk
+                ))
+        return result
+
+    @staticmethod
+    def _window_clause(start: Optional[str], end: Optional[str], kinds: Optional[Iterable[str]]) -> Tuple[str, List]:
+        clauses, params = [], []
+        for bound, operator in ((start, '>='), (end, '<')):
+            if bound is None:
+                continue
+            ts = parse_timestamp(bound)
+            if ts is None:
+                raise ValueError(f"Invalid time bound '{bound}' (expected an ISO timestamp)")
+            clauses.append(f"ts {operator} ?")
+            params.append(int(ts))
+        if kinds is not None:
+            codes = [EDGE_KINDS[kind] for kind in kinds]
+            clauses.append(f"kind IN ({','.join('?' * len(codes))})")
+            params.extend(codes)
+        return ''.join(f" AND {clause}" for clause in clauses), params
+
+    def _adjacent(self, node_ids: Sequence[int], direction: str, window: str,
+                  params: List) -> Iterator[Tuple[int, int, int]]:
+        """(node, neighbor, edge count) for edges of `node_ids` in the window"""
+        sides = [('src', 'dst')] if direction == OUT else [('dst', 'src')] if direction == IN \
+            else [('src', 'dst'), ('dst', 'src')]
+        for chunk in _chunks(node_ids):
+            placeholders = ','.join('?' * len(chunk))
+            for this, other in sides:
+                yield from self.conn.execute(
+                    f"SELECT {this}, {other}, COUNT(*) FROM edges WHERE {this} IN ({placeholders}){window} "
+                    f"GROUP BY {this}, {other}",
+                    [*chunk, *params]
+                )
+
+    def neighbors(self, handle: str, direction: str = BOTH, start: Optional[str] = None,
+                  end: Optional[str] = None, kinds: Optional[Iterable[str]] = None) -> List[Tuple[str, int]]:
+        """Accounts adjacent to `handle` with interaction counts, most frequent first"""
+        node_id = self.node_id(handle)
+        if node_id is None:
+            return []
+        window, params = self._window_clause(start, end, kinds)
+        counts: Dict[int, int] = {}
+        with self._lock:
+            for _, other, count in self._adjacent([node_id], direction, window, params):
+                counts[other] = counts.get(other, 0) + count
+        names = self.handles(counts)
+        return sorted(((names[i], c) for i, c in counts.items()), key=lambda item: (-item[1], item[0]))
+
+    def k_hop(self, handle: str, k: int = 2, direction: str = BOTH, start: Optional[str] = None,
+              end: Optional[str] = None, kinds: Optional[Iterable[str]] = None,
+              limit: Optional[int] = None) -> Dict[str, int]:
+        """Handle → hop distance for accounts within k hops, breadth first, stopping at `limit` accounts"""
+        node_id = self.node_id(handle)
+        if node_id is None:
+            return {}
+        limit = limit or self.k_hop_limit
+        window, params = self._window_clause(start, end, kinds)
+        hops = {node_id: 0}
+        frontier = [node_id]
+        with self._lock:
+            for hop in range(1, k + 1):
+                reached = []
+                for _, other, _ in self._adjacent(frontier, direction, window, params):
+                    if other not in hops:
+                        hops[other] = hop
+                        reached.append(other)
+                        if len(hops) >= limit:
+                            break
+                if len(hops) >= limit:
+                    logger.info(f"k-hop from {handle} stopped at {limit} accounts (hop {hop})")
+                    break
+                frontier = reached
+                if not frontier:
+                    break
+        names = self.handles(hops)
+        return {names[i]: hop for i, hop in sorted(hops.items(), key=lambda item: item[1])}
+
+    def snapshot(self, start: Optional[str] = None, end: Optional[str] = None,
+                 kinds: Optional[Iterable[str]] = None) -> GraphSnapshot:
+        """Load the edges of a time window into CSR arrays"""
+        window, params = self._window_clause(start, end, kinds)
+        with self._lock:
+            cursor = self.conn.execute(
+                f"SELECT src, dst, COUNT(*) FROM edges WHERE 1 = 1{window} GROUP BY src, dst", params
+            )
+            rows = np.array(cursor.fetchall(), dtype=np.int64).reshape(-1, 3)
+        node_ids, dense = np.unique(rows[:, :2], return_inverse=True)
+        dense = dense.reshape(-1, 2)
+        return GraphSnapshot(node_ids, dense[:, 0].copy(), dense[:, 1].copy(), rows[:, 2].astype(np.float64))
+
+    def rank(self, by: str = 'pagerank', start: Optional[str] = None, end: Optional[str] = None,
+             kinds: Optional[Iterable[str]] = None, limit: int = 50,
+             snapshot: Optional[GraphSnapshot] = None) -> List[Tuple[str, float]]:
+        """Top accounts by 'pagerank', 'degree', 'in_degree' or 'out_degree' in a time window"""
+        snapshot = snapshot or self.snapshot(start, end, kinds)
+        if by == 'pagerank':
+            scores = snapshot.pagerank(self.damping)
+        elif by in ('degree', 'in_degree', 'out_degree'):
+            scores = snapshot.degree({'degree': BOTH, 'in_degree': IN, 'out_degree': OUT}[by])
+        else:
+            raise ValueError(f"Unknown ranking '{by}' (expected pagerank, degree, in_degree or out_degree)")
+        top = np.argsort(-scores, kind='stable')[:limit]
+        names = self.handles(snapshot.node_ids[top])
+        return [(names[int(snapshot.node_ids[i])], float(scores[i])) for i in top]
+
+    def components(self, start: Optional[str] = None, end: Optional[str] = None,
+                   kinds: Optional[Iterable[str]] = None, min_size: int = 3,
+                   snapshot: Optional[GraphSnapshot] = None) -> List[List[str]]:
+        """Weakly connected groups of accounts in a time window, largest first"""
+        snapshot = snapshot or self.snapshot(start, end, kinds)
+        labels = snapshot.components()
+        unique, inverse, sizes = np.unique(labels, return_inverse=True, return_counts=True)
+        groups = []
+        for component in np.argsort(-sizes, kind='stable'):
+            if sizes[component] < min_size:
+                break
+            members = snapshot.node_ids[inverse == component]
+            names = self.handles(members)
+            groups.append(sorted(names.values(), key=str.lower))
+        return groups
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            nodes = self.conn.execute("SELECT COUNT(*) FROM nodes").fetchone()[0]
+            edges = self.conn.execute("SELECT COUNT(*) FROM edges").fetchone()[0]
+        return {'nodes': nodes, 'edges': edges}
@@ -0,0 +1,315 @@
+"""
+Influence Scoring Module
+Vectorized, incrementally updated influence scores for tweets and authors over a sliding time window
+"""
+
+import heapq
+import logging
+from typing import Optional, List, Dict, Iterable, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .config import TwitterConfig
+from .dedup import tweet_key
+from .extractor import TweetRecord
+
+logger = logging.getLogger(__name__)
+
+# Engagement metric (as named in the influence formula) → TweetRecord / tweet store column
+METRIC_COLUMNS = {
+    'views': 'view_count',
+    'forwards': 'retweet_count',
+    'replies': 'reply_count',
+    'reactions': 'like_count'
+}
+_COLUMNS = list(METRIC_COLUMNS.values())
+
+_EPOCH = pd.Timestamp(0, tz='UTC')
+
+# Accumulators are rebased before their growth factor leaves float64 range
+_REBASE_HALF_LIVES = 512
+
+
+def records_frame(records: Iterable[TweetRecord], captured_at: Optional[str] = None) -> pd.DataFrame:
+    """Frame with the columns InfluenceScorer.update expects, built from extracted records"""
+    rows = [(r.tweet_id, r.author, r.timestamp, r.view_count, r.retweet_count, r.reply_count, r.like_count)
+            for r in records]
+    frame = pd.DataFrame(rows, columns=['tweet_id', 'author', 'timestamp', *_COLUMNS])
+    frame['timestamp'] = pd.to_datetime(frame['timestamp'], utc=True, errors='coerce')
+    if captured_at is not None:
+        captured = pd.Timestamp(captured_at)
+        captured = captured.tz_localize('UTC') if captured.tzinfo is None else captured.tz_convert('UTC')
+        frame['timestamp'] = frame['timestamp'].fillna(captured)
+    return frame
+
+
+def _tweet_keys(tweet_ids: pd.Series) -> np.ndarray:
+    """dedup.tweet_key for a column of ids, parsing the usual all-digit ids without a Python loop"""
+    tweet_ids = tweet_ids.astype(str)
+    numeric = tweet_ids.str.fullmatch(r'\d{1,19}').fillna(False).to_numpy(dtype=bool, copy=True)
+    keys = np.empty(len(tweet_ids), dtype=np.int64)
+    values = tweet_ids[numeric].astype(np.uint64).to_numpy()
+    fits = values < np.uint64(2 ** 63)
+    keys[np.flatnonzero(numeric)[fits]] = values[fits].astype(np.int64)
+    numeric[np.flatnonzero(numeric)[~fits]] = False
+    # Ids beyond the int64 range and non-numeric ids are hashed by tweet_key
+    keys[~numeric] = [tweet_key(i) for i in tweet_ids[~numeric]]
+    return keys
+
+
+class InfluenceScorer:
+    """InfluenceScore = Σ wᵢ · metricᵢ / max(metricᵢ) · time_decay, per tweet and per author
+
+    metricᵢ are the view, retweet (forward), reply and like (reaction) counts,
+    max(metricᵢ) is taken over the tweets in the window, and time_decay =
+    0.5 ** (age / half_life) with age measured from the reference time (the
+    newest tweet seen, unless given). An author's score is the sum over
+    their tweets in the window.
+
+    Tweets live in preallocated arrays, one row each, found through a
+    tweet_key → row map; rows of expired tweets are reused. Each tweet adds
+    metricᵢ · 2^((t - epoch) / half_life) to its author's accumulators, and
+    since max(metricᵢ) and the decay to the reference time are the same for
+    every term, author scores are one matrix-vector product away. A
+    re-captured tweet replaces its earlier counts, and tweets that fall out
+    of the window are popped off a min-heap of timestamps and subtracted
+    again, so update() costs (amortized) the size of the batch, not of the
+    window; only scoring scans the window. A window of 0 keeps everything.
+    """
+
+    def __init__(self, weights: Optional[Dict[str, float]] = None, half_life_hours: Optional[float] = None,
+                 window_hours: Optional[float] = None):
+        settings = TwitterConfig.get_influence_settings()
+        weights = {**settings['weights'], **(weights or {})}
+        unknown = set(weights) - set(METRIC_COLUMNS)
+        if unknown:
+            raise ValueError(f"Unknown influence metrics {sorted(unknown)} (expected {list(METRIC_COLUMNS)})")
+        self.weights = np.array([weights[name] for name in METRIC_COLUMNS], dtype=np.float64)
+        self.half_life = (half_life_hours if half_life_hours is not None else settings['half_life_hours']) * 3600.0
+        self.window = (window_hours if window_hours is not None else settings['window_hours']) * 3600.0
+
+        # Tweet rows; _size is the high-water mark, freed rows below it are zeroed and listed in _free
+        self._rows: Dict[int, int] = {}
+        self._free: List[int] = []
+        self._size = 0
+        self._ids = np.empty(0, dtype=object)
+        self._author_codes = np.zeros(0, dtype=np.int64)
+        self._ts = np.zeros(0, dtype=np.float64)
+        self._metrics = np.zeros((0, len(_COLUMNS)), dtype=np.int64)
+        self._live = np.zeros(0, dtype=bool)
+        # (ts, tweet_key) min-heap; entries whose tweet was replaced with a new ts or expired are skipped
+        self._expiry: List[Tuple[float, int]] = []
+
+        self._author_index = pd.Index([], dtype=object)
+        self._totals = np.zeros((0, len(_COLUMNS)), dtype=np.float64)
+        self._counts = np.zeros(0, dtype=np.int64)
+        self._epoch: Optional[float] = None
+        self.latest: Optional[float] = None
+
+    def _growth(self, ts: np.ndarray) -> np.ndarray:
+        return np.exp2((ts - self._epoch) / self.half_life)
+
+    def _codes(self, authors: pd.Series) -> np.ndarray:
+        """Dense author codes, registering unseen authors"""
+        # Look up each distinct author once, then broadcast back to the rows
+        inverse, uniques = pd.factorize(authors)
+        codes = self._author_index.get_indexer(uniques)
+        missing = codes < 0
+        if missing.any():
+            start = len(self._author_index)
+            self._author_index = self._author_index.append(pd.Index(uniques[missing], dtype=object))
+            codes[missing] = np.arange(start, len(self._author_index))
+            grow = len(self._author_index) - len(self._counts)
+            self._totals = np.vstack([self._totals, np.zeros((grow, len(_COLUMNS)))])
+            self._counts = np.concatenate([self._counts, np.zeros(grow, dtype=np.int64)])
+        return codes.astype(np.int64)[inverse]
+
+    def _apply(self, codes: np.ndarray, ts: np.ndarray, metrics: np.ndarray, sign: int) -> None:
+        """Add (sign=1) or remove (sign=-1) tweets' contributions to their authors"""
+        if not len(codes):
+            return
+        contribution = metrics.astype(np.float64) * self._growth(ts)[:, None]
+        size = len(self._counts)
+        for j in range(len(_COLUMNS)):
+            self._totals[:, j] += sign * np.bincount(codes, contribution[:, j], minlength=size)
+        self._counts += sign * np.bincount(codes, minlength=size)
+
+    def _allocate(self, count: int) -> np.ndarray:
+        """Rows for `count` new tweets, reusing freed rows first and doubling the arrays when full"""
+        reused = min(count, len(self._free))
+        rows = self._free[len(self._free) - reused:]
+        del self._free[len(self._free) - reused:]
+        extra = count - reused
+        capacity = len(self._ts)
+        if self._size + extra > capacity:
+            capacity = max(2 * capacity, self._size + extra, 1024)
+            self._ids = np.concatenate([self._ids, np.empty(capacity - len(self._ids), dtype=object)])
+            self._author_codes = np.resize(self._author_codes, capacity)
+            self._ts = np.resize(self._ts, capacity)
+            self._metrics = np.vstack([self._metrics, np.zeros((capacity - len(self._metrics), len(_COLUMNS)),
+                                                               dtype=np.int64)])
+            self._live = np.concatenate([self._live, np.zeros(capacity - len(self._live), dtype=bool)])
+        rows.extend(range(self._size, self._size + extra))
+        self._size += extra
+        return np.array(rows, dtype=np.int64)
+
+    def update(self, frame: pd.DataFrame) -> int:
+        """Merge a frame of tweets (tweet_id, author, timestamp and metric columns); returns rows applied"""
+        frame = frame.dropna(subset=['timestamp'])
+        if frame.empty:
+            return 0
+        keys = _tweet_keys(frame['tweet_id'])
+        # Within a batch the last sighting of a tweet has the freshest counts
+        _, last = np.unique(keys[::-1], return_index=True)
+        keep = np.sort(len(keys) - 1 - last)
+        keys = keys[keep]
+        frame = frame.iloc[keep]
+        ts = ((pd.to_datetime(frame['timestamp'], utc=True) - _EPOCH) / pd.Timedelta(seconds=1)).to_numpy(
+            dtype=np.float64)
+
+        newest = float(ts.max())
+        if self._epoch is None:
+            self._epoch = float(ts.min())
+        self.latest = newest if self.latest is None else max(self.latest, newest)
+        if (self.latest - self._epoch) / self.half_life > _REBASE_HALF_LIVES:
+            self._rebase(self.latest)
+        if self.window:
+            inside = ts >= self.latest - self.window
+            keys, ts, frame = keys[inside], ts[inside], frame[inside]
+            if not len(keys):
+                self.expire()
+                return 0
+
+        codes = self._codes(frame['author'].astype(str))
+        metrics = np.column_stack([frame[column].fillna(0).to_numpy(dtype=np.int64) for column in _COLUMNS])
+        key_list = keys.tolist()
+        rows = np.fromiter((self._rows.get(key, -1) for key in key_list), dtype=np.int64, count=len(key_list))
+        known = rows >= 0
+        if known.any():
+            old = rows[known]
+            self._apply(self._author_codes[old], self._ts[old], self._metrics[old], -1)
+            moved = known.copy()
+            moved[known] = self._ts[old] != ts[known]
+        else:
+            moved = known
+        fresh = ~known
+        if fresh.any():
+            rows[fresh] = self._allocate(int(fresh.sum()))
+            self._rows.update(zip(keys[fresh].tolist(), rows[fresh].tolist()))
+
+        self._ids[rows] = frame['tweet_id'].astype(str).to_numpy()
+        self._author_codes[rows] = codes
+        self._ts[rows] = ts
+        self._metrics[rows] = metrics
+        self._live[rows] = True
+        self._apply(codes, ts, metrics, 1)
+        if self.window:
+            self._schedule(ts[fresh | moved], keys[fresh | moved])
+        self.expire()
+        return len(keys)
+
+    def _schedule(self, ts: np.ndarray, keys: np.ndarray) -> None:
+        entries = list(zip(ts.tolist(), keys.tolist()))
+        if len(entries) > len(self._expiry) or len(self._expiry) > 2 * len(self._rows) + 1024:
+            # Bulk loads and heaps full of stale entries are cheaper to rebuild than to push into
+            self._expiry = [entry for entry in self._expiry if self._rows.get(entry[1]) is not None
+                            and self._ts[self._rows[entry[1]]] == entry[0]]
+            self._expiry.extend(entries)
+            heapq.heapify(self._expiry)
+        else:
+            for entry in entries:
+                heapq.heappush(self._expiry, entry)
+
+    def add(self, records: Iterable[TweetRecord], captured_at: Optional[str] = None) -> int:
+        return self.update(records_frame(records, captured_at))
+
+    def consume(self, records: List[TweetRecord], query: Optional[str], captured_at: Optional[str]) -> int:
+        """IngestPipeline consumer; register with include_duplicates=True so re-captures refresh counts"""
+        return self.add(records, captured_at)
+
+    def expire(self) -> int:
+        """Drop tweets older than the window before the newest tweet; returns tweets dropped"""
+        if not self.window or not self._expiry:
+            return 0
+        cutoff = self.latest - self.window
+        expired = []
+        while self._expiry and self._expiry[0][0] < cutoff:
+            ts, key = heapq.heappop(self._expiry)
+            row = self._rows.get(key)
+            if row is not None and self._ts[row] == ts:
+                del self._rows[key]
+                expired.append(row)
+        if not expired:
+            return 0
+        rows = np.array(expired, dtype=np.int64)
+        self._apply(self._author_codes[rows], self._ts[rows], self._metrics[rows], -1)
+        self._ids[rows] = None
+        self._metrics[rows] = 0
+        self._live[rows] = False
+        self._free.extend(expired)
+        return len(expired)
+
+    def _rebase(self, epoch: float) -> None:
+        self._totals *= np.exp2((self._epoch - epoch) / self.half_life)
+        self._epoch = epoch
+
+    def _normalizers(self) -> np.ndarray:
+        """wᵢ / max(metricᵢ) over the window; metrics that are zero everywhere contribute nothing"""
+        # Freed rows are zeroed, so they never raise the maximum
+        maxima = self._metrics[:self._size].max(axis=0).astype(np.float64)
+        return np.divide(self.weights, maxima, out=np.zeros_like(self.weights), where=maxima > 0)
+
+    def _reference(self, reference: Optional[str]) -> float:
+        if reference is None:
+            return self.latest
+        ts = pd.Timestamp(reference)
+        ts = ts.tz_localize('UTC') if ts.tzinfo is None else ts
+        return ts.timestamp()
+
+    def tweet_scores(self, reference: Optional[str] = None, limit: Optional[int] = None) -> pd.DataFrame:
+        """Tweets in the window with their influence score, highest first"""
+        if not self._rows:
+            return pd.DataFrame(columns=['tweet_id', 'author', 'score'])
+        reference = self._reference(reference)
+        rows = np.flatnonzero(self._live[:self._size])
+        decay = np.exp2(-(reference - self._ts[rows]) / self.half_life)
+        scores = self._metrics[rows].astype(np.float64) @ self._normalizers() * decay
+        authors = self._author_index.to_numpy()[self._author_codes[rows]]
+        result = pd.DataFrame({'tweet_id': self._ids[rows], 'author': authors, 'score': scores})
+        result = result.sort_values('score', ascending=False, kind='stable', ignore_index=True)
+        return result.head(limit) if limit else result
+
+    def author_scores(self, reference: Optional[str] = None, limit: Optional[int] = None) -> pd.DataFrame:
+        """Authors with tweets in the window, their summed influence score and tweet count, highest first"""
+        if not self._rows:
+            return pd.DataFrame(columns=['author', 'score', 'tweets'])
+        reference = self._reference(reference)
+        decay = np.exp2(-(reference - self._epoch) / self.half_life)
+        # Subtraction on expiry can leave tiny negative residues
+        scores = np.maximum(self._totals @ self._normalizers() * decay, 0.0)
+        active = self._counts > 0
+        result = pd.DataFrame({
+            'author': self._author_index.to_numpy()[active],
+            'score': scores[active],
+            'tweets': self._counts[active]
+        })
+        result = result.sort_values('score', ascending=False, kind='stable', ignore_index=True)
+        return result.head(limit) if limit else result
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+
+def rank_window(frame: pd.DataFrame, weights: Optional[Dict[str, float]] = None,
+                half_life_hours: Optional[float] = None, reference: Optional[str] = None,
+                limit: Optional[int] = None) -> pd.DataFrame:
+    """Author ranking for one time window in a single pass, e.g. over ParquetTweetStore.read(start=, end=)
+
+    Rows for the same tweet (one per capture) collapse to the latest sighting.
+    """
+    if 'captured_at' in frame.columns:
+        frame = frame.sort_values('captured_at', kind='stable')
+    scorer = InfluenceScorer(weights, half_life_hours, window_hours=0)
+    scorer.update(frame)
+    return scorer.author_scores(reference, limit)
@@ -6,7 +6,7 @@ Command-line interface for the Twitter scraper
 import asyncio
 import sys
 import os
-from typing import List
+from typing import List, Optional, Dict, Any
 from datetime import datetime
 
 # Add parent directory to path
@@ -14,11 +14,20 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from twitter.scraper import TwitterScraper, TwitterCredentials
 from twitter.config import TwitterConfig
+from twitter.processor import BatchProcessor
+from twitter.archive import HtmlArchive
+from twitter.pipeline import IngestPipeline, INGEST_CHECKPOINT
+from twitter.tweet_store import ParquetTweetStore
+from twitter.dedup import TweetDedupIndex
+from twitter.analysis import AnalysisConsumers, attach_record_pipeline
+from twitter.browser_pool import BrowserPool
 
-async def run_single_search(query: str, headless: bool = False) -> bool:
+async def run_single_search(query: str, headless: bool = False, pool: Optional[BrowserPool] = None) -> bool:
     """Run a single search query"""
     try:
-        async with TwitterScraper(headless=headless) as scraper:
+        async with TwitterScraper(headless=headless, pool=pool) as scraper:
+            attach_record_pipeline(scraper)
+            
             # Login
             if not await scraper.login():
                 print(f"❌ Login failed!")
@@ -37,10 +46,18 @@ async def run_single_search(query: str, headless: bool = False) -> bool:
         print(f"❌ Error during search: {str(e)}")
         return False
 
-async def run_multiple_searches(queries: List[str], headless: bool = False) -> int:
+async def run_multiple_searches(queries: List[str], headless: bool = False,
+                                pool: Optional[BrowserPool] = None) -> int:
     """Run multiple search queries"""
     try:
-        async with TwitterScraper(headless=headless) as scraper:
+        async with TwitterScraper(headless=headless, pool=pool) as scraper:
+            attach_record_pipeline(scraper)
+            
+            # Login once; every page opened for concurrent searches shares this session
+            if not await scraper.login():
+                print(f"❌ Login failed!")
+                return 0
+            
             # Add queries to queue
             task_ids = await scraper.add_search_queries(queries)
             print(f"📝 Added {len(task_ids)} tasks to queue")
@@ -53,12 +70,88 @@ async def run_multiple_searches(queries: List[str], headless: bool = False) -> i
         print(f"❌ Error during batch processing: {str(e)}")
         return 0
 
+def run_html_processing(html_dir: Optional[str] = None, workers: Optional[int] = None,
+                        chunk_size: Optional[int] = None, store: bool = True, full: bool = False) -> int:
+    """Extract tweets from saved HTML captures using the process pool and store them
+
+    Only archived captures added since the last run are processed unless `full` is set.
+    """
+    processor = BatchProcessor(workers=workers, chunk_size=chunk_size)
+    tweet_store = ParquetTweetStore() if store else None
+    pipeline = IngestPipeline(processor, tweet_store, dedup=TweetDedupIndex())
+    analysis = AnalysisConsumers().attach(pipeline)
+    captures = processor.find_captures(html_dir) if full else pipeline.find_new_captures(html_dir)
+    print(f"📂 Processing {len(captures)} captures with {processor.workers} workers (chunk size {processor.chunk_size})")
+    
+    def report(result, stats):
+        if not result.ok:
+            print(f"❌ {os.path.basename(result.path)}: {result.error}")
+    
+    stats = pipeline.run(captures, on_result=report, checkpoint=INGEST_CHECKPOINT)
+    
+    print(f"📊 Processed {stats.captures} captures, {stats.failed} failed, {stats.tweets} tweets extracted "
+          f"({stats.duplicates} already seen)")
+    if tweet_store is not None:
+        print(f"💾 Stored {stats.stored} tweets in {tweet_store.root}")
+    print(f"🚨 {len(analysis.flagged)} new tweets at or above threat score {analysis.threshold}")
+    print(f"👥 {len({c.cluster_id for c in analysis.clusters})} near-duplicate clusters posted by "
+          f"{analysis.near_duplicates.min_authors}+ accounts")
+    print(f"📣 {len(analysis.bursts)} coordinated posting bursts ({analysis.detector.min_authors}+ accounts within "
+          f"{analysis.detector.window_seconds:g}s)")
+    graph_stats = analysis.graph.stats()
+    print(f"🕸️ Interaction graph: {graph_stats['nodes']} accounts, {graph_stats['edges']} interactions")
+    for row in analysis.influence.author_scores(limit=5).itertuples():
+        print(f"   ⭐ @{row.author}: influence {row.score:.3f} over {row.tweets} tweets")
+    print(f"📈 {len(analysis.emerging)} emerging terms; top terms: "
+          f"{', '.join(f'{term} ({count})' for term, count in analysis.trends.top(5)) or 'none'}")
+    return stats.failed
+
+def run_archive_import(html_dir: Optional[str] = None, remove: bool = False) -> int:
+    """Move loose HTML captures into the compressed archive"""
+    archive = HtmlArchive()
+    files = BatchProcessor.find_files(html_dir)
+    imported = archive.import_files(files, remove=remove)
+    stats = archive.stats()
+    print(f"🗜️ Imported {imported} files into {archive.root}")
+    print(f"   {stats['captures']} captures, {stats['blobs']} unique payloads, "
+          f"{stats['raw_bytes']:,} → {stats['stored_bytes']:,} bytes")
+    return imported
+
+def _option_value(args: List[str], name: str) -> Optional[str]:
+    """Return the value following a command-line option, if present"""
+    if name in args:
+        index = args.index(name)
+        if index + 1 < len(args):
+            return args[index + 1]
+    return None
+
 async def main():
     """Main entry point"""
     print("=" * 60)
     print("Anti-India Campaign Detector - Twitter Scraper v1.0")
     print("=" * 60)
     
+    # HTML processing works offline and needs no credentials
+    if len(sys.argv) > 1 and sys.argv[1] == "--process-html":
+        args = sys.argv[2:]
+        html_dir = args[0] if args and not args[0].startswith("--") else None
+        workers = _option_value(args, "--workers")
+        chunk_size = _option_value(args, "--chunk-size")
+        failed = run_html_processing(
+            html_dir,
+            workers=int(workers) if workers else None,
+            chunk_size=int(chunk_size) if chunk_size else None,
+            store="--no-store" not in args,
+            full="--all" in args
+        )
+        sys.exit(0 if failed == 0 else 1)
+    
+    if len(sys.argv) > 1 and sys.argv[1] == "--archive-html":
+        args = sys.argv[2:]
+        html_dir = args[0] if args and not args[0].startswith("--") else None
+        run_archive_import(html_dir, remove="--remove" in args)
+        sys.exit(0)
+    
     # Check credentials
     if not TwitterConfig.validate_credentials():
         print("❌ Twitter credentials not configured!")
@@ -78,18 +171,32 @@ async def main():
     print(f"💾 Database: {settings['db_path']}")
     print("-" * 60)
     
+    # One pool for the whole run: browsers stay warm between scraper sessions and are closed on exit
+    pool = BrowserPool(headless=settings['headless'])
+    try:
+        await run_searches(settings, pool)
+    finally:
+        await pool.close()
+
+async def run_searches(settings: Dict[str, Any], pool: BrowserPool) -> None:
+    """Run the single search or default batch selected on the command line"""
     # Check command line arguments
     if len(sys.argv) > 1:
         if sys.argv[1] == "--single" and len(sys.argv) > 2:
             query = " ".join(sys.argv[2:])
             print(f"🔍 Running single search: '{query}'")
-            success = await run_single_search(query, settings['headless'])
+            success = await run_single_search(query, settings['headless'], pool)
             sys.exit(0 if success else 1)
         
         elif sys.argv[1] == "--help":
             print("Usage:")
             print("  python main.py                    # Run default batch searches")
             print("  python main.py --single <query>   # Run single search")
+            print("  python main.py --process-html [dir] [--workers N] [--chunk-size N] [--no-store] [--all]")
+            print("                                    # Extract tweets from new captures into the Parquet store")
+            print("                                    # (--all reprocesses the whole archive)")
+            print("  python main.py --archive-html [dir] [--remove]")
+            print("                                    # Move loose HTML captures into the archive")
             print("  python main.py --help             # Show this help")
             sys.exit(0)
     
@@ -100,7 +207,7 @@ async def main():
     print("-" * 60)
     
     start_time = datetime.now()
-    completed_count = await run_multiple_searches(queries, settings['headless'])
+    completed_count = await run_multiple_searches(queries, settings['headless'], pool)
     end_time = datetime.now()
     duration = end_time - start_time
     
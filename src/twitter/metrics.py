@@ -0,0 +1,301 @@
+"""
+Scraper Metrics Module
+Per-stage timing, byte and retry histograms exported as JSON lines or Prometheus text
+"""
+
+import os
+import json
+import time
+import bisect
+import functools
+import logging
+from datetime import datetime
+from typing import Optional, Dict, Any, Tuple, List
+
+from .config import TwitterConfig
+
+logger = logging.getLogger(__name__)
+
+PREFIX = 'twitter_scraper'
+
+DURATION_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0, 120.0)
+BYTE_BUCKETS = (1e4, 5e4, 1e5, 5e5, 1e6, 5e6, 1e7, 5e7, 1e8)
+
+# Metric name -> (help text, bucket bounds)
+HISTOGRAMS = {
+    'stage_seconds': ("Duration of scraper stages in seconds", DURATION_BUCKETS),
+    'capture_bytes': ("Size of captured HTML / timeline JSON in bytes", BYTE_BUCKETS),
+}
+COUNTERS = {
+    'retries_total': "Retries by stage",
+    'stage_errors_total': "Stages that raised an exception",
+}
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+class Histogram:
+    """Fixed-bucket histogram; bucket counts are per bucket, cumulated on export"""
+
+    __slots__ = ('bounds', 'counts', 'count', 'sum', 'min', 'max')
+
+    def __init__(self, bounds: Tuple[float, ...]):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.min = float('inf')
+        self.max = float('-inf')
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    def cumulative(self) -> List[Tuple[str, int]]:
+        total = 0
+        buckets = []
+        for bound, count in zip(list(self.bounds) + [float('inf')], self.counts):
+            total += count
+            buckets.append(('+Inf' if bound == float('inf') else f"{bound:g}", total))
+        return buckets
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            'count': self.count,
+            'sum': round(self.sum, 6),
+            'min': round(self.min, 6) if self.count else None,
+            'max': round(self.max, 6) if self.count else None,
+            'buckets': dict(self.cumulative())
+        }
+
+
+class _StageTimer:
+    __slots__ = ('metrics', 'labels', 'started')
+
+    def __init__(self, metrics: 'ScraperMetrics', labels: Labels):
+        self.metrics = metrics
+        self.labels = labels
+
+    def __enter__(self) -> '_StageTimer':
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        self.metrics._observe('stage_seconds', self.labels, time.perf_counter() - self.started)
+        if exc_type is not None:
+            self.metrics._count('stage_errors_total', self.labels, 1)
+        return False
+
+
+class ScraperMetrics:
+    """Histograms and counters for one scraper process
+
+        with metrics.timer('navigation'):
+            await page.goto(...)
+        metrics.observe_bytes(len(html), kind='html')
+        metrics.count_retries('navigation', 2)
+
+    flush() writes the cumulative state: one JSON object appended per call
+    (format 'jsonl'), or the whole Prometheus text exposition replacing the
+    file (format 'prometheus', suitable for a node_exporter textfile
+    collector). A '{pid}' in the path is replaced by the process id, so
+    worker processes can write separate files.
+    """
+
+    enabled = True
+
+    def __init__(self, export_format: str = 'jsonl', path: Optional[str] = None):
+        if export_format not in ('jsonl', 'prometheus'):
+            raise ValueError(f"Unknown metrics format '{export_format}' (expected jsonl or prometheus)")
+        self.format = export_format
+        default = os.path.join('data', 'metrics', 'scraper.jsonl' if export_format == 'jsonl' else 'scraper.prom')
+        self.path = (path or default).replace('{pid}', str(os.getpid()))
+        self.histograms: Dict[Tuple[str, Labels], Histogram] = {}
+        self.counters: Dict[Tuple[str, Labels], float] = {}
+
+    def timer(self, stage: str, **labels: str) -> _StageTimer:
+        return _StageTimer(self, (('stage', stage),) + tuple(sorted(labels.items())))
+
+    def observe_seconds(self, stage: str, seconds: float) -> None:
+        self._observe('stage_seconds', (('stage', stage),), seconds)
+
+    def observe_bytes(self, size: int, kind: str) -> None:
+        self._observe('capture_bytes', (('kind', kind),), size)
+
+    def count_retries(self, stage: str, retries: int) -> None:
+        if retries:
+            self._count('retries_total', (('stage', stage),), retries)
+
+    def _observe(self, name: str, labels: Labels, value: float) -> None:
+        key = (name, labels)
+        histogram = self.histograms.get(key)
+        if histogram is None:
+            histogram = self.histograms[key] = Histogram(HISTOGRAMS[name][1])
+        histogram.observe(value)
+
+    def _count(self, name: str, labels: Labels, value: float) -> None:
+        key = (name, labels)
+        self.counters[key] = self.counters.get(key, 0) + value
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            'timestamp': datetime.now().isoformat(),
+            'pid': os.getpid(),
+            'histograms': [
+                {'name': f"{PREFIX}_{name}", 'labels': dict(labels), **histogram.as_dict()}
+                for (name, labels), histogram in sorted(self.histograms.items())
+            ],
+            'counters': [
+                {'name': f"{PREFIX}_{name}", 'labels': dict(labels), 'value': value}
+                for (name, labels), value in sorted(self.counters.items())
+            ]
+        }
+
+    def prometheus_text(self) -> str:
+        lines = []
+        for name, (help_text, _) in HISTOGRAMS.items():
+            series = [(labels, h) for (metric, labels), h in sorted(self.histograms.items()) if metric == name]
+            if not series:
+                continue
+            full = f"{PREFIX}_{name}"
+            lines += [f"# HELP {full} {help_text}", f"# TYPE {full} histogram"]
+            for labels, histogram in series:
+                for bound, count in histogram.cumulative():
+                    lines.append(f"{full}_bucket{_label_text(labels + (('le', bound),))} {count}")
+                lines.append(f"{full}_sum{_label_text(labels)} {histogram.sum:.6f}")
+                lines.append(f"{full}_count{_label_text(labels)} {histogram.count}")
+        for name, help_text in COUNTERS.items():
+            series = [(labels, v) for (metric, labels), v in sorted(self.counters.items()) if metric == name]
+            if not series:
+                continue
+            full = f"{PREFIX}_{name}"
+            lines += [f"# HELP {full} {help_text}", f"# TYPE {full} counter"]
+            lines += [f"{full}{_label_text(labels)} {value:g}" for labels, value in series]
+        return '\n'.join(lines) + '\n'
+
+    def render(self) -> Optional[str]:
+        """Export text for the current state, or None if nothing was recorded
+
+        Call this on the thread that records metrics (the event loop); only
+        the finished text may be handed to another thread for write().
+        """
+        if not self.histograms and not self.counters:
+            return None
+        if self.format == 'jsonl':
+            return json.dumps(self.snapshot(), separators=(',', ':')) + '\n'
+        return self.prometheus_text()
+
+    def write(self, text: Optional[str]) -> None:
+        """Write text from render(); failures are logged, never raised"""
+        if text is None:
+            return
+        try:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            if self.format == 'jsonl':
+                with open(self.path, 'a', encoding='utf-8') as f:
+                    f.write(text)
+            else:
+                # Replace atomically so a scraping collector never reads half a file
+                tmp_path = f"{self.path}.{os.getpid()}.tmp"
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    f.write(text)
+                os.replace(tmp_path, self.path)
+        except Exception as e:
+            logger.warning(f"Failed to export metrics to {self.path}: {e}")
+
+    def flush(self) -> None:
+        """Export the current state; failures are logged, never raised"""
+        try:
+            text = self.render()
+        except Exception as e:
+            logger.warning(f"Failed to render metrics: {e}")
+            return
+        self.write(text)
+
+    def summary(self) -> str:
+        parts = [
+            f"{dict(labels).get('stage')} {h.sum / h.count:.2f}s avg ×{h.count}"
+            for (name, labels), h in sorted(self.histograms.items()) if name == 'stage_seconds'
+        ]
+        return ', '.join(parts) or 'no samples'
+
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _label_text(labels: Labels) -> str:
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{key}="{_escape(value)}"' for key, value in labels) + '}'
+
+
+class _NullTimer:
+    __slots__ = ()
+
+    def __enter__(self) -> '_NullTimer':
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class NullMetrics:
+    """Drop-in for ScraperMetrics when metrics are off; every call is a no-op"""
+
+    enabled = False
+
+    def timer(self, stage: str, **labels: str) -> _NullTimer:
+        return _NULL_TIMER
+
+    def observe_seconds(self, stage: str, seconds: float) -> None:
+        pass
+
+    def observe_bytes(self, size: int, kind: str) -> None:
+        pass
+
+    def count_retries(self, stage: str, retries: int) -> None:
+        pass
+
+    def render(self) -> Optional[str]:
+        return None
+
+    def write(self, text: Optional[str]) -> None:
+        pass
+
+    def flush(self) -> None:
+        pass
+
+    def summary(self) -> str:
+        return 'metrics disabled'
+
+
+def metrics_from_settings():
+    """ScraperMetrics per METRICS_EXPORT / METRICS_PATH, or NullMetrics when METRICS_EXPORT is off"""
+    settings = TwitterConfig.get_metrics_settings()
+    if settings['export'] in ('', 'off', 'none'):
+        return NullMetrics()
+    return ScraperMetrics(settings['export'], settings['path'])
+
+
+def timed(stage: str):
+    """Time an async TwitterScraper method as `stage` in self.metrics"""
+    def decorate(func):
+        @functools.wraps(func)
+        async def wrapper(self, *args, **kwargs):
+            if not self.metrics.enabled:
+                return await func(self, *args, **kwargs)
+            with self.metrics.timer(stage):
+                return await func(self, *args, **kwargs)
+        return wrapper
+    return decorate
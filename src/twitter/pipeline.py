@@ -0,0 +1,155 @@
+"""
+Ingestion Pipeline Module
+Connects batch extraction to tweet storage and downstream record consumers
+"""
+
+import logging
+import threading
+from dataclasses import dataclass, field
+from typing import Optional, List, Callable, Iterable
+
+from .processor import BatchProcessor, FileResult, Capture
+from .archive import HtmlArchive, ArchiveEntry
+from .tweet_store import ParquetTweetStore
+from .dedup import TweetDedupIndex, DUPLICATE
+from .extractor import TweetRecord
+
+logger = logging.getLogger(__name__)
+
+# Called with (records, query, captured_at) for every successfully parsed capture
+RecordConsumer = Callable[[List[TweetRecord], Optional[str], Optional[str]], None]
+
+# Archive checkpoint kept by incremental --process-html runs
+INGEST_CHECKPOINT = 'ingest'
+
+
+@dataclass
+class IngestStats:
+    """Counters for one ingestion run"""
+    captures: int = 0
+    failed: int = 0
+    tweets: int = 0
+    duplicates: int = 0
+    stored: int = 0
+    errors: List[str] = field(default_factory=list)
+    # Archive ids of captures that failed, so the checkpoint stops short of them
+    failed_captures: List[int] = field(default_factory=list)
+
+
+class IngestPipeline:
+    """Stream captures through extraction, storage and registered consumers
+
+    Consumers normally see only records the dedup index has not seen before.
+    Consumers added with include_duplicates=True see every parsed record
+    instead, for state that re-sightings still change: a retweet by another
+    account repeats the original post's id and text, and a re-captured tweet
+    carries fresher engagement counts.
+    """
+
+    def __init__(self, processor: Optional[BatchProcessor] = None, store: Optional[ParquetTweetStore] = None,
+                 consumers: Optional[List[RecordConsumer]] = None, dedup: Optional[TweetDedupIndex] = None,
+                 archive: Optional[HtmlArchive] = None):
+        self.processor = processor or BatchProcessor()
+        self.store = store
+        self.dedup = dedup
+        self.archive = archive
+        self.consumers: List[RecordConsumer] = list(consumers or [])
+        self.observers: List[RecordConsumer] = []
+        self._ingest_lock = threading.Lock()
+
+    def add_consumer(self, consumer: RecordConsumer, include_duplicates: bool = False) -> None:
+        (self.observers if include_duplicates else self.consumers).append(consumer)
+
+    def _archive(self) -> Optional[HtmlArchive]:
+        if self.archive is None:
+            self.archive = self.processor.default_archive()
+        return self.archive
+
+    def find_new_captures(self, html_dir: Optional[str] = None, checkpoint: str = INGEST_CHECKPOINT) -> List[Capture]:
+        """Loose files plus the archived captures indexed since `checkpoint` last advanced"""
+        archive = self._archive()
+        after_id = archive.get_checkpoint(checkpoint) if archive is not None else None
+        return self.processor.find_captures(html_dir, archive, after_id=after_id)
+
+    def _advance_checkpoint(self, name: str, captures: List[Capture], stats: IngestStats) -> None:
+        """Move the checkpoint past the archived captures just ingested, stopping short of the first failure"""
+        archive = self._archive()
+        ids = [capture.id for capture in captures if isinstance(capture, ArchiveEntry)]
+        if archive is None or not ids:
+            return
+        mark = min(stats.failed_captures) - 1 if stats.failed_captures else max(ids)
+        if mark > archive.get_checkpoint(name):
+            archive.set_checkpoint(name, mark)
+
+    @staticmethod
+    def _record_failure(result: FileResult, stats: IngestStats, error: str) -> None:
+        stats.failed += 1
+        stats.errors.append(f"{result.path}: {error}")
+        if result.capture_id is not None:
+            stats.failed_captures.append(result.capture_id)
+
+    def handle_result(self, result: FileResult, stats: IngestStats) -> None:
+        """Drop already-seen tweets, then store the rest and hand them to consumers (all records to observers)"""
+        if not result.ok:
+            self._record_failure(result, stats, result.error)
+            return
+
+        stats.captures += 1
+        stats.tweets += len(result.records)
+        if not result.records:
+            return
+
+        records = result.records
+        if self.dedup is not None:
+            records = [record for record in records if self.dedup.check(record) != DUPLICATE]
+            stats.duplicates += len(result.records) - len(records)
+
+        if records and self.store is not None:
+            stats.stored += self.store.append(records, result.query or 'unknown', result.captured_at)
+
+        # Sightings are recorded only after storage succeeded, so a failed write is retried next run
+        if self.dedup is not None:
+            self.dedup.record(result.records, result.query, result.captured_at)
+
+        if records:
+            for consumer in self.consumers:
+                consumer(records, result.query, result.captured_at)
+        for observer in self.observers:
+            observer(result.records, result.query, result.captured_at)
+
+    def ingest_records(self, records: List[TweetRecord], query: Optional[str], captured_at: Optional[str],
+                       stats: Optional[IngestStats] = None) -> IngestStats:
+        """Feed records that did not come from a capture file (e.g. network capture) through the pipeline"""
+        stats = stats or IngestStats()
+        result = FileResult(path=f"live:{query}", records=list(records), query=query, captured_at=captured_at)
+        # Concurrent pages may deliver the same tweet; serialize so dedup sees one before the other
+        with self._ingest_lock:
+            self.handle_result(result, stats)
+        return stats
+
+    def run(self, captures: Optional[Iterable[Capture]] = None,
+            on_result: Optional[Callable[[FileResult, IngestStats], None]] = None,
+            checkpoint: Optional[str] = None) -> IngestStats:
+        """Process captures (all known captures by default) and return run statistics
+
+        With a checkpoint name, the archive checkpoint is advanced afterwards so
+        find_new_captures() skips the archived captures ingested here.
+        """
+        if captures is None:
+            captures = self.processor.find_captures()
+        elif checkpoint is not None:
+            captures = list(captures)
+
+        stats = IngestStats()
+        for result in self.processor.iter_results(captures):
+            try:
+                self.handle_result(result, stats)
+            except Exception as e:
+                # A storage or consumer failure only loses this capture
+                logger.error(f"❌ Failed to ingest {result.path}: {e}")
+                self._record_failure(result, stats, f"{type(e).__name__}: {e}")
+            if on_result:
+                on_result(result, stats)
+        if checkpoint is not None:
+            self._advance_checkpoint(checkpoint, captures, stats)
+        return stats
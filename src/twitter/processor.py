@@ -0,0 +1,232 @@
+"""
+Batch Processing Module
+Fans saved HTML captures out across a process pool and streams extracted tweets back
+"""
+
+import os
+import time
+import logging
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from typing import Optional, List, Iterator, Iterable, Union
+
+from .config import TwitterConfig
+from .extractor import TweetExtractor, TweetRecord
+from .archive import HtmlArchive, ArchiveEntry, parse_capture_filename
+from .timeline_json import iter_capture
+
+logger = logging.getLogger(__name__)
+
+# A capture is either a loose file path or an archive index entry
+Capture = Union[str, ArchiveEntry]
+
+# Network-mode captures hold timeline API responses as JSON Lines instead of HTML
+TIMELINE_SUFFIX = '.jsonl'
+CAPTURE_SUFFIXES = ('.html', TIMELINE_SUFFIX)
+
+# How a pool task was submitted: a regular chunk, one capture of a chunk that crashed a worker,
+# or a capture that crashed again next to others and now runs with nothing else in flight
+_CHUNK = 'chunk'
+_SINGLE = 'single'
+_ALONE = 'alone'
+
+
+@dataclass
+class FileResult:
+    """Outcome of extracting tweets from one capture"""
+    path: str
+    records: List[TweetRecord] = field(default_factory=list)
+    error: Optional[str] = None
+    duration: float = 0.0
+    query: Optional[str] = None
+    captured_at: Optional[str] = None
+    # Index id when the capture came from the archive
+    capture_id: Optional[int] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def _capture_label(capture: Capture) -> str:
+    return capture.label if isinstance(capture, ArchiveEntry) else capture
+
+
+def _capture_id(capture: Capture) -> Optional[int]:
+    return capture.id if isinstance(capture, ArchiveEntry) else None
+
+
+def _process_file(capture: Capture, extractor: Optional[TweetExtractor] = None) -> FileResult:
+    """Extract one capture, turning any failure into an error result"""
+    started = time.perf_counter()
+    result = FileResult(path=_capture_label(capture), capture_id=_capture_id(capture))
+    try:
+        extractor = extractor or TweetExtractor()
+        is_timeline = result.path.endswith(TIMELINE_SUFFIX)
+        if isinstance(capture, ArchiveEntry):
+            result.query, result.captured_at = capture.query, capture.captured_at
+            with capture.open() as stream:
+                result.records = list(iter_capture(stream) if is_timeline else extractor.iter_stream(stream))
+        else:
+            result.query, result.captured_at = parse_capture_filename(capture)
+            if is_timeline:
+                with open(capture, 'rb') as f:
+                    result.records = list(iter_capture(f))
+            else:
+                result.records = list(extractor.iter_file(capture))
+    except Exception as e:
+        result.error = f"{type(e).__name__}: {e}"
+    result.duration = time.perf_counter() - started
+    return result
+
+
+def _process_chunk(captures: List[Capture]) -> List[FileResult]:
+    """Worker entry point: extract a chunk of captures in one pool task"""
+    extractor = TweetExtractor()
+    return [_process_file(capture, extractor) for capture in captures]
+
+
+class BatchProcessor:
+    """Parallel tweet extraction over the HTML archive
+
+    Files are grouped into chunks and submitted to a ProcessPoolExecutor, with
+    at most a few chunks in flight per worker so memory does not grow with the
+    size of the backlog. Results are yielded per file as chunks complete, and a
+    failing file only produces an error result for that file. A file that
+    crashes a worker process outright is isolated by retrying the affected
+    chunk one file at a time on a fresh pool.
+    """
+
+    def __init__(self, workers: Optional[int] = None, chunk_size: Optional[int] = None,
+                 max_pending_per_worker: int = 2):
+        settings = TwitterConfig.get_processing_settings()
+        self.workers = max(1, workers or settings['workers'])
+        self.chunk_size = max(1, chunk_size or settings['chunk_size'])
+        self.max_pending = self.workers * max(1, max_pending_per_worker)
+
+    @staticmethod
+    def find_files(html_dir: Optional[str] = None, pattern_suffix: Union[str, tuple] = CAPTURE_SUFFIXES) -> List[str]:
+        """List capture files in the archive directory"""
+        html_dir = html_dir or TwitterConfig.get_processing_settings()['html_dir']
+        if not os.path.isdir(html_dir):
+            return []
+        with os.scandir(html_dir) as entries:
+            return sorted(
+                entry.path for entry in entries
+                if entry.is_file() and entry.name.endswith(pattern_suffix)
+            )
+
+    @staticmethod
+    def default_archive() -> Optional[HtmlArchive]:
+        """The configured archive, if one has been created"""
+        if os.path.exists(TwitterConfig.get_archive_settings()['root']):
+            return HtmlArchive()
+        return None
+
+    @classmethod
+    def find_captures(cls, html_dir: Optional[str] = None, archive: Optional[HtmlArchive] = None,
+                      since: Optional[str] = None, after_id: Optional[int] = None) -> List[Capture]:
+        """Loose HTML files plus archived captures (one per distinct payload)"""
+        captures: List[Capture] = list(cls.find_files(html_dir))
+        if archive is None:
+            archive = cls.default_archive()
+        if archive is not None:
+            captures.extend(archive.find(since=since, unique=True, after_id=after_id))
+        return captures
+
+    def _chunks(self, captures: Iterable[Capture]) -> Iterator[List[Capture]]:
+        chunk = []
+        for capture in captures:
+            chunk.append(capture)
+            if len(chunk) >= self.chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    def iter_results(self, captures: Iterable[Capture]) -> Iterator[FileResult]:
+        """Stream per-capture results in completion order"""
+        if self.workers == 1:
+            extractor = TweetExtractor()
+            for capture in captures:
+                yield _process_file(capture, extractor)
+            return
+
+        chunks = self._chunks(captures)
+        pool = ProcessPoolExecutor(max_workers=self.workers)
+        pending = {}
+        # Chunks to resubmit after a worker crash, ahead of new chunks
+        retry = deque()
+        # Single captures that crashed alongside others; each runs with nothing else in flight
+        alone = deque()
+        try:
+            while True:
+                if alone:
+                    if not pending:
+                        capture = alone.popleft()
+                        pending[pool.submit(_process_chunk, [capture])] = ([capture], _ALONE)
+                else:
+                    while len(pending) < self.max_pending:
+                        if retry:
+                            chunk, attempt = retry.popleft()
+                        else:
+                            chunk, attempt = next(chunks, None), _CHUNK
+                            if chunk is None:
+                                break
+                        pending[pool.submit(_process_chunk, chunk)] = (chunk, attempt)
+
+                if not pending:
+                    break
+
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                crashed = []
+                for future in done:
+                    chunk, attempt = pending.pop(future)
+                    try:
+                        results = future.result()
+                    except BrokenProcessPool:
+                        crashed.append((chunk, attempt))
+                        continue
+                    except Exception as e:
+                        for capture in chunk:
+                            yield FileResult(path=_capture_label(capture), error=f"{type(e).__name__}: {e}",
+                                             capture_id=_capture_id(capture))
+                        continue
+                    yield from results
+                if not crashed:
+                    continue
+
+                # A worker died hard and took the pool down. Chunks that finished first keep their results,
+                # the rest of the in-flight chunks are resubmitted whole, and the chunks that reported the
+                # crash are retried one capture at a time until the capture that kills a worker on its own
+                # is found.
+                for future, (chunk, attempt) in pending.items():
+                    if future.done() and not future.cancelled() and future.exception() is None:
+                        yield from future.result()
+                    else:
+                        retry.append((chunk, attempt))
+                pending.clear()
+                pool.shutdown(wait=False, cancel_futures=True)
+                pool = ProcessPoolExecutor(max_workers=self.workers)
+                for chunk, attempt in crashed:
+                    if attempt == _ALONE:
+                        label = _capture_label(chunk[0])
+                        logger.error(f"❌ Worker process crashed on {label}")
+                        yield FileResult(path=label, error="BrokenProcessPool: worker process crashed",
+                                         capture_id=_capture_id(chunk[0]))
+                    elif attempt == _CHUNK and len(chunk) > 1:
+                        logger.warning(f"⚠️ Worker process crashed on chunk starting {_capture_label(chunk[0])}; "
+                                       f"retrying its {len(chunk)} captures one at a time")
+                        retry.extendleft(([capture], _SINGLE) for capture in reversed(chunk))
+                    else:
+                        alone.append(chunk[0])
+        finally:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+    def process_directory(self, html_dir: Optional[str] = None) -> Iterator[FileResult]:
+        """Stream results for every loose file and archived capture"""
+        captures = self.find_captures(html_dir)
+        logger.info(f"📂 Processing {len(captures)} captures with {self.workers} workers (chunk size {self.chunk_size})")
+        return self.iter_results(captures)
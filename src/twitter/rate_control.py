@@ -0,0 +1,182 @@
+"""
+Rate Control Module
+Adaptive pacing for searches: token bucket with AIMD and jittered exponential retry backoff
+"""
+
+import time
+import random
+import asyncio
+import logging
+from collections import deque
+from typing import Optional, Dict, Any, Callable, Awaitable, TypeVar, Tuple, Type
+
+from .config import TwitterConfig
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+
+SUCCESS = 'success'
+ERROR = 'error'
+TIMEOUT = 'timeout'
+RATE_LIMITED = 'rate_limited'
+
+
+class RateController:
+    """Paces searches from observed outcomes
+
+    Every search takes a token from a bucket refilled at the current rate
+    (`burst` tokens at most). The rate follows AIMD: each success adds
+    `increase` searches/min up to `max_rate`, and an error, timeout or rate
+    limit response multiplies it by `decrease` down to `min_rate`, at most
+    once per `cooldown` seconds so one bad burst is not punished repeatedly.
+    Retries of a failing operation back off exponentially with full jitter
+    (`retry_base` * 2^attempt, capped at `retry_max`).
+
+    Rates are in searches per minute. One controller can be shared by every
+    page of a scraper (and across scraper sessions); it is not thread-safe
+    and belongs to one event loop.
+    """
+
+    def __init__(self, rate: Optional[float] = None, min_rate: Optional[float] = None,
+                 max_rate: Optional[float] = None, burst: Optional[float] = None,
+                 increase: Optional[float] = None, decrease: Optional[float] = None,
+                 cooldown: Optional[float] = None, jitter: Optional[float] = None,
+                 retry_base: Optional[float] = None, retry_max: Optional[float] = None,
+                 window: Optional[float] = None):
+        settings = TwitterConfig.get_rate_settings()
+        self.min_rate = min_rate if min_rate is not None else settings['min_rate']
+        self.max_rate = max_rate if max_rate is not None else settings['max_rate']
+        self.rate = min(self.max_rate, max(self.min_rate, rate if rate is not None else settings['initial_rate']))
+        self.burst = max(1.0, burst if burst is not None else settings['burst'])
+        self.increase = increase if increase is not None else settings['increase']
+        self.decrease = decrease if decrease is not None else settings['decrease']
+        self.cooldown = cooldown if cooldown is not None else settings['cooldown']
+        self.jitter = jitter if jitter is not None else settings['jitter']
+        self.retry_base = retry_base if retry_base is not None else settings['retry_base']
+        self.retry_max = retry_max if retry_max is not None else settings['retry_max']
+        self.window = window if window is not None else settings['window']
+
+        # Start with one token so the first search does not wait
+        self._tokens = 1.0
+        self._updated = time.monotonic()
+        self._last_decrease = float('-inf')
+        self._lock: Optional[asyncio.Lock] = None
+        self._outcomes: deque = deque()
+        self.waited = 0.0
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate / 60.0)
+        self._updated = now
+
+    async def acquire(self) -> float:
+        """Wait for a token; returns the seconds waited"""
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        waited = 0.0
+        # The lock keeps waiters in arrival order
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._refill(now)
+                if self._tokens >= 1.0:
+                    self._tokens -= 1.0
+                    break
+                # Re-checked after sleeping, since the rate may have changed meanwhile
+                delay = (1.0 - self._tokens) * 60.0 / self.rate
+                delay *= random.uniform(1.0, 1.0 + self.jitter)
+                await asyncio.sleep(delay)
+                waited += delay
+        self.waited += waited
+        return waited
+
+    def _observe(self, outcome: str) -> None:
+        self._outcomes.append((time.monotonic(), outcome))
+        self._expire()
+
+    def record_success(self) -> None:
+        self._observe(SUCCESS)
+        self.rate = min(self.max_rate, self.rate + self.increase)
+
+    def record_failure(self, kind: str = ERROR) -> None:
+        """Count an error, timeout or rate-limit response and cut the rate (once per cooldown)"""
+        self._observe(kind)
+        now = time.monotonic()
+        if now - self._last_decrease < self.cooldown:
+            return
+        self._last_decrease = now
+        self._refill(now)
+        previous = self.rate
+        self.rate = max(self.min_rate, self.rate * self.decrease)
+        if kind == RATE_LIMITED:
+            # Drop banked tokens too, so the next search waits a full interval
+            self._tokens = min(self._tokens, 0.0)
+        logger.warning(f"🐢 {kind.replace('_', ' ')}: rate {previous:.1f} → {self.rate:.1f} searches/min")
+
+    def backoff_delay(self, attempt: int) -> float:
+        """Full-jitter exponential backoff for retry number `attempt` (0-based)"""
+        return random.uniform(0, min(self.retry_max, self.retry_base * (2 ** attempt)))
+
+    async def retry(self, operation: Callable[[], Awaitable[T]], attempts: int, label: str = 'operation',
+                    classify: Optional[Callable[[Exception], str]] = None,
+                    retry_on: Tuple[Type[BaseException], ...] = (Exception,)) -> T:
+        """Run `operation` up to `attempts` times, recording each failure and backing off between tries"""
+        classify = classify or classify_error
+        for attempt in range(attempts):
+            try:
+                return await operation()
+            except retry_on as e:
+                self.record_failure(classify(e))
+                if attempt == attempts - 1:
+                    raise
+                delay = self.backoff_delay(attempt)
+                logger.warning(f"{label} attempt {attempt + 1}/{attempts} failed: {e}; retrying in {delay:.1f}s")
+                await asyncio.sleep(delay)
+        raise ValueError("attempts must be at least 1")
+
+    def error_rate(self) -> float:
+        """Share of failed outcomes within the last `window` seconds"""
+        self._expire()
+        if not self._outcomes:
+            return 0.0
+        return sum(1 for _, outcome in self._outcomes if outcome != SUCCESS) / len(self._outcomes)
+
+    def observed_rate(self) -> float:
+        """Completed outcomes per minute within the last `window` seconds"""
+        self._expire()
+        return len(self._outcomes) * 60.0 / self.window
+
+    def _expire(self) -> None:
+        now = time.monotonic()
+        while self._outcomes and now - self._outcomes[0][0] > self.window:
+            self._outcomes.popleft()
+
+    def gauges(self) -> Dict[str, Any]:
+        return {
+            'rate_per_min': round(self.rate, 2),
+            'observed_per_min': round(self.observed_rate(), 2),
+            'error_rate': round(self.error_rate(), 3),
+            'tokens': round(self._tokens, 2),
+            'waited_seconds': round(self.waited, 1)
+        }
+
+    def describe(self) -> str:
+        return (f"rate {self.rate:.1f}/min, observed {self.observed_rate():.1f}/min, "
+                f"errors {self.error_rate():.0%} (last {self.window / 60:.0f} min)")
+
+
+def classify_error(error: Exception) -> str:
+    """Outcome kind for an exception raised by a Playwright call"""
+    name = type(error).__name__
+    if 'Timeout' in name or 'timeout' in str(error).lower():
+        return TIMEOUT
+    return ERROR
+
+
+def classify_status(status: Optional[int]) -> str:
+    """Outcome kind for an HTTP status of a main-frame response"""
+    if status is None or status < 400:
+        return SUCCESS
+    if status == 429:
+        return RATE_LIMITED
+    return ERROR
@@ -0,0 +1,188 @@
+"""
+Page Readiness Module
+Event-driven waits for rendered tweets, replacing networkidle and fixed sleeps
+"""
+
+import json
+import time
+import random
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import Optional, List
+
+from playwright.async_api import Page
+
+from .config import TwitterConfig
+
+logger = logging.getLogger(__name__)
+
+# Counts every tweet node ever attached to the document. X virtualizes the
+# timeline and unloads rows while scrolling, so the live node count can stay
+# flat while new tweets render; a cumulative count grows with each new row.
+OBSERVER_SCRIPT = """
+(() => {
+    if (window.__tweetWatch) return;
+    const selector = %s;
+    const seen = new WeakSet();
+    const state = window.__tweetWatch = {seen: 0};
+    const add = (node) => {
+        if (!seen.has(node)) {
+            seen.add(node);
+            state.seen += 1;
+        }
+    };
+    new MutationObserver((mutations) => {
+        for (const mutation of mutations) {
+            for (const node of mutation.addedNodes) {
+                if (node.nodeType !== 1) continue;
+                if (node.matches(selector)) add(node);
+                node.querySelectorAll(selector).forEach(add);
+            }
+        }
+    }).observe(document, {childList: true, subtree: true});
+})();
+"""
+
+_COUNT_EXPRESSION = """
+    (selector) => window.__tweetWatch ? window.__tweetWatch.seen : document.querySelectorAll(selector).length
+"""
+
+# Resolves true on the mutation that satisfies the condition, false after the timeout. The
+# condition is spliced into this source instead of being compiled inside the page (new Function,
+# eval, or page.wait_for_function, which evals its predicate on every poll): a page CSP without
+# 'unsafe-eval' blocks those, while the evaluated source itself is compiled by the driver.
+_WAIT_TEMPLATE = """
+    ([arg, timeout]) => new Promise((resolve) => {
+        const check = %s;
+        if (check(arg)) return resolve(true);
+        const observer = new MutationObserver(() => {
+            if (check(arg)) {
+                observer.disconnect();
+                clearTimeout(timer);
+                resolve(true);
+            }
+        });
+        const timer = setTimeout(() => {
+            observer.disconnect();
+            resolve(check(arg));
+        }, timeout);
+        observer.observe(document, {childList: true, subtree: true});
+    })
+"""
+
+_AT_LEAST_CONDITION = """
+    ([selector, minimum]) => (window.__tweetWatch
+        ? window.__tweetWatch.seen
+        : document.querySelectorAll(selector).length) >= minimum
+"""
+
+
+def observer_script(selector: Optional[str] = None) -> str:
+    """Init script installing the tweet counter; add it to the browser context"""
+    return OBSERVER_SCRIPT % json.dumps(selector or TwitterConfig.SELECTORS['tweet_selector'])
+
+
+async def wait_for_condition(page: Page, condition: str, arg=None, timeout: float = 10.0) -> bool:
+    """Wait until a JS condition holds, re-checked on every DOM mutation, for at most `timeout` seconds
+
+    `condition` is the source of a JS function called with `arg`. Navigation while waiting destroys the page context; that counts as not ready.
+    """
+    try:
+        return bool(await asyncio.wait_for(
+            page.evaluate(_WAIT_TEMPLATE % condition.strip(), [arg, int(timeout * 1000)]), timeout + 5
+        ))
+    except Exception as e:
+        logger.debug(f"Readiness wait aborted: {e}")
+        return False
+
+
+@dataclass
+class WaitTiming:
+    """Time spent on one readiness step"""
+    step: str
+    waited: float
+    paced: float = 0.0
+    ready: bool = True
+    tweets: int = 0
+
+
+class PageReadiness:
+    """Waits on a page until tweets render, then pads to the pacing floor
+
+    Each wait resolves on the DOM mutation that satisfies it (a
+    MutationObserver inside the page) and gives up after a bounded timeout.
+    The configured delays are applied as a floor on the whole step: if
+    rendering already took longer, no extra sleep is added.
+    """
+
+    def __init__(self, page: Page, selector: Optional[str] = None):
+        settings = TwitterConfig.get_scraper_settings()
+        self.page = page
+        self.selector = selector or TwitterConfig.SELECTORS['tweet_selector']
+        self.min_tweets = settings['ready_min_tweets']
+        self.ready_timeout = settings['ready_timeout']
+        self.scroll_timeout = settings['scroll_ready_timeout']
+        self.timings: List[WaitTiming] = []
+
+    async def tweet_count(self) -> int:
+        try:
+            return await self.page.evaluate(_COUNT_EXPRESSION, self.selector)
+        except Exception as e:
+            logger.debug(f"Tweet count unavailable: {e}")
+            return 0
+
+    async def _wait_for_count(self, minimum: int, timeout: float) -> bool:
+        return await wait_for_condition(self.page, _AT_LEAST_CONDITION, [self.selector, minimum], timeout)
+
+    async def _record(self, step: str, started: float, ready: bool,
+                      floor: Optional[tuple]) -> WaitTiming:
+        waited = time.perf_counter() - started
+        paced = 0.0
+        if floor:
+            paced = max(0.0, random.uniform(*floor) - waited)
+            if paced:
+                await asyncio.sleep(paced)
+        timing = WaitTiming(step, waited, paced, ready, await self.tweet_count())
+        self.timings.append(timing)
+        return timing
+
+    async def wait_for_tweets(self, step: str = 'initial', minimum: Optional[int] = None,
+                              floor: Optional[tuple] = None, started: Optional[float] = None) -> WaitTiming:
+        """Resolve once `minimum` tweets (READY_MIN_TWEETS) have rendered, or after READY_TIMEOUT"""
+        started = started if started is not None else time.perf_counter()
+        ready = await self._wait_for_count(minimum or self.min_tweets, self.ready_timeout)
+        if not ready:
+            logger.warning(f"⏳ No tweets rendered within {self.ready_timeout:.0f}s ({step})")
+        return await self._record(step, started, ready, floor)
+
+    async def wait_for_growth(self, previous: int, step: str, floor: Optional[tuple] = None,
+                              started: Optional[float] = None) -> WaitTiming:
+        """Resolve as soon as more tweets than `previous` have rendered, or after SCROLL_READY_TIMEOUT"""
+        started = started if started is not None else time.perf_counter()
+        ready = await self._wait_for_count(previous + 1, self.scroll_timeout)
+        return await self._record(step, started, ready, floor)
+
+    def total_waited(self) -> float:
+        return sum(timing.waited for timing in self.timings)
+
+    def total_paced(self) -> float:
+        return sum(timing.paced for timing in self.timings)
+
+    def summary(self) -> str:
+        steps = ', '.join(
+            f"{t.step} {t.waited:.2f}s{'' if t.ready else ' (timeout)'}" + (f" +{t.paced:.2f}s pace" if t.paced else '')
+            for t in self.timings
+        )
+        return f"waited {self.total_waited():.1f}s, paced {self.total_paced():.1f}s — {steps}"
+
+
+# Logged-in home renders the primary column; an invalid session redirects away from /home
+_HOME_SETTLED_CONDITION = """
+    () => !location.pathname.startsWith('/home') || !!document.querySelector('[data-testid="primaryColumn"]')
+"""
+
+
+async def wait_for_home(page: Page, timeout: float = 10.0) -> bool:
+    """After navigating to /home, wait until it either renders or redirects to login"""
+    return await wait_for_condition(page, _HOME_SETTLED_CONDITION, None, timeout)
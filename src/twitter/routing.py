@@ -0,0 +1,104 @@
+"""
+Request Routing Module
+Blocks unneeded browser requests by resource type and URL pattern
+"""
+
+import re
+import logging
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Optional, Dict, Tuple, FrozenSet, Pattern
+
+from .config import TwitterConfig
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class ResourcePolicy:
+    """Named set of resource types and URL patterns to abort"""
+    name: str
+    block_types: FrozenSet[str] = frozenset()
+    block_patterns: Tuple[Pattern, ...] = ()
+
+    @classmethod
+    def from_profile(cls, name: Optional[str] = None) -> 'ResourcePolicy':
+        name = name or TwitterConfig.get_scraper_settings()['resource_profile']
+        try:
+            profile = TwitterConfig.RESOURCE_PROFILES[name]
+        except KeyError:
+            known = ', '.join(TwitterConfig.RESOURCE_PROFILES)
+            raise ValueError(f"Unknown resource profile '{name}' (known: {known})") from None
+        return cls(
+            name=name,
+            block_types=frozenset(profile.get('block_types', [])),
+            block_patterns=tuple(re.compile(pattern) for pattern in profile.get('block_patterns', []))
+        )
+
+    @property
+    def blocks_anything(self) -> bool:
+        return bool(self.block_types or self.block_patterns)
+
+    def should_block(self, resource_type: str, url: str) -> bool:
+        if resource_type in self.block_types:
+            return True
+        return any(pattern.search(url) for pattern in self.block_patterns)
+
+
+@dataclass
+class ResourceCounter:
+    """Per resource type request/byte counts"""
+    blocked: int = 0
+    allowed: int = 0
+    allowed_bytes: int = 0
+
+
+@dataclass
+class RequestBlocker:
+    """Applies a ResourcePolicy to a browser context through context.route()
+
+    Aborted requests never reach the network, so their size is unknown; the
+    counters record how many were blocked per type, and for requests that
+    were let through, the bytes received (from Content-Length) per type.
+    """
+    policy: ResourcePolicy
+    counters: Dict[str, ResourceCounter] = field(default_factory=lambda: defaultdict(ResourceCounter))
+
+    async def attach(self, context) -> None:
+        if not self.policy.blocks_anything:
+            return
+        await context.route('**/*', self._handle)
+        context.on('response', self._on_response)
+        logger.info(f"🚧 Request blocking profile '{self.policy.name}': "
+                    f"types={sorted(self.policy.block_types)}, {len(self.policy.block_patterns)} URL patterns")
+
+    async def _handle(self, route) -> None:
+        request = route.request
+        if self.policy.should_block(request.resource_type, request.url):
+            self.counters[request.resource_type].blocked += 1
+            await route.abort('blockedbyclient')
+        else:
+            await route.continue_()
+
+    def _on_response(self, response) -> None:
+        counter = self.counters[response.request.resource_type]
+        counter.allowed += 1
+        try:
+            counter.allowed_bytes += int(response.headers.get('content-length', 0))
+        except ValueError:
+            pass
+
+    @property
+    def blocked_total(self) -> int:
+        return sum(counter.blocked for counter in self.counters.values())
+
+    def summary(self) -> str:
+        parts = [
+            f"{resource_type}: {counter.blocked} blocked / {counter.allowed} allowed ({counter.allowed_bytes:,} bytes)"
+            for resource_type, counter in sorted(self.counters.items(), key=lambda item: -item[1].blocked)
+        ]
+        return '; '.join(parts) or 'no requests seen'
+
+    def log_summary(self) -> None:
+        if self.policy.blocks_anything:
+            logger.info(f"🚧 Requests ({self.policy.name}): {self.blocked_total} blocked — {self.summary()}")
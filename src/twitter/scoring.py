@@ -0,0 +1,265 @@
+"""
+Threat Scoring Module
+Batch keyword scoring of tweets against the weighted threat keyword table
+"""
+
+import os
+import re
+import json
+import time
+import logging
+import threading
+from dataclasses import dataclass
+from typing import Optional, List, Dict, Any, Sequence, Tuple, Pattern
+
+import numpy as np
+
+from .config import TwitterConfig
+from .extractor import TweetRecord
+
+logger = logging.getLogger(__name__)
+
+# Texts are joined with a character no keyword pattern can match across
+_SEPARATOR = '\x00'
+
+
+@dataclass(frozen=True)
+class KeywordCategory:
+    """One weighted keyword category from the keyword table"""
+    name: str
+    weight: float
+    keywords: Tuple[str, ...]
+    patterns: Tuple[str, ...] = ()
+    label: Optional[str] = None
+
+
+def _normalize(term: str) -> str:
+    return ' '.join(term.lower().split())
+
+
+def _term_pattern(term: str) -> str:
+    """Regex for one literal keyword, matching any run of whitespace between words"""
+    return r'\s+'.join(re.escape(part) for part in term.split())
+
+
+class KeywordTable:
+    """Compiled keyword table: every term of every category in one regex
+
+    English (ASCII) terms sit inside one shared \\b...\\b block so 'riot'
+    does not fire on 'patriot'; Devanagari terms match as substrings, since
+    inflected forms (हमलावर, बमबारी) should count too. Custom regex patterns
+    are used as written against lower-cased text and must not contain
+    capturing groups.
+
+    The regex has no per-category groups: matched terms are mapped to a term
+    code through a dictionary, and a (terms x categories) membership matrix
+    turns codes into category hits. A term listed under several categories
+    counts for each of them.
+    """
+
+    # Reserved term codes whose membership rows are all zeros
+    SEPARATOR_CODE = 0
+    UNMATCHED_CODE = 1
+
+    def __init__(self, categories: Sequence[KeywordCategory], source: Optional[str] = None):
+        self.categories = tuple(categories)
+        self.source = source
+        self.names = tuple(category.name for category in self.categories)
+        self.weights = np.array([category.weight for category in self.categories], dtype=np.float32)
+
+        self.term_codes: Dict[str, int] = {_SEPARATOR: self.SEPARATOR_CODE}
+        self._custom: List[Tuple[Pattern, int]] = []
+        members: List[List[int]] = [[], []]
+        for i, category in enumerate(self.categories):
+            for term in category.keywords:
+                term = _normalize(term)
+                if term:
+                    if term not in self.term_codes:
+                        self.term_codes[term] = len(members)
+                        members.append([])
+                    members[self.term_codes[term]].append(i)
+            for pattern in category.patterns:
+                compiled = re.compile(pattern)
+                if compiled.groups:
+                    raise ValueError(f"Pattern {pattern!r} in '{category.name}' must use (?:...) instead of groups")
+                self._custom.append((compiled, len(members)))
+                members.append([i])
+
+        self.membership = np.zeros((len(members), len(self.categories)), dtype=np.int32)
+        for code, columns in enumerate(members):
+            self.membership[code, columns] = 1
+        self._literal_codes = len(self.term_codes)
+        self.pattern = self._compile()
+
+    def _compile(self) -> Optional[Pattern]:
+        terms = sorted((term for term in self.term_codes if term != _SEPARATOR), key=len, reverse=True)
+        english = [_term_pattern(term) for term in terms if term.isascii()]
+        branches = [re.escape(_SEPARATOR)]
+        if english:
+            branches.append(rf"\b(?:{'|'.join(english)})\b")
+        branches.extend(_term_pattern(term) for term in terms if not term.isascii())
+        branches.extend(pattern.pattern for pattern, _ in self._custom)
+        return re.compile('|'.join(branches)) if len(branches) > 1 else None
+
+    def code_for(self, token: str) -> int:
+        """Term code of a matched token (whitespace variants and custom pattern hits are resolved here)"""
+        code = self.term_codes.get(_normalize(token))
+        if code is None:
+            code = next((code for pattern, code in self._custom if pattern.fullmatch(token)), self.UNMATCHED_CODE)
+            if code == self.UNMATCHED_CODE:
+                logger.debug(f"Unclassified keyword match: {token!r}")
+        # Remember lookups, but do not let custom pattern matches grow the table without bound
+        if len(self.term_codes) < self._literal_codes + 100_000:
+            self.term_codes[token] = code
+        return code
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], source: Optional[str] = None) -> 'KeywordTable':
+        """Build from {"categories": {name: {"weight", "keywords", "patterns", "label"}}}"""
+        categories = []
+        for name, spec in data.get('categories', {}).items():
+            weight = float(spec.get('weight', 0.5))
+            if not 0.0 <= weight <= 1.0:
+                raise ValueError(f"Weight for category '{name}' must be between 0 and 1, got {weight}")
+            categories.append(KeywordCategory(
+                name=name,
+                weight=weight,
+                keywords=tuple(spec.get('keywords', [])),
+                patterns=tuple(spec.get('patterns', [])),
+                label=spec.get('label')
+            ))
+        return cls(categories, source)
+
+    @classmethod
+    def load(cls, path: str) -> 'KeywordTable':
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls.from_dict(json.load(f), source=path)
+
+    def keyword_count(self) -> int:
+        return sum(len(category.keywords) + len(category.patterns) for category in self.categories)
+
+
+@dataclass
+class ThreatScores:
+    """Scores for one batch; row i of every array belongs to text i"""
+    categories: Tuple[str, ...]
+    counts: np.ndarray           # (n, k) keyword hits per category
+    category_scores: np.ndarray  # (n, k) category weight where the category matched, else 0
+    threat_score: np.ndarray     # (n,) combined score in [0, 1]
+
+    def __len__(self) -> int:
+        return len(self.threat_score)
+
+    def _column(self, name: str) -> int:
+        try:
+            return self.categories.index(name)
+        except ValueError:
+            raise KeyError(f"Unknown keyword category: {name}") from None
+
+    def category(self, name: str) -> np.ndarray:
+        """Score array for one category"""
+        return self.category_scores[:, self._column(name)]
+
+    def hits(self, name: str) -> np.ndarray:
+        """Keyword hit counts for one category"""
+        return self.counts[:, self._column(name)]
+
+    def flagged(self, threshold: Optional[float] = None) -> np.ndarray:
+        """Indices of texts whose threat score reaches the threshold"""
+        if threshold is None:
+            threshold = TwitterConfig.get_analysis_settings()['threat_threshold']
+        return np.flatnonzero(self.threat_score >= threshold)
+
+    def as_dict(self) -> Dict[str, np.ndarray]:
+        """Per-category score arrays plus the combined threat score"""
+        columns = {name: self.category_scores[:, i] for i, name in enumerate(self.categories)}
+        columns['threat_score'] = self.threat_score
+        return columns
+
+
+class ThreatScorer:
+    """Scores batches of tweet texts against a hot-reloadable keyword table
+
+    A batch is joined into one lower-cased string that the combined regex
+    scans once; matches become an array of term codes that is mapped back to
+    texts and categories with NumPy, so the cost grows with the amount of
+    text and the number of matches, not with the number of keywords.
+
+    A category contributes its weight when any of its keywords matches, and
+    categories combine as independent signals:
+    threat = 1 - prod(1 - category_score).
+
+    The keyword file is re-read when its modification time changes (checked
+    at most every reload_interval seconds); an invalid edit is logged and the
+    previous table stays active.
+    """
+
+    def __init__(self, path: Optional[str] = None, reload_interval: Optional[float] = None,
+                 table: Optional[KeywordTable] = None):
+        settings = TwitterConfig.get_analysis_settings()
+        self.path = None if table is not None else (path or settings['keywords_path'])
+        self.reload_interval = settings['keyword_reload_interval'] if reload_interval is None else reload_interval
+        self._lock = threading.Lock()
+        self._last_check = time.monotonic()
+        self._mtime = None
+        if table is None:
+            self._mtime = os.stat(self.path).st_mtime_ns
+            table = KeywordTable.load(self.path)
+            logger.info(f"🔑 Loaded {table.keyword_count()} threat keywords in {len(table.categories)} categories")
+        self._table = table
+
+    @property
+    def table(self) -> KeywordTable:
+        """Current keyword table, reloading it first if the file changed"""
+        if self.path and time.monotonic() - self._last_check >= self.reload_interval:
+            self.reload()
+        return self._table
+
+    def reload(self, force: bool = False) -> bool:
+        """Reload the keyword file if it changed; returns True when a new table was loaded"""
+        if not self.path:
+            return False
+        with self._lock:
+            self._last_check = time.monotonic()
+            try:
+                mtime = os.stat(self.path).st_mtime_ns
+            except OSError as e:
+                logger.warning(f"⚠️ Keyword file unavailable, keeping current table: {e}")
+                return False
+            if mtime == self._mtime and not force:
+                return False
+            try:
+                table = KeywordTable.load(self.path)
+            except (OSError, ValueError, re.error) as e:
+                logger.error(f"❌ Invalid keyword file {self.path}, keeping current table: {e}")
+                self._mtime = mtime
+                return False
+            self._table, self._mtime = table, mtime
+        logger.info(f"🔄 Reloaded threat keywords: {table.keyword_count()} terms in {len(table.categories)} categories")
+        return True
+
+    def score_texts(self, texts: Sequence[Optional[str]]) -> ThreatScores:
+        """Score a batch of texts"""
+        table = self.table
+        counts = np.zeros((len(texts), len(table.categories)), dtype=np.int32)
+
+        if len(texts) and table.pattern is not None:
+            joined = _SEPARATOR.join((text or '').replace(_SEPARATOR, ' ') for text in texts).lower()
+            # Separators are matched too, so a running count of them gives each hit's text index
+            term_codes = table.term_codes
+            codes = np.fromiter(
+                (term_codes[token] if token in term_codes else table.code_for(token)
+                 for token in table.pattern.findall(joined)),
+                dtype=np.int64
+            )
+            is_separator = codes == table.SEPARATOR_CODE
+            rows = np.cumsum(is_separator)
+            hits = ~is_separator
+            np.add.at(counts, rows[hits], table.membership[codes[hits]])
+
+        category_scores = (counts > 0) * table.weights
+        threat_score = 1.0 - np.prod(1.0 - category_scores, axis=1)
+        return ThreatScores(table.names, counts, category_scores, threat_score)
+
+    def score_records(self, records: Sequence[TweetRecord]) -> ThreatScores:
+        return self.score_texts([record.text for record in records])
@@ -3,9 +3,6 @@ Twitter Scraper Module - Version 1.0
 Simplified HTML retrieval scraper with session persistence and cookie support
 
 TODO for next developer:
-- Implement database functionality (SQLite) for task queue management
-- Add structured data extraction using BeautifulSoup
-- Implement task status tracking and error handling
 - Add data processing pipeline for extracted tweets
 - Consider adding async task processing for better performance
 """
@@ -14,14 +11,26 @@ import asyncio
 import random
 import time
 import os
-import json
 import logging
-from typing import Optional, Dict, Any, List, Union
-from datetime import datetime, timedelta
+from typing import Optional, Dict, Any, List, Union, Callable, Tuple
+from datetime import datetime
 from dataclasses import dataclass
-from playwright.async_api import async_playwright, Browser, Page
+from playwright.async_api import Browser, Page
 from dotenv import load_dotenv
 
+from .config import TwitterConfig
+from .database import TwitterDatabase, ScrapingTask
+from .archive import HtmlArchive
+from .extractor import TweetRecord
+from .timeline_json import TimelineCollector, dump_capture
+from .routing import RequestBlocker, ResourcePolicy
+from .readiness import PageReadiness, observer_script, wait_for_home
+from .browser_pool import BrowserPool, PooledBrowser
+from .session_cache import SessionValidityCache, inspect_storage_state
+from .session_store import SessionStore
+from .rate_control import RateController, RATE_LIMITED, SUCCESS, classify_status
+from .metrics import ScraperMetrics, NullMetrics, metrics_from_settings, timed
+
 # Load environment variables
 load_dotenv()
 
@@ -61,8 +70,43 @@ class TwitterScraper:
         "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
     ]
     
-    def __init__(self, headless: Optional[bool] = None):
+    STEALTH_SCRIPT = """
+        Object.defineProperty(navigator, 'webdriver', {
+            get: () => undefined,
+        });
+        window.chrome = {
+            runtime: {},
+        };
+    """
+    
+    # Returns tweets not yet captured and marks them; placeholders without a status link are retried later
+    COLLECT_NEW_TWEETS_SCRIPT = """
+        (selector) => {
+            const fresh = [];
+            for (const node of document.querySelectorAll(selector)) {
+                if (node.dataset.captured) continue;
+                const timeLink = node.querySelector('time') && node.querySelector('time').closest('a');
+                const link = timeLink || node.querySelector('a[href*="/status/"]');
+                const match = link && (link.getAttribute('href') || '').match(/\\/status\\/(\\d+)/);
+                if (!match) continue;
+                node.dataset.captured = '1';
+                fresh.push({id: match[1], html: node.outerHTML});
+            }
+            return fresh;
+        }
+    """
+    
+    def __init__(self, headless: Optional[bool] = None, capture_mode: Optional[str] = None,
+                 pool: Optional[BrowserPool] = None, rate: Optional[RateController] = None,
+                 metrics: Optional[Union[ScraperMetrics, NullMetrics]] = None):
         self.headless = headless if headless is not None else os.getenv('HEADLESS_MODE', 'false').lower() == 'true'
+        
+        # Warm browsers shared across sessions; without one, a private single-browser pool is used
+        self.pool = pool
+        self._owns_pool = False
+        self._pooled: Optional[PooledBrowser] = None
+        self.jobs_run = 0
+        
         self.browser: Optional[Browser] = None
         self.page: Optional[Page] = None
         self.context = None
@@ -70,9 +114,30 @@ class TwitterScraper:
         self.delay_max = float(os.getenv('DELAY_MAX', '5'))
         self.max_retries = int(os.getenv('MAX_RETRIES', '3'))
         
+        # Paces searches across all pages; pass one in to keep its state across sessions
+        self.rate = rate or RateController()
+        
+        # Per-stage timing histograms (METRICS_EXPORT); a no-op unless enabled
+        self.metrics = metrics or metrics_from_settings()
+        settings = TwitterConfig.get_scraper_settings()
+        self.capture_mode = capture_mode or settings['capture_mode']
+        self.base_url = settings['base_url']
+        
         # Session persistence
-        self.session_file = os.path.join('data', 'twitter_session.json')
+        self.session_store = SessionStore()
+        self.session_file = self.session_store.path
         self.session_valid = False
+        self.session_cache = SessionValidityCache()
+        
+        # Persistent task queue and capture archive (opened on first use)
+        self.db: Optional[TwitterDatabase] = None
+        self.archive: Optional[HtmlArchive] = None
+        
+        # Aborts images, media, fonts and trackers per RESOURCE_PROFILE
+        self.request_blocker: Optional[RequestBlocker] = None
+        
+        # Receives (records, query, captured_at) for tweets captured in network mode
+        self.record_sink: Optional[Callable[[List[TweetRecord], str, str], Any]] = None
         
     async def __aenter__(self):
         await self.setup_browser()
@@ -81,28 +146,21 @@ class TwitterScraper:
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         await self.close()
     
+    @timed('setup_browser')
     async def setup_browser(self) -> None:
         """Setup browser with session persistence"""
         try:
-            playwright = await async_playwright().start()
+            if self.pool is None:
+                self.pool = BrowserPool(headless=self.headless, size=1)
+                self._owns_pool = True
             user_agent = random.choice(self.USER_AGENTS)
             
-            # Launch browser with stealth args
-            self.browser = await playwright.chromium.launch(
-                headless=self.headless,
-                args=[
-                    '--no-first-run',
-                    '--no-default-browser-check',
-                    '--disable-blink-features=AutomationControlled',
-                    '--disable-features=VizDisplayCompositor',
-                    '--disable-web-security',
-                    '--no-sandbox',
-                    '--disable-dev-shm-usage'
-                ]
-            )
+            # Lease a warm browser (launched with stealth args); this session gets its own context
+            self._pooled = await self.pool.acquire()
+            self.browser = self._pooled.browser
             
             # Try to load saved session
-            saved_session = self._load_session()
+            saved_session = await self._load_session()
             
             # Create context with session if available
             if saved_session:
@@ -123,26 +181,25 @@ class TwitterScraper:
                     timezone_id='America/New_York'
                 )
             
+            # Add stealth script to the context so every page opened on it is covered
+            await self.context.add_init_script(self.STEALTH_SCRIPT)
+            await self.context.add_init_script(observer_script(self.SELECTORS['tweet_selector']))
+            
+            # Route before the first page opens so every navigation is covered
+            self.request_blocker = RequestBlocker(ResourcePolicy.from_profile())
+            await self.request_blocker.attach(self.context)
+            
             self.page = await self.context.new_page()
             
-            # Add stealth script
-            await self.page.add_init_script("""
-                Object.defineProperty(navigator, 'webdriver', {
-                    get: () => undefined,
-                });
-                window.chrome = {
-                    runtime: {},
-                };
-            """)
-            
-            # Check if session is still valid
+            # Check if session is still valid (cheap checks and recent verifications first)
             if saved_session:
-                self.session_valid = await self._check_login_status()
+                self.session_valid = await self._verify_session(saved_session)
             
             logger.info(f"Browser setup complete with User-Agent: {user_agent[:50]}...")
             
         except Exception as e:
             logger.error(f"Browser setup failed: {str(e)}")
+            await self.close()
             raise
     
     async def random_delay(self, min_seconds: Optional[float] = None, max_seconds: Optional[float] = None) -> None:
@@ -166,46 +223,59 @@ class TwitterScraper:
         
         return TwitterCredentials(email=email, password=password, username=username)
     
-    def _load_session(self) -> Optional[Dict]:
+    async def _load_session(self) -> Optional[Dict]:
         """Load saved session state"""
         try:
-            if os.path.exists(self.session_file):
-                with open(self.session_file, 'r') as f:
-                    session_data = json.load(f)
-                    
-                # Check if session is not too old (30 days)
-                saved_time = datetime.fromisoformat(session_data.get('saved_at', ''))
-                if datetime.now() - saved_time < timedelta(days=30):
-                    logger.info("✅ Found valid saved session")
-                    return session_data['storage_state']
-                else:
-                    logger.info("🕐 Saved session expired, will login fresh")
-                    os.remove(self.session_file)
+            return await self.session_store.load_async()
         except Exception as e:
             logger.warning(f"Failed to load session: {e}")
         return None
     
-    def _save_session(self, storage_state: Dict):
+    async def _save_session(self, storage_state: Dict) -> None:
         """Save session state to disk"""
         try:
-            os.makedirs(os.path.dirname(self.session_file), exist_ok=True)
-            session_data = {
-                'storage_state': storage_state,
-                'saved_at': datetime.now().isoformat()
-            }
-            with open(self.session_file, 'w') as f:
-                json.dump(session_data, f, indent=2)
-            logger.info(f"✅ Session saved to {self.session_file}")
+            await self.session_store.save_async(storage_state)
         except Exception as e:
             logger.error(f"Failed to save session: {e}")
     
+    async def _verify_session(self, storage_state: Dict) -> bool:
+        """Decide whether a storage state is logged in, navigating to /home only when needed
+        
+        Missing or expired auth cookies fail without loading a page. A login
+        verified within SESSION_VERIFY_TTL seconds (by any process sharing the
+        session file) is trusted without another check.
+        """
+        problem = inspect_storage_state(storage_state)
+        if problem:
+            logger.info(f"❌ Saved session unusable ({problem}), need to login")
+            return False
+        
+        age = self.session_cache.verified_age(storage_state)
+        if age is not None and 0 <= age < self.session_cache.ttl:
+            logger.info(f"✅ Session verified {age:.0f}s ago, skipping login check")
+            return True
+        
+        valid = await self._check_login_status()
+        if valid:
+            self.session_cache.mark_verified(storage_state)
+        else:
+            self.session_cache.invalidate(storage_state)
+        return valid
+    
+    def _redirected_to_login(self, page: Page) -> bool:
+        """True when X sent the page to the login flow, i.e. the session stopped working"""
+        url = page.url
+        return '/i/flow/login' in url or url.rstrip('/').endswith('/login')
+    
+    @timed('check_login')
     async def _check_login_status(self) -> bool:
         """Check if we're already logged in"""
         try:
-            await self.page.goto("https://x.com/home", wait_until='networkidle', timeout=15000)
+            await self.page.goto(f"{self.base_url}/home", wait_until='domcontentloaded', timeout=15000)
+            await wait_for_home(self.page)
             current_url = self.page.url
             
-            if "home" in current_url or current_url == "https://x.com/":
+            if "home" in current_url or current_url == f"{self.base_url}/":
                 logger.info("✅ Already logged in via saved session!")
                 return True
             else:
@@ -215,6 +285,7 @@ class TwitterScraper:
             logger.warning(f"Login status check failed: {e}")
             return False
     
+    @timed('login')
     async def login(self, credentials: Optional[TwitterCredentials] = None, cookies_file: Optional[str] = None) -> bool:
         """Login to Twitter with session persistence or cookies"""
         try:
@@ -239,7 +310,7 @@ class TwitterScraper:
                 return True
             
             logger.info("🔐 Session invalid or not found, performing fresh login...")
-            await self.page.goto("https://x.com/i/flow/login", wait_until='networkidle')
+            await self.page.goto(f"{self.base_url}/i/flow/login", wait_until='networkidle')
             await self.random_delay(2, 4)
             
             # Enter email
@@ -433,13 +504,14 @@ class TwitterScraper:
             
             # Check if login was successful
             current_url = self.page.url
-            if "home" in current_url or current_url == "https://x.com/":
+            if "home" in current_url or current_url == f"{self.base_url}/":
                 logger.info("✅ Login successful!")
                 
                 # Save session for future use
                 try:
                     storage_state = await self.context.storage_state()
-                    self._save_session(storage_state)
+                    await self._save_session(storage_state)
+                    self.session_cache.mark_verified(storage_state)
                     self.session_valid = True
                     logger.info("💾 Session saved for future use")
                 except Exception as e:
@@ -454,91 +526,282 @@ class TwitterScraper:
             logger.error(f"Login failed with error: {str(e)}")
             return False
     
-    async def search_and_scrape(self, query: str) -> Optional[str]:
+    @timed('search')
+    async def search_and_scrape(self, query: str, task_id: Optional[int] = None,
+                                page: Optional[Page] = None) -> Optional[str]:
         """Search Twitter and scrape HTML content - simplified version"""
         try:
-            if not self.page:
+            page = page or self.page
+            if not page:
                 logger.error("Browser not initialized")
                 return None
             
-            logger.info(f"Searching for: {query}")
+            task_label = f" (task {task_id})" if task_id is not None else ""
+            logger.info(f"Searching for: {query}{task_label}")
             
             # Navigate to search URL with retry logic
-            search_url = f"https://x.com/search?q={query.replace(' ', '%20')}&src=typed_query&f=live"
+            search_url = f"{self.base_url}/search?q={query.replace(' ', '%20')}&src=typed_query&f=live"
             
-            # Try navigation with retries
-            max_retries = 3
-            for attempt in range(max_retries):
-                try:
-                    await self.page.goto(search_url, wait_until='networkidle', timeout=30000)
-                    break
-                except Exception as e:
-                    logger.warning(f"Navigation attempt {attempt + 1} failed: {e}")
-                    if attempt == max_retries - 1:
-                        raise
-                    await self.random_delay(2, 4)
-            
-            await self.random_delay(3, 5)
-            
-            # Wait for page to load initially
-            await self.random_delay(2, 3)
+            readiness = PageReadiness(page, self.SELECTORS['tweet_selector'])
             
-            # Simple scrolling to load more tweets - using Page Down key for visibility
-            scroll_count = int(os.getenv('SCROLL_COUNT', '3'))
-            logger.info(f"🔄 Starting to scroll {scroll_count} times (you should see this in browser)...")
+            # In network mode timeline responses are collected from the first request on
+            collector = None
+            if self.capture_mode == 'network':
+                collector = TimelineCollector(TwitterConfig.get_scraper_settings()['timeline_url_pattern'],
+                                              on_records=self._record_forwarder(query))
+                page.on('response', collector.on_response)
             
-            for i in range(scroll_count):
+            try:
+                # Wait for the adaptive rate, then navigate with jittered exponential backoff between retries
+                waited = await self.rate.acquire()
+                if waited >= 1:
+                    logger.info(f"⏳ Paced {waited:.1f}s ({self.rate.describe()})")
+                started = time.perf_counter()
+                attempts = 0
+                
+                async def navigate():
+                    nonlocal started, attempts
+                    attempts += 1
+                    started = time.perf_counter()
+                    return await page.goto(search_url, wait_until='domcontentloaded', timeout=30000)
+                
                 try:
-                    # Use Page Down key - this should be visible in the browser
-                    await self.page.keyboard.press('PageDown')
-                    logger.info(f"📄 Pressed Page Down {i+1}/{scroll_count}")
-                    await self.random_delay(2, 3)
-                except Exception as e:
-                    logger.warning(f"Page Down failed for scroll {i+1}: {e}")
-                    # Fallback to JavaScript scroll
-                    try:
-                        await self.page.evaluate("window.scrollBy(0, 1000)")
-                        logger.info(f"🔽 JavaScript scroll {i+1}/{scroll_count}")
-                        await self.random_delay(2, 3)
-                    except Exception as e2:
-                        logger.error(f"Both scroll methods failed: {e2}")
-            
-            logger.info("✅ Scrolling completed")
-            
-            # Get HTML content immediately
-            logger.info("Getting HTML content...")
-            html_content = await self.page.content()
+                    with self.metrics.timer('navigation'):
+                        response = await self.rate.retry(navigate, max(1, self.max_retries), label='Navigation')
+                finally:
+                    self.metrics.count_retries('navigation', attempts - 1)
+                status = classify_status(response.status if response else None)
+                if status != SUCCESS:
+                    logger.warning(f"⚠️ Search page returned HTTP {response.status}")
+                    self.rate.record_failure(status)
+                
+                # Continue as soon as the first tweets render; DELAY_MIN..DELAY_MAX is only a floor
+                timing = await readiness.wait_for_tweets('initial', floor=(self.delay_min, self.delay_max), started=started)
+                self.metrics.observe_seconds('initial_render', timing.waited)
+                
+                if not timing.ready and self._redirected_to_login(page):
+                    logger.warning("🔒 Redirected to login, saved session is no longer valid")
+                    self.session_valid = False
+                    self.session_cache.invalidate()
+                    return None
+                
+                if collector is not None:
+                    result = await self._capture_network(page, query, collector, readiness)
+                    if collector.rate_limited:
+                        self.rate.record_failure(RATE_LIMITED)
+                    elif result and status == SUCCESS:
+                        self.rate.record_success()
+                    return result
+            finally:
+                if collector is not None:
+                    page.remove_listener('response', collector.on_response)
+                    logger.info(f"⏱️ Readiness for '{query}': {readiness.summary()}")
             
-            if len(html_content) < 5000:  # Basic check for empty page
-                logger.warning(f"HTML content seems small ({len(html_content)} chars) - might be an error page")
+            if self.capture_mode == 'incremental':
+                html_content = await self._capture_incremental(page, query, readiness)
             else:
-                logger.info(f"✅ Got HTML content: {len(html_content):,} characters")
+                # Simple scrolling to load more tweets - using Page Down key for visibility
+                scroll_count = int(os.getenv('SCROLL_COUNT', '3'))
+                logger.info(f"🔄 Starting to scroll {scroll_count} times (you should see this in browser)...")
+                
+                for i in range(scroll_count):
+                    await self._scroll_step(page, i, scroll_count, readiness)
+                
+                logger.info("✅ Scrolling completed")
+                
+                # Get HTML content immediately
+                logger.info("Getting HTML content...")
+                with self.metrics.timer('page_content'):
+                    html_content = await page.content()
+                
+                if len(html_content) < 5000:  # Basic check for empty page
+                    logger.warning(f"HTML content seems small ({len(html_content)} chars) - might be an error page")
+                else:
+                    logger.info(f"✅ Got HTML content: {len(html_content):,} characters")
             
-            # Save HTML to file
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            safe_query = "".join(c for c in query if c.isalnum() or c in (' ', '-', '_')).replace(' ', '_')
-            filename = f"twitter_search_{safe_query}_{timestamp}.html"
+            logger.info(f"⏱️ Readiness for '{query}': {readiness.summary()}")
             
-            await self.save_html(html_content, filename)
+            # Save HTML to file
+            filename, _ = self._capture_filename(query, '.html')
+            await self.save_html(html_content, filename, query=query)
             
             logger.info(f"✅ Successfully scraped: {query}")
+            if status == SUCCESS:
+                self.rate.record_success()
             return filename
             
         except Exception as e:
             logger.error(f"Search failed for '{query}': {str(e)}")
             return None
     
-    async def save_html(self, html_content: str, filename: str) -> None:
-        """Save HTML content to file in twitter subdirectory"""
+    @staticmethod
+    def _capture_filename(query: str, suffix: str) -> Tuple[str, str]:
+        """Capture file name and its ISO capture time"""
+        now = datetime.now()
+        safe_query = "".join(c for c in query if c.isalnum() or c in (' ', '-', '_')).replace(' ', '_')
+        return f"twitter_search_{safe_query}_{now.strftime('%Y%m%d_%H%M%S')}{suffix}", now.isoformat(timespec='seconds')
+    
+    async def _capture_network(self, page: Page, query: str, collector: TimelineCollector,
+                               readiness: PageReadiness) -> Optional[str]:
+        """Scroll while collecting SearchTimeline API responses instead of rendered HTML
+        
+        Each scroll makes the page request the next batch of results; the JSON
+        bodies are parsed and handed to record_sink as they arrive, and saved
+        as a JSON Lines capture at the end. Without any timeline response the
+        rendered page is saved instead when NETWORK_HTML_FALLBACK is enabled.
+        """
+        settings = TwitterConfig.get_scraper_settings()
+        max_scrolls = settings['incremental_max_scrolls']
+        idle_limit = max(1, settings['idle_scroll_limit'])
+        
+        await collector.drain()
+        logger.info(f"🛰️ Initial timeline response: {len(collector.records)} tweets")
+        
+        idle_steps = 0
+        for i in range(max_scrolls):
+            before = len(collector.records)
+            await self._scroll_step(page, i, max_scrolls, readiness)
+            await collector.drain()
+            added = len(collector.records) - before
+            logger.info(f"🛰️ Scroll {i+1}: +{added} tweets ({len(collector.records)} total)")
+            
+            if added:
+                idle_steps = 0
+                continue
+            idle_steps += 1
+            if idle_steps >= idle_limit:
+                logger.info(f"⏹️ No new tweets after {idle_steps} scrolls, stopping early")
+                break
+        
+        if not collector.payloads:
+            if not settings['network_html_fallback']:
+                logger.error(f"❌ No timeline responses captured for '{query}'")
+                return None
+            logger.warning(f"⚠️ No timeline responses captured for '{query}', saving rendered HTML instead")
+            filename, _ = self._capture_filename(query, '.html')
+            await self.save_html(await page.content(), filename, query=query)
+            return filename
+        
+        filename, _ = self._capture_filename(query, '.jsonl')
+        await self.save_html(dump_capture(collector.payloads), filename, query=query)
+        logger.info(f"✅ Captured {len(collector.records)} tweets from {len(collector.payloads)} timeline responses "
+                    f"({collector.bytes:,} bytes)")
+        return filename
+    
+    def _record_forwarder(self, query: str) -> Optional[Callable[[List[TweetRecord]], Any]]:
+        """Callback handing one timeline response's records to record_sink, stamped with the time they arrived"""
+        if self.record_sink is None:
+            return None
+        sink = self.record_sink
+        
+        def forward(records: List[TweetRecord]) -> Any:
+            return sink(records, query, datetime.now().isoformat(timespec='seconds'))
+        return forward
+    
+    @timed('scroll_step')
+    async def _scroll_step(self, page: Page, index: int, total: int,
+                           readiness: Optional[PageReadiness] = None) -> None:
+        """Scroll one viewport down and wait for new content to render
+        
+        With a readiness tracker the step ends as soon as more tweets render
+        (or SCROLL_READY_TIMEOUT passes), padded to SCROLL_DELAY_MIN..MAX.
+        """
+        previous = await readiness.tweet_count() if readiness else 0
+        started = time.perf_counter()
+        try:
+            # Use Page Down key - this should be visible in the browser
+            await page.keyboard.press('PageDown')
+            logger.info(f"📄 Pressed Page Down {index+1}/{total}")
+        except Exception as e:
+            logger.warning(f"Page Down failed for scroll {index+1}: {e}")
+            # Fallback to JavaScript scroll
+            try:
+                await page.evaluate("window.scrollBy(0, 1000)")
+                logger.info(f"🔽 JavaScript scroll {index+1}/{total}")
+            except Exception as e2:
+                logger.error(f"Both scroll methods failed: {e2}")
+                return
+        
+        if readiness is None:
+            await self.random_delay(2, 3)
+            return
+        settings = TwitterConfig.get_scraper_settings()
+        await readiness.wait_for_growth(previous, f"scroll {index+1}",
+                                        floor=(settings['scroll_delay_min'], settings['scroll_delay_max']),
+                                        started=started)
+    
+    async def _collect_new_tweets(self, page: Page, seen_ids: set, parts: List[str]) -> int:
+        """Append tweet nodes rendered since the last call; returns how many were new"""
+        fresh = await page.evaluate(self.COLLECT_NEW_TWEETS_SCRIPT, self.SELECTORS['tweet_selector'])
+        added = 0
+        for tweet in fresh:
+            if tweet['id'] in seen_ids:
+                continue
+            seen_ids.add(tweet['id'])
+            parts.append(tweet['html'])
+            added += 1
+        return added
+    
+    async def _capture_incremental(self, page: Page, query: str, readiness: Optional[PageReadiness] = None) -> str:
+        """Capture tweets step by step while scrolling instead of serializing the whole page
+        
+        After each scroll only newly rendered tweet nodes are pulled from the
+        page, so tweets the virtualized timeline unloads later are kept. The
+        capture stops early after IDLE_SCROLL_LIMIT steps that add nothing.
+        """
+        settings = TwitterConfig.get_scraper_settings()
+        max_scrolls = settings['incremental_max_scrolls']
+        idle_limit = max(1, settings['idle_scroll_limit'])
+        seen_ids: set = set()
+        parts: List[str] = []
+        
+        added = await self._collect_new_tweets(page, seen_ids, parts)
+        logger.info(f"🐦 Initial capture: {added} tweets")
+        
+        idle_steps = 0
+        for i in range(max_scrolls):
+            await self._scroll_step(page, i, max_scrolls, readiness)
+            added = await self._collect_new_tweets(page, seen_ids, parts)
+            logger.info(f"🐦 Scroll {i+1}: +{added} tweets ({len(seen_ids)} total)")
+            
+            if added:
+                idle_steps = 0
+                continue
+            idle_steps += 1
+            if idle_steps >= idle_limit:
+                logger.info(f"⏹️ No new tweets after {idle_steps} scrolls, stopping early")
+                break
+        
+        safe_title = query.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
+        html_content = (
+            '<!DOCTYPE html><html><head><meta charset="utf-8">'
+            f'<title>{safe_title}</title></head><body data-capture="incremental">\n'
+            + '\n'.join(parts)
+            + '\n</body></html>'
+        )
+        logger.info(f"✅ Captured {len(parts)} tweets incrementally ({len(html_content):,} characters)")
+        return html_content
+    
+    @timed('save_html')
+    async def save_html(self, html_content: str, filename: str, query: Optional[str] = None) -> None:
+        """Save a capture (HTML or timeline JSON Lines) to the archive, or to a file in the twitter subdirectory"""
+        if self.metrics.enabled:
+            kind = 'jsonl' if filename.endswith('.jsonl') else 'html'
+            self.metrics.observe_bytes(len(html_content.encode('utf-8')), kind)
         try:
+            if TwitterConfig.get_archive_settings()['html_storage'] == 'archive':
+                if self.archive is None:
+                    self.archive = HtmlArchive()
+                entry = await self.archive.put_async(html_content, query or filename, filename=filename)
+                logger.info(f"✅ HTML archived: {entry.label} → {os.path.basename(entry.pack)}@{entry.offset} ({entry.size:,} bytes)")
+                return
+            
             # Use twitter-specific data directory
             data_dir = os.path.join('data', 'twitter')
             os.makedirs(data_dir, exist_ok=True)
             
             filepath = os.path.join(data_dir, filename)
-            
-            with open(filepath, 'w', encoding='utf-8') as f:
-                f.write(html_content)
+            await asyncio.to_thread(self._write_file, filepath, html_content)
             
             logger.info(f"✅ HTML saved: {filepath} ({len(html_content):,} chars)")
             
@@ -546,38 +809,183 @@ class TwitterScraper:
             logger.error(f"❌ Failed to save HTML: {str(e)}")
             raise
     
+    @staticmethod
+    def _write_file(filepath: str, content: str) -> None:
+        with open(filepath, 'w', encoding='utf-8') as f:
+            f.write(content)
+    
     async def close(self) -> None:
-        """Close browser"""
-        if self.browser:
-            await self.browser.close()
+        """Close this session's context and hand the browser back to the pool"""
+        if self.request_blocker:
+            self.request_blocker.log_summary()
+        if self.metrics.enabled:
+            logger.info(f"⏱️ Stage timings: {self.metrics.summary()}")
+            self.metrics.flush()
+        if self.context:
+            try:
+                await self.context.close()
+            except Exception as e:
+                logger.debug(f"Failed to close context: {e}")
+            self.context = None
+            self.page = None
+        if self._pooled:
+            await self.pool.release(self._pooled, jobs=self.jobs_run)
+            self._pooled = None
+            self.browser = None
+        if self._owns_pool:
+            # Also stops the Playwright driver started for this session
+            await self.pool.close()
+            self.pool = None
+            self._owns_pool = False
             logger.info("Browser closed")
     
     def clear_session(self):
         """Clear saved session (force fresh login next time)"""
         try:
-            if os.path.exists(self.session_file):
-                os.remove(self.session_file)
+            if self.session_store.clear():
                 logger.info("🗑️ Saved session cleared")
+            self.session_cache.invalidate()
             self.session_valid = False
         except Exception as e:
             logger.error(f"Failed to clear session: {e}")
     
-    # TODO for next developer: Implement these database and processing methods
-    # def process_queue(self) -> int:
-    #     """TODO: Process all pending tasks in the queue using database"""
-    #     pass
-    # 
-    # def add_search_queries(self, queries: List[str]) -> List[int]:
-    #     """TODO: Add multiple search queries to the database queue"""
-    #     pass
-    # 
-    # def process_html_data(self) -> int:
-    #     """TODO: Process all unprocessed HTML files and extract structured data"""
-    #     pass
-    # 
-    # def scrape_and_process_all(self, queries: List[str]) -> Dict[str, int]:
-    #     """TODO: Complete workflow: add queries, scrape HTML, and process data"""
-    #     pass
+    def get_database(self) -> TwitterDatabase:
+        """Return the task queue, opening it on first use"""
+        if self.db is None:
+            self.db = TwitterDatabase()
+        return self.db
+    
+    async def add_search_queries(self, queries: List[str], priority: int = 0) -> List[int]:
+        """Add multiple search queries to the database queue"""
+        db = self.get_database()
+        task_ids = await asyncio.to_thread(db.add_tasks, queries, priority)
+        logger.info(f"📝 Queued {len(task_ids)} of {len(queries)} queries")
+        return task_ids
+    
+    async def run_task(self, task: ScrapingTask, page: Optional[Page] = None) -> bool:
+        """Scrape one claimed task and record the outcome in the queue"""
+        db = self.get_database()
+        self.jobs_run += 1
+        try:
+            result_file = await self.search_and_scrape(task.query, task.id, page=page)
+        except Exception as e:
+            await asyncio.to_thread(db.update_task_status, task.id, 'failed', None, str(e),
+                                    worker_id=task.worker_id)
+            logger.error(f"❌ Task {task.id} failed: {e}")
+            return False
+        
+        finally:
+            if self.metrics.enabled:
+                # Render on the loop, where other pages keep recording; only the file write leaves it
+                await asyncio.to_thread(self.metrics.write, self.metrics.render())
+        
+        if result_file:
+            await asyncio.to_thread(db.update_task_status, task.id, 'completed', result_file,
+                                    worker_id=task.worker_id)
+            return True
+        
+        if not self.session_valid:
+            # Redirected to login: the query is fine, the session is not; retry it after a new login
+            await asyncio.to_thread(db.update_task_status, task.id, 'pending', worker_id=task.worker_id)
+            logger.warning(f"🔒 Task {task.id} returned to the queue: session expired")
+            return False
+        
+        await asyncio.to_thread(db.update_task_status, task.id, 'failed', None, "Search failed",
+                                worker_id=task.worker_id)
+        return False
+    
+    async def open_pages(self, count: int) -> List[Page]:
+        """Return `count` pages on the shared context, reusing the main page first"""
+        if not self.context:
+            raise RuntimeError("Browser not initialized")
+        pages = [self.page] if self.page else []
+        while len(pages) < count:
+            pages.append(await self.context.new_page())
+        return pages[:count]
+    
+    async def close_pages(self, pages: List[Page]) -> None:
+        """Close extra pages opened by open_pages, keeping the main page"""
+        for page in pages:
+            if page is not self.page:
+                try:
+                    await page.close()
+                except Exception as e:
+                    logger.debug(f"Failed to close page: {e}")
+    
+    async def search_concurrent(self, queries: List[str], max_pages: Optional[int] = None) -> Dict[str, Optional[str]]:
+        """Run several searches at once over pages sharing this context's session
+        
+        At most `max_pages` searches are in flight (CONCURRENT_PAGES by default).
+        Pacing comes from the shared rate controller, so adding pages raises
+        concurrency but not the search rate.
+        """
+        settings = TwitterConfig.get_scraper_settings()
+        page_count = max(1, min(max_pages or settings['concurrent_pages'], len(queries)))
+        pages = await self.open_pages(page_count)
+        
+        idle_pages: asyncio.Queue = asyncio.Queue()
+        for page in pages:
+            idle_pages.put_nowait(page)
+        semaphore = asyncio.Semaphore(page_count)
+        results: Dict[str, Optional[str]] = {}
+        
+        async def run(query: str) -> None:
+            async with semaphore:
+                page = await idle_pages.get()
+                try:
+                    results[query] = await self.search_and_scrape(query, page=page)
+                finally:
+                    idle_pages.put_nowait(page)
+        
+        logger.info(f"🚀 Running {len(queries)} searches over {page_count} pages")
+        try:
+            await asyncio.gather(*(run(query) for query in queries))
+        finally:
+            await self.close_pages(pages)
+        return results
+    
+    async def process_queue(self, worker_id: Optional[str] = None, max_tasks: Optional[int] = None,
+                            concurrent_pages: Optional[int] = None) -> int:
+        """Claim and process pending tasks until the queue is empty
+        
+        With more than one concurrent page, each page runs its own claim loop
+        against the shared queue.
+        """
+        db = self.get_database()
+        settings = TwitterConfig.get_scraper_settings()
+        page_count = max(1, concurrent_pages or settings['concurrent_pages'])
+        counters = {'claimed': 0, 'completed': 0}
+        
+        async def page_worker(page: Page) -> None:
+            while True:
+                # Reserve a slot before awaiting the claim so pages never exceed max_tasks
+                if max_tasks is not None and counters['claimed'] >= max_tasks:
+                    break
+                counters['claimed'] += 1
+                task = await asyncio.to_thread(db.claim_next_task, worker_id)
+                if task is None:
+                    counters['claimed'] -= 1
+                    break
+                
+                logger.info(f"📋 Processing task {task.id}: {task.query}")
+                if await self.run_task(task, page=page):
+                    counters['completed'] += 1
+                elif not self.session_valid:
+                    # The task went back to the queue; claiming more would only bounce them too
+                    break
+        
+        if page_count == 1:
+            await page_worker(self.page)
+        else:
+            pages = await self.open_pages(page_count)
+            try:
+                await asyncio.gather(*(page_worker(page) for page in pages))
+            finally:
+                await self.close_pages(pages)
+        
+        logger.info(f"📊 Queue processed: {counters['completed']}/{counters['claimed']} tasks completed "
+                    f"({self.rate.describe()})")
+        return counters['completed']
     
     def load_cookies_from_file(self, cookies_file: str) -> bool:
         """Load cookies from a JSON file and apply them to the session"""
@@ -586,53 +994,8 @@ class TwitterScraper:
                 logger.error(f"Cookies file not found: {cookies_file}")
                 return False
             
-            with open(cookies_file, 'r', encoding='utf-8') as f:
-                cookies_data = json.load(f)
-            
-            # Convert cookies to Playwright storage state format
-            storage_state = {
-                'cookies': [],
-                'origins': []
-            }
-            
-            # Handle different cookie formats
-            if isinstance(cookies_data, list):
-                # Format: [{name, value, domain, path, ...}, ...]
-                for cookie in cookies_data:
-                    playwright_cookie = {
-                        'name': cookie.get('name', ''),
-                        'value': cookie.get('value', ''),
-                        'domain': cookie.get('domain', '.x.com'),
-                        'path': cookie.get('path', '/'),
-                        'expires': cookie.get('expires', -1),
-                        'httpOnly': cookie.get('httpOnly', False),
-                        'secure': cookie.get('secure', True),
-                        'sameSite': cookie.get('sameSite', 'Lax')
-                    }
-                    storage_state['cookies'].append(playwright_cookie)
-                    
-            elif isinstance(cookies_data, dict):
-                # Handle different dictionary formats
-                if 'cookies' in cookies_data:
-                    # Already in storage state format
-                    storage_state = cookies_data
-                else:
-                    # Simple name-value pairs: {name: value, ...}
-                    for name, value in cookies_data.items():
-                        playwright_cookie = {
-                            'name': name,
-                            'value': str(value),
-                            'domain': '.x.com',
-                            'path': '/',
-                            'expires': -1,
-                            'httpOnly': False,
-                            'secure': True,
-                            'sameSite': 'Lax'
-                        }
-                        storage_state['cookies'].append(playwright_cookie)
-            
-            # Save the cookies as a session file
-            self._save_session(storage_state)
+            # Normalize and save the cookies as the session file
+            storage_state = self.session_store.import_cookies(cookies_file)
             logger.info(f"✅ Loaded {len(storage_state['cookies'])} cookies from {cookies_file}")
             return True
             
@@ -651,53 +1014,18 @@ class TwitterScraper:
                 logger.error(f"Cookies file not found: {cookies_file}")
                 return False
             
-            with open(cookies_file, 'r', encoding='utf-8') as f:
-                cookies_data = json.load(f)
-            
-            cookies_to_add = []
-            
-            # Handle different cookie formats
-            if isinstance(cookies_data, list):
-                for cookie in cookies_data:
-                    playwright_cookie = {
-                        'name': cookie.get('name', ''),
-                        'value': cookie.get('value', ''),
-                        'domain': cookie.get('domain', '.x.com'),
-                        'path': cookie.get('path', '/'),
-                        'expires': cookie.get('expires', -1),
-                        'httpOnly': cookie.get('httpOnly', False),
-                        'secure': cookie.get('secure', True),
-                        'sameSite': cookie.get('sameSite', 'Lax')
-                    }
-                    cookies_to_add.append(playwright_cookie)
-                    
-            elif isinstance(cookies_data, dict):
-                if 'cookies' in cookies_data:
-                    cookies_to_add = cookies_data['cookies']
-                else:
-                    for name, value in cookies_data.items():
-                        playwright_cookie = {
-                            'name': name,
-                            'value': str(value),
-                            'domain': '.x.com',
-                            'path': '/',
-                            'expires': -1,
-                            'httpOnly': False,
-                            'secure': True,
-                            'sameSite': 'Lax'
-                        }
-                        cookies_to_add.append(playwright_cookie)
+            cookies_to_add = await self.session_store.read_cookies_async(cookies_file)
             
             # Add cookies to the browser context
             await self.context.add_cookies(cookies_to_add)
             
-            # Test if cookies work by checking login status
-            self.session_valid = await self._check_login_status()
+            # Test if cookies work (auth cookies first, then the cached or live login check)
+            storage_state = await self.context.storage_state()
+            self.session_valid = await self._verify_session(storage_state)
             
             if self.session_valid:
                 # Save as session file for future use
-                storage_state = await self.context.storage_state()
-                self._save_session(storage_state)
+                await self._save_session(storage_state)
                 logger.info(f"✅ Successfully applied {len(cookies_to_add)} cookies and verified login!")
                 return True
             else:
@@ -0,0 +1,109 @@
+"""
+Session Validity Cache Module
+Records when a saved session was last verified so startups can skip the /home check
+"""
+
+import json
+import time
+import hashlib
+import logging
+from typing import Optional, Dict, Any
+
+from .config import TwitterConfig
+from .session_store import atomic_write_json, file_lock
+
+logger = logging.getLogger(__name__)
+
+# X only treats a browser as logged in with both of these cookies
+AUTH_COOKIES = ('auth_token', 'ct0')
+
+
+def auth_cookies(storage_state: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """Auth cookies by name from a Playwright storage state"""
+    return {
+        cookie.get('name'): cookie
+        for cookie in storage_state.get('cookies', [])
+        if cookie.get('name') in AUTH_COOKIES
+    }
+
+
+def inspect_storage_state(storage_state: Optional[Dict[str, Any]], now: Optional[float] = None) -> Optional[str]:
+    """Why a storage state cannot be logged in, or None if its auth cookies look usable
+
+    This is the cheap check: it only looks at cookie presence and expiry
+    (-1 or 0 means a session cookie, which does not expire on its own).
+    """
+    if not storage_state:
+        return "no saved session"
+    now = time.time() if now is None else now
+    cookies = auth_cookies(storage_state)
+    for name in AUTH_COOKIES:
+        cookie = cookies.get(name)
+        if cookie is None or not cookie.get('value'):
+            return f"missing {name} cookie"
+        expires = cookie.get('expires', -1) or -1
+        if 0 < expires <= now:
+            return f"{name} cookie expired"
+    return None
+
+
+def session_fingerprint(storage_state: Dict[str, Any]) -> str:
+    """Stable id for a login; changes whenever X issues a new auth_token"""
+    token = auth_cookies(storage_state).get('auth_token', {}).get('value', '')
+    return hashlib.sha256(token.encode('utf-8')).hexdigest()[:16]
+
+
+class SessionValidityCache:
+    """When each saved login was last verified by loading /home
+
+    Entries are keyed by a hash of the auth_token cookie, so a new login is
+    never mistaken for a verified one, and are shared through a small JSON
+    file by every process using the same session file. Within `ttl`
+    seconds of a successful check the navigation is skipped.
+    """
+
+    def __init__(self, path: Optional[str] = None, ttl: Optional[float] = None):
+        settings = TwitterConfig.get_session_settings()
+        self.path = path or settings['verify_cache_path']
+        self.ttl = ttl if ttl is not None else settings['verify_ttl']
+
+    def _read(self) -> Dict[str, float]:
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                entries = json.load(f)
+            return {key: float(value) for key, value in entries.items()}
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError, AttributeError) as e:
+            logger.debug(f"Ignoring unreadable session cache {self.path}: {e}")
+            return {}
+
+    def _write(self, entries: Dict[str, float]) -> None:
+        atomic_write_json(self.path, entries)
+
+    def verified_age(self, storage_state: Dict[str, Any]) -> Optional[float]:
+        """Seconds since this login was last verified, or None if never"""
+        verified_at = self._read().get(session_fingerprint(storage_state))
+        return None if verified_at is None else time.time() - verified_at
+
+    def mark_verified(self, storage_state: Dict[str, Any]) -> None:
+        now = time.time()
+        try:
+            with file_lock(self.path):
+                # Drop entries that can no longer be fresh so the file stays small
+                entries = {key: value for key, value in self._read().items() if now - value < self.ttl}
+                entries[session_fingerprint(storage_state)] = now
+                self._write(entries)
+        except OSError as e:
+            logger.warning(f"Failed to record session verification: {e}")
+
+    def invalidate(self, storage_state: Optional[Dict[str, Any]] = None) -> None:
+        """Forget one login's verification, or all of them"""
+        try:
+            with file_lock(self.path):
+                entries = {} if storage_state is None else self._read()
+                if storage_state is not None:
+                    entries.pop(session_fingerprint(storage_state), None)
+                self._write(entries)
+        except OSError as e:
+            logger.warning(f"Failed to clear session verification: {e}")
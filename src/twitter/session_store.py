@@ -0,0 +1,199 @@
+"""
+Session Store Module
+Atomic, locked persistence of the browser session and cookie imports
+"""
+
+import os
+import json
+import asyncio
+import logging
+import tempfile
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Optional, Dict, Any, List, Iterator
+
+from .config import TwitterConfig
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+logger = logging.getLogger(__name__)
+
+# Defaults for cookies exported without these attributes
+COOKIE_DEFAULTS = {
+    'domain': '.x.com',
+    'path': '/',
+    'expires': -1,
+    'httpOnly': False,
+    'secure': True,
+    'sameSite': 'Lax'
+}
+
+_SAME_SITE = {'lax': 'Lax', 'strict': 'Strict', 'none': 'None', 'no_restriction': 'None', 'unspecified': 'Lax'}
+
+
+def normalize_cookie(cookie: Dict[str, Any]) -> Dict[str, Any]:
+    """One cookie in Playwright's format, from a Playwright, browser-extension or DevTools export"""
+    normalized = {**COOKIE_DEFAULTS, 'name': cookie.get('name', ''), 'value': str(cookie.get('value', ''))}
+    for key in ('domain', 'path', 'httpOnly', 'secure'):
+        if cookie.get(key) is not None:
+            normalized[key] = cookie[key]
+    # Extension exports use expirationDate; session cookies have none
+    expires = cookie.get('expires', cookie.get('expirationDate'))
+    if expires is not None:
+        normalized['expires'] = float(expires)
+    same_site = cookie.get('sameSite')
+    if same_site:
+        normalized['sameSite'] = _SAME_SITE.get(str(same_site).lower(), 'Lax')
+    return normalized
+
+
+def normalize_cookies(data: Any) -> Dict[str, Any]:
+    """Playwright storage state from any supported cookies file layout
+
+    Accepts a storage state ({cookies, origins}), a list of cookie objects,
+    or plain {name: value} pairs.
+    """
+    if isinstance(data, dict) and 'cookies' in data:
+        return {'cookies': [normalize_cookie(c) for c in data['cookies']], 'origins': data.get('origins', [])}
+    if isinstance(data, list):
+        return {'cookies': [normalize_cookie(c) for c in data], 'origins': []}
+    if isinstance(data, dict):
+        return {
+            'cookies': [normalize_cookie({'name': name, 'value': value}) for name, value in data.items()],
+            'origins': []
+        }
+    raise ValueError(f"Unsupported cookies format: {type(data).__name__}")
+
+
+def read_cookies_file(path: str) -> Dict[str, Any]:
+    """Read and normalize a cookies file into a storage state"""
+    with open(path, 'r', encoding='utf-8') as f:
+        return normalize_cookies(json.load(f))
+
+
+@contextmanager
+def file_lock(path: str, shared: bool = False) -> Iterator[None]:
+    """Inter-process lock on `path`.lock; shared locks allow concurrent readers where supported"""
+    lock_path = f"{path}.lock"
+    directory = os.path.dirname(lock_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(lock_path, 'a+b') as handle:
+        if fcntl is not None:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+        else:
+            handle.seek(0)
+            msvcrt.locking(handle.fileno(), msvcrt.LK_LOCK, 1)
+            try:
+                yield
+            finally:
+                handle.seek(0)
+                msvcrt.locking(handle.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def atomic_write_json(path: str, data: Any) -> None:
+    """Write compact JSON to a temp file in the same directory, fsync it and rename over `path`
+
+    Readers see either the old or the new file, never a truncated one.
+    """
+    directory = os.path.dirname(path) or '.'
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(prefix=f".{os.path.basename(path)}.", suffix='.tmp', dir=directory)
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(data, f, separators=(',', ':'))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+class SessionStore:
+    """The saved Playwright storage state shared by every scraper process
+
+    Writes go through write-then-rename under an exclusive file lock, reads
+    take a shared lock, and the *_async variants run the disk I/O in a
+    worker thread so the event loop never blocks on it. Sessions older than
+    `max_age_days` are discarded on load.
+    """
+
+    def __init__(self, path: Optional[str] = None, max_age_days: Optional[float] = None):
+        settings = TwitterConfig.get_session_settings()
+        self.path = path or settings['session_file']
+        self.max_age = timedelta(days=max_age_days if max_age_days is not None else settings['max_age_days'])
+        # flock is per open file, so threads of one process also need a local lock
+        self._thread_lock = threading.Lock()
+
+    def load(self) -> Optional[Dict[str, Any]]:
+        """Storage state of the saved session, or None if missing, unreadable or too old"""
+        with self._thread_lock, file_lock(self.path, shared=True):
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    session_data = json.load(f)
+            except FileNotFoundError:
+                return None
+            except (OSError, ValueError) as e:
+                logger.warning(f"Failed to load session: {e}")
+                return None
+
+        try:
+            saved_time = datetime.fromisoformat(session_data.get('saved_at', ''))
+        except (TypeError, ValueError):
+            logger.warning("Saved session has no valid timestamp, will login fresh")
+            return None
+        if datetime.now() - saved_time >= self.max_age:
+            logger.info("🕐 Saved session expired, will login fresh")
+            self.clear()
+            return None
+        logger.info("✅ Found valid saved session")
+        return session_data.get('storage_state')
+
+    def save(self, storage_state: Dict[str, Any]) -> None:
+        session_data = {'storage_state': storage_state, 'saved_at': datetime.now().isoformat()}
+        with self._thread_lock, file_lock(self.path):
+            atomic_write_json(self.path, session_data)
+        logger.info(f"✅ Session saved to {self.path}")
+
+    def clear(self) -> bool:
+        """Remove the saved session; returns whether one existed"""
+        with self._thread_lock, file_lock(self.path):
+            try:
+                os.remove(self.path)
+                return True
+            except FileNotFoundError:
+                return False
+
+    def import_cookies(self, cookies_file: str) -> Dict[str, Any]:
+        """Normalize a cookies file and save it as the session; returns the storage state"""
+        storage_state = read_cookies_file(cookies_file)
+        self.save(storage_state)
+        return storage_state
+
+    async def load_async(self) -> Optional[Dict[str, Any]]:
+        return await asyncio.to_thread(self.load)
+
+    async def save_async(self, storage_state: Dict[str, Any]) -> None:
+        await asyncio.to_thread(self.save, storage_state)
+
+    async def clear_async(self) -> bool:
+        return await asyncio.to_thread(self.clear)
+
+    @staticmethod
+    async def read_cookies_async(cookies_file: str) -> List[Dict[str, Any]]:
+        """Cookies from a cookies file, normalized, read off the event loop"""
+        storage_state = await asyncio.to_thread(read_cookies_file, cookies_file)
+        return storage_state['cookies']
@@ -0,0 +1,402 @@
+"""
+Content Similarity Module
+Incremental near-duplicate detection over tweet text with MinHash signatures and a persistent LSH index
+"""
+
+import os
+import re
+import zlib
+import sqlite3
+import hashlib
+import logging
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Optional, List, Dict, Any, Iterable, Iterator, Set, Tuple
+
+import numpy as np
+
+from .config import TwitterConfig
+from .dedup import tweet_key
+from .extractor import TweetRecord
+
+logger = logging.getLogger(__name__)
+
+# Prime just above 2^32 for the universal hash family (a * x + b) mod p
+_MERSENNE_PRIME = np.uint64(4294967311)
+_MAX_HASH = np.uint64(0xFFFFFFFF)
+
+_URL_PATTERN = re.compile(r'https?://\S+|www\.\S+')
+_MENTION_PATTERN = re.compile(r'@\w+')
+# Everything but word characters and Devanagari (whose vowel signs are not \w) separates tokens
+_NOISE_PATTERN = re.compile(r'[^\w\u0900-\u097F]+')
+
+
+def normalize_text(text: Optional[str]) -> str:
+    """Lower-cased text without links, mentions, punctuation or emoji, whitespace collapsed
+
+    Copies of a message usually differ only in these (a tagged account, a
+    shortened link), so they are dropped before shingling. Hashtag words are
+    kept without the '#'.
+    """
+    text = _MENTION_PATTERN.sub(' ', _URL_PATTERN.sub(' ', (text or '').lower()))
+    return ' '.join(_NOISE_PATTERN.sub(' ', text).split())
+
+
+def shingle_hashes(normalized: str, size: int) -> np.ndarray:
+    """32-bit hashes of the distinct character `size`-grams of normalized text"""
+    if len(normalized) <= size:
+        shingles = {normalized}
+    else:
+        shingles = {normalized[i:i + size] for i in range(len(normalized) - size + 1)}
+    return np.fromiter((zlib.crc32(s.encode('utf-8')) for s in shingles), dtype=np.uint64, count=len(shingles))
+
+
+class MinHasher:
+    """MinHash signatures over character shingles
+
+    The permutations are fixed by `seed`, so signatures stay comparable
+    between runs and can be stored. The share of equal positions in two
+    signatures estimates the Jaccard similarity of the shingle sets.
+    """
+
+    def __init__(self, num_perm: int = 128, shingle_size: int = 5, seed: int = 1):
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        self.seed = seed
+        rng = np.random.default_rng(seed)
+        # a < 2^31 keeps a * x + b within 64 bits for 32-bit x
+        self._a = rng.integers(1, 2 ** 31, size=num_perm, dtype=np.uint64)[:, None]
+        self._b = rng.integers(0, 2 ** 32, size=num_perm, dtype=np.uint64)[:, None]
+
+    def signature(self, normalized: str) -> np.ndarray:
+        hashes = shingle_hashes(normalized, self.shingle_size)
+        permuted = (self._a * hashes[None, :] + self._b) % _MERSENNE_PRIME & _MAX_HASH
+        return permuted.min(axis=1).astype(np.uint32)
+
+    @staticmethod
+    def similarity(a: np.ndarray, b: np.ndarray) -> float:
+        return float(np.count_nonzero(a == b)) / len(a)
+
+
+@dataclass
+class DuplicateCluster:
+    """A group of near-identical posts from at least `min_authors` accounts"""
+    cluster_id: int
+    size: int
+    authors: List[str]
+    tweet_ids: List[str]
+    sample_text: str
+    first_seen: str
+    last_seen: str
+    new_tweet_ids: List[str] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'cluster_id': self.cluster_id,
+            'size': self.size,
+            'author_count': len(self.authors),
+            'authors': self.authors,
+            'tweet_ids': self.tweet_ids,
+            'sample_text': self.sample_text,
+            'first_seen': self.first_seen,
+            'last_seen': self.last_seen,
+            'new_tweet_ids': self.new_tweet_ids
+        }
+
+
+class NearDuplicateIndex:
+    """Persistent LSH index that clusters near-identical tweets as they are ingested
+
+    Each tweet's MinHash signature is cut into `bands` bands; tweets sharing
+    any band bucket are candidates, and a candidate whose estimated Jaccard
+    similarity reaches `threshold` is a match. Lookups go through the
+    (band, bucket) primary key, so an insert costs about the same with ten
+    thousand or ten million indexed tweets. A new tweet joins the cluster of
+    its matches; when it matches several clusters they are merged (single
+    link), and the cluster keeps the smallest id.
+
+    Tweets whose normalized text is shorter than `min_chars` are not indexed:
+    short replies ("so true", a lone emoji) match each other without any
+    coordination behind them.
+
+    add() returns the clusters that gained tweets in the batch and now span
+    at least `min_authors` distinct authors; a cluster is reported again only
+    when its author count grows.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS meta (
+            key TEXT PRIMARY KEY,
+            value TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS docs (
+            tweet_key INTEGER PRIMARY KEY,
+            tweet_id TEXT NOT NULL,
+            author TEXT NOT NULL,
+            signature BLOB NOT NULL,
+            cluster_id INTEGER NOT NULL,
+            seen_at TEXT NOT NULL,
+            text TEXT
+        );
+        CREATE INDEX IF NOT EXISTS idx_docs_cluster ON docs(cluster_id, author);
+        CREATE TABLE IF NOT EXISTS bands (
+            band INTEGER NOT NULL,
+            bucket INTEGER NOT NULL,
+            tweet_key INTEGER NOT NULL,
+            PRIMARY KEY (band, bucket, tweet_key)
+        ) WITHOUT ROWID;
+        CREATE TABLE IF NOT EXISTS clusters (
+            cluster_id INTEGER PRIMARY KEY,
+            sample_text TEXT NOT NULL,
+            first_seen TEXT NOT NULL,
+            last_seen TEXT NOT NULL,
+            reported_authors INTEGER NOT NULL DEFAULT 0
+        );
+    """
+
+    def __init__(self, db_path: Optional[str] = None, num_perm: Optional[int] = None,
+                 bands: Optional[int] = None, threshold: Optional[float] = None,
+                 shingle_size: Optional[int] = None, min_chars: Optional[int] = None,
+                 min_authors: Optional[int] = None, max_candidates: Optional[int] = None):
+        settings = TwitterConfig.get_similarity_settings()
+        self.db_path = db_path or settings['db_path']
+        num_perm = num_perm or settings['num_perm']
+        self.bands = bands or settings['bands']
+        if num_perm % self.bands:
+            raise ValueError(f"num_perm ({num_perm}) must be a multiple of bands ({self.bands})")
+        self.rows = num_perm // self.bands
+        self.threshold = threshold if threshold is not None else settings['threshold']
+        self.min_chars = min_chars if min_chars is not None else settings['min_chars']
+        self.min_authors = min_authors or settings['min_authors']
+        self.max_candidates = max_candidates or settings['max_candidates']
+        self.hasher = MinHasher(num_perm, shingle_size or settings['shingle_size'])
+
+        directory = os.path.dirname(self.db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.RLock()
+        self.conn = sqlite3.connect(self.db_path, timeout=30.0, isolation_level=None, check_same_thread=False)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.executescript(self.SCHEMA)
+        self._check_parameters()
+
+    def _check_parameters(self) -> None:
+        """Stored signatures are only comparable under the parameters they were built with"""
+        current = {
+            'num_perm': str(self.hasher.num_perm),
+            'bands': str(self.bands),
+            'shingle_size': str(self.hasher.shingle_size),
+            'seed': str(self.hasher.seed)
+        }
+        with self._lock:
+            stored = dict(self.conn.execute("SELECT key, value FROM meta"))
+            if not stored:
+                self.conn.executemany("INSERT INTO meta (key, value) VALUES (?, ?)", current.items())
+                return
+        if stored != current:
+            raise ValueError(f"Similarity index {self.db_path} was built with {stored}, not {current}; "
+                             f"use a new SIMILARITY_DB_PATH or the original parameters")
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        with self._lock:
+            self.conn.execute('BEGIN IMMEDIATE')
+            try:
+                yield self.conn
+            except Exception:
+                self.conn.execute('ROLLBACK')
+                raise
+            self.conn.execute('COMMIT')
+
+    def _band_buckets(self, signature: np.ndarray) -> List[Tuple[int, int]]:
+        rows = self.rows
+        return [
+            (band, int.from_bytes(hashlib.blake2b(signature[band * rows:(band + 1) * rows].tobytes(),
+                                                  digest_size=8).digest(), 'little', signed=True))
+            for band in range(self.bands)
+        ]
+
+    def _matches(self, conn: sqlite3.Connection, key: int, signature: np.ndarray,
+                 buckets: List[Tuple[int, int]]) -> Set[int]:
+        """Cluster ids of indexed tweets similar enough to `signature`"""
+        candidates: Set[int] = set()
+        for band, bucket in buckets:
+            candidates.update(k for (k,) in conn.execute(
+                "SELECT tweet_key FROM bands WHERE band = ? AND bucket = ? LIMIT ?",
+                (band, bucket, self.max_candidates)
+            ))
+        candidates.discard(key)
+
+        clusters: Set[int] = set()
+        for candidate in list(candidates)[:self.max_candidates]:
+            row = conn.execute("SELECT signature, cluster_id FROM docs WHERE tweet_key = ?", (candidate,)).fetchone()
+            if row is None or row[1] in clusters:
+                continue
+            other = np.frombuffer(row[0], dtype=np.uint32)
+            if MinHasher.similarity(signature, other) >= self.threshold:
+                clusters.add(row[1])
+        return clusters
+
+    def _join(self, conn: sqlite3.Connection, key: int, matched: Set[int], text: str, seen_at: str) -> int:
+        """Cluster id for a new tweet, merging the clusters it matched
+
+        first_seen and sample_text come from the earliest member. A matched
+        tweet without near-duplicates so far has no clusters row yet, so its
+        docs row stands in for one.
+        """
+        if not matched:
+            return key
+        ids = sorted(matched)
+        cluster_id = ids[0]
+        placeholders = ','.join('?' * len(ids))
+        existing = {row[0]: row[1:] for row in conn.execute(
+            f"SELECT cluster_id, first_seen, sample_text, reported_authors FROM clusters "
+            f"WHERE cluster_id IN ({placeholders})", ids
+        )}
+        origins = [(seen_at, text)]
+        origins.extend((first_seen, sample_text) for first_seen, sample_text, _ in existing.values())
+        for singleton in matched - existing.keys():
+            row = conn.execute(
+                "SELECT seen_at, text FROM docs WHERE cluster_id = ? ORDER BY seen_at, tweet_key LIMIT 1",
+                (singleton,)
+            ).fetchone()
+            if row is not None:
+                # Tweets indexed before docs kept their text fall back to the new tweet's
+                origins.append((row[0], row[1] or text))
+        first_seen, sample_text = min(origins, key=lambda origin: origin[0])
+        reported = max((reported for _, _, reported in existing.values()), default=0)
+
+        others = ids[1:]
+        if others:
+            others_placeholders = ','.join('?' * len(others))
+            conn.execute(f"UPDATE docs SET cluster_id = ? WHERE cluster_id IN ({others_placeholders})",
+                         [cluster_id, *others])
+            conn.execute(f"DELETE FROM clusters WHERE cluster_id IN ({others_placeholders})", others)
+        conn.execute(
+            "INSERT INTO clusters (cluster_id, sample_text, first_seen, last_seen, reported_authors) "
+            "VALUES (?, ?, ?, ?, ?) ON CONFLICT(cluster_id) DO UPDATE SET sample_text = excluded.sample_text, "
+            "first_seen = excluded.first_seen, last_seen = MAX(clusters.last_seen, excluded.last_seen), "
+            "reported_authors = excluded.reported_authors",
+            (cluster_id, sample_text, first_seen, seen_at, reported)
+        )
+        return cluster_id
+
+    def add(self, records: Iterable[TweetRecord], seen_at: Optional[str] = None) -> List[DuplicateCluster]:
+        """Index a batch of tweets; returns clusters that newly reach or grow past min_authors authors"""
+        seen_at = seen_at or datetime.now().isoformat(timespec='seconds')
+        touched: Dict[int, List[str]] = {}
+
+        with self._transaction() as conn:
+            for record in records:
+                normalized = normalize_text(record.text)
+                if len(normalized) < self.min_chars:
+                    continue
+                key = tweet_key(record.tweet_id)
+                if conn.execute("SELECT 1 FROM docs WHERE tweet_key = ?", (key,)).fetchone():
+                    continue
+
+                signature = self.hasher.signature(normalized)
+                buckets = self._band_buckets(signature)
+                matched = self._matches(conn, key, signature, buckets)
+                cluster_id = self._join(conn, key, matched, record.text, seen_at)
+
+                conn.execute(
+                    "INSERT INTO docs (tweet_key, tweet_id, author, signature, cluster_id, seen_at, text) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (key, record.tweet_id, record.author, signature.tobytes(), cluster_id, seen_at, record.text)
+                )
+                conn.executemany(
+                    "INSERT OR IGNORE INTO bands (band, bucket, tweet_key) VALUES (?, ?, ?)",
+                    [(band, bucket, key) for band, bucket in buckets]
+                )
+                if matched:
+                    # Earlier batch entries may have moved into the merged cluster
+                    new_ids = touched.get(cluster_id, [])
+                    for other in matched - {cluster_id}:
+                        new_ids.extend(touched.pop(other, []))
+                    touched[cluster_id] = new_ids + [record.tweet_id]
+
+            return self._report(conn, touched)
+
+    def _report(self, conn: sqlite3.Connection, touched: Dict[int, List[str]]) -> List[DuplicateCluster]:
+        reported = []
+        for cluster_id, new_ids in touched.items():
+            cluster = self._load_cluster(conn, cluster_id)
+            if cluster is None:
+                continue
+            previous = conn.execute(
+                "SELECT reported_authors FROM clusters WHERE cluster_id = ?", (cluster_id,)
+            ).fetchone()[0]
+            if len(cluster.authors) < self.min_authors or len(cluster.authors) <= previous:
+                continue
+            conn.execute("UPDATE clusters SET reported_authors = ? WHERE cluster_id = ?",
+                         (len(cluster.authors), cluster_id))
+            cluster.new_tweet_ids = new_ids
+            reported.append(cluster)
+        return reported
+
+    def _load_cluster(self, conn: sqlite3.Connection, cluster_id: int) -> Optional[DuplicateCluster]:
+        row = conn.execute(
+            "SELECT sample_text, first_seen, last_seen FROM clusters WHERE cluster_id = ?", (cluster_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        members = conn.execute(
+            "SELECT tweet_id, author FROM docs WHERE cluster_id = ? ORDER BY seen_at, tweet_key", (cluster_id,)
+        ).fetchall()
+        authors = list(dict.fromkeys(author for _, author in members))
+        return DuplicateCluster(
+            cluster_id=cluster_id,
+            size=len(members),
+            authors=authors,
+            tweet_ids=[tweet_id for tweet_id, _ in members],
+            sample_text=row[0],
+            first_seen=row[1],
+            last_seen=row[2]
+        )
+
+    def consume(self, records: List[TweetRecord], query: Optional[str],
+                captured_at: Optional[str]) -> List[DuplicateCluster]:
+        """IngestPipeline consumer: index records and log coordinated clusters"""
+        clusters = self.add(records, captured_at)
+        for cluster in clusters:
+            logger.info(f"👥 Near-duplicate cluster {cluster.cluster_id}: {cluster.size} posts from "
+                        f"{len(cluster.authors)} accounts (query: {query}): {cluster.sample_text[:80]!r}")
+        return clusters
+
+    def cluster_of(self, tweet_id: str) -> Optional[DuplicateCluster]:
+        """The cluster a tweet belongs to, or None if it is unindexed or has no near-duplicates"""
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT cluster_id FROM docs WHERE tweet_key = ?", (tweet_key(tweet_id),)
+            ).fetchone()
+            if row is None:
+                return None
+            return self._load_cluster(self.conn, row[0])
+
+    def clusters(self, min_authors: Optional[int] = None, limit: int = 100) -> List[DuplicateCluster]:
+        """Largest clusters by author count"""
+        min_authors = min_authors or self.min_authors
+        with self._lock:
+            ids = [cluster_id for (cluster_id,) in self.conn.execute(
+                "SELECT cluster_id FROM docs GROUP BY cluster_id HAVING COUNT(DISTINCT author) >= ? "
+                "ORDER BY COUNT(DISTINCT author) DESC, COUNT(*) DESC LIMIT ?",
+                (min_authors, limit)
+            )]
+            return [cluster for cluster in (self._load_cluster(self.conn, i) for i in ids) if cluster]
+
+    def count(self) -> int:
+        with self._lock:
+            return self.conn.execute("SELECT COUNT(*) FROM docs").fetchone()[0]
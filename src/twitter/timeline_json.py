@@ -0,0 +1,230 @@
+"""
+Timeline JSON Module
+Parses X.com SearchTimeline API responses into tweet records
+"""
+
+import re
+import json
+import asyncio
+import logging
+from datetime import datetime
+from typing import Optional, Dict, Any, Callable, Iterator, Iterable, List, Union, IO
+
+from .extractor import TweetRecord
+
+logger = logging.getLogger(__name__)
+
+# GraphQL endpoint the search page calls for every batch of results
+DEFAULT_TIMELINE_URL_PATTERN = r'/i/api/graphql/[^/]+/SearchTimeline'
+
+_CREATED_AT_FORMAT = '%a %b %d %H:%M:%S %z %Y'
+
+
+def compile_url_pattern(pattern: Optional[str] = None) -> re.Pattern:
+    return re.compile(pattern or DEFAULT_TIMELINE_URL_PATTERN)
+
+
+def _iso_timestamp(created_at: Optional[str]) -> Optional[str]:
+    """'Mon May 13 10:00:00 +0000 2024' → '2024-05-13T10:00:00.000Z', the format of <time datetime>"""
+    if not created_at:
+        return None
+    try:
+        parsed = datetime.strptime(created_at, _CREATED_AT_FORMAT)
+    except ValueError:
+        return created_at
+    return parsed.strftime('%Y-%m-%dT%H:%M:%S.000Z')
+
+
+def _int(value: Any) -> int:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return 0
+
+
+def _unwrap(result: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """Strip visibility wrappers around a tweet result"""
+    while result and result.get('__typename') == 'TweetWithVisibilityResults':
+        result = result.get('tweet')
+    if not result or result.get('__typename') in ('TweetTombstone', 'TweetUnavailable'):
+        return None
+    return result
+
+
+def _user_fields(result: Dict[str, Any]) -> Dict[str, Any]:
+    user = result.get('core', {}).get('user_results', {}).get('result', {}) or {}
+    # Newer responses moved screen_name/name from legacy into core
+    fields = dict(user.get('legacy') or {})
+    fields.update({k: v for k, v in (user.get('core') or {}).items() if v})
+    return fields
+
+
+def record_from_result(result: Dict[str, Any]) -> Optional[TweetRecord]:
+    """Convert one tweet_results.result object into a TweetRecord"""
+    result = _unwrap(result)
+    if result is None:
+        return None
+    legacy = result.get('legacy') or {}
+    tweet_id = result.get('rest_id') or legacy.get('id_str')
+    user = _user_fields(result)
+    if not tweet_id or not user.get('screen_name'):
+        return None
+
+    # A retweet entry wraps the original post; record the original and who retweeted it
+    retweeted = legacy.get('retweeted_status_result', {}).get('result')
+    if retweeted:
+        original = record_from_result(retweeted)
+        if original is not None:
+            original.retweeted_by = user['screen_name']
+            return original
+
+    # Long posts carry their full text in note_tweet; legacy.full_text is truncated
+    note = result.get('note_tweet', {}).get('note_tweet_results', {}).get('result', {})
+    text = note.get('text') or legacy.get('full_text') or ''
+    mentions = (legacy.get('entities') or {}).get('user_mentions') or []
+
+    return TweetRecord(
+        tweet_id=str(tweet_id),
+        author=user['screen_name'],
+        timestamp=_iso_timestamp(legacy.get('created_at')),
+        text=' '.join(text.split()),
+        display_name=user.get('name'),
+        reply_count=_int(legacy.get('reply_count')),
+        retweet_count=_int(legacy.get('retweet_count')),
+        like_count=_int(legacy.get('favorite_count')),
+        view_count=_int((result.get('views') or {}).get('count')),
+        mentions=list(dict.fromkeys(m['screen_name'] for m in mentions if m.get('screen_name'))),
+        in_reply_to=legacy.get('in_reply_to_screen_name') or None
+    )
+
+
+def _tweet_results(node: Any) -> Iterator[Dict[str, Any]]:
+    """Every tweet_results.result in a payload, wherever the timeline nests it
+
+    Search results arrive as TimelineAddEntries items, module items and
+    TimelineReplaceEntry updates; walking for the tweet_results key covers
+    all of them without tracking the instruction types. Quoted and
+    retweeted tweets live under other keys and are not yielded separately
+    (a retweet entry becomes a record of the original, see record_from_result).
+    """
+    if isinstance(node, dict):
+        for key, value in node.items():
+            if key == 'tweet_results' and isinstance(value, dict):
+                if isinstance(value.get('result'), dict):
+                    yield value['result']
+            elif isinstance(value, (dict, list)):
+                yield from _tweet_results(value)
+    elif isinstance(node, list):
+        for item in node:
+            yield from _tweet_results(item)
+
+
+def iter_payload(payload: Dict[str, Any], seen_ids: Optional[set] = None) -> Iterator[TweetRecord]:
+    """Yield tweets of one SearchTimeline response in timeline order, skipping ids in seen_ids"""
+    seen_ids = seen_ids if seen_ids is not None else set()
+    for result in _tweet_results(payload):
+        record = record_from_result(result)
+        if record and record.tweet_id not in seen_ids:
+            seen_ids.add(record.tweet_id)
+            yield record
+
+
+def bottom_cursor(payload: Dict[str, Any]) -> Optional[str]:
+    """Cursor value for the next page of results, if the payload has one"""
+    stack = [payload]
+    while stack:
+        current = stack.pop()
+        if isinstance(current, dict):
+            if current.get('cursorType') == 'Bottom' and current.get('value'):
+                return current['value']
+            stack.extend(v for v in current.values() if isinstance(v, (dict, list)))
+        elif isinstance(current, list):
+            stack.extend(current)
+    return None
+
+
+def iter_capture(source: Union[str, bytes, IO]) -> Iterator[TweetRecord]:
+    """Yield tweets from a saved network capture
+
+    Captures are JSON Lines, one SearchTimeline response per line, as written
+    by TwitterScraper in network capture mode.
+    """
+    if isinstance(source, (str, bytes)):
+        lines: Iterable = source.splitlines()
+    else:
+        lines = source
+    seen_ids: set = set()
+    for number, line in enumerate(lines, 1):
+        if isinstance(line, bytes):
+            line = line.decode('utf-8')
+        if not line.strip():
+            continue
+        try:
+            payload = json.loads(line)
+        except json.JSONDecodeError as e:
+            logger.warning(f"Skipping malformed timeline payload on line {number}: {e}")
+            continue
+        yield from iter_payload(payload, seen_ids)
+
+
+def dump_capture(payloads: List[Dict[str, Any]]) -> str:
+    """Serialize captured responses as compact JSON Lines"""
+    return ''.join(json.dumps(payload, ensure_ascii=False, separators=(',', ':')) + '\n' for payload in payloads)
+
+
+class TimelineCollector:
+    """Collects SearchTimeline responses from a Playwright page's response events
+
+    Register on_response with page.on("response") before navigating. Matching
+    responses are read and parsed in background tasks as they arrive; call
+    drain() to wait for the ones still in flight. on_records, if given, is
+    called in a worker thread with each response's new records as soon as
+    they are parsed.
+    """
+
+    def __init__(self, url_pattern: Optional[str] = None,
+                 on_records: Optional[Callable[[List[TweetRecord]], Any]] = None):
+        self.pattern = compile_url_pattern(url_pattern)
+        self.on_records = on_records
+        self.payloads: List[Dict[str, Any]] = []
+        self.records: List[TweetRecord] = []
+        self.seen_ids: set = set()
+        self.bytes = 0
+        self.errors = 0
+        self.rate_limited = 0
+        self._pending: set = set()
+
+    def on_response(self, response) -> None:
+        if not self.pattern.search(response.url):
+            return
+        if response.status == 429:
+            self.rate_limited += 1
+        task = asyncio.ensure_future(self._read(response))
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    async def _read(self, response) -> None:
+        try:
+            if not response.ok:
+                raise ValueError(f"HTTP {response.status}")
+            body = await response.body()
+            payload = json.loads(body)
+        except Exception as e:
+            # Bodies of responses the page already discarded can no longer be read
+            self.errors += 1
+            logger.debug(f"Skipping timeline response {response.url}: {e}")
+            return
+        self.bytes += len(body)
+        self.payloads.append(payload)
+        records = list(iter_payload(payload, self.seen_ids))
+        self.records.extend(records)
+        if records and self.on_records is not None:
+            try:
+                await asyncio.to_thread(self.on_records, records)
+            except Exception as e:
+                logger.error(f"❌ Failed to hand off {len(records)} timeline tweets: {e}")
+
+    async def drain(self) -> None:
+        """Wait until every matching response seen so far has been parsed"""
+        while self._pending:
+            await asyncio.gather(*list(self._pending), return_exceptions=True)
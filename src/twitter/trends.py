@@ -0,0 +1,270 @@
+"""
+Trend Analysis Module
+Streaming hashtag / mention counts in time-bucketed count-min sketches with Space-Saving top-K
+"""
+
+import time
+import heapq
+import hashlib
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Optional, List, Dict, Any, Iterable, Tuple
+
+import numpy as np
+
+from .config import TwitterConfig
+from .coordination import extract_hashtags, parse_timestamp
+from .extractor import TweetRecord
+
+logger = logging.getLogger(__name__)
+
+
+def record_terms(record: TweetRecord) -> List[str]:
+    """Trend terms of a tweet: its hashtags ('#tag') and mentioned accounts ('@handle'), lower-cased"""
+    terms = [f"#{tag}" for tag in extract_hashtags(record.text)]
+    terms.extend(f"@{handle.lower()}" for handle in dict.fromkeys(record.mentions))
+    return terms
+
+
+class CountMinSketch:
+    """depth x width counter table; estimates never undercount, and overcount by about total / width
+
+    Positions come from double hashing one 128-bit digest per term, as in
+    dedup.BloomFilter. Updates are conservative (only the minimal counters
+    are raised), which keeps the overcount for rare terms lower.
+    """
+
+    def __init__(self, width: int, depth: int, table: Optional[np.ndarray] = None):
+        self.width = width
+        self.depth = depth
+        self.table = table if table is not None else np.zeros((depth, width), dtype=np.int32)
+        self._rows = np.arange(depth)
+
+    def positions(self, term: str) -> np.ndarray:
+        digest = hashlib.blake2b(term.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return np.array([(h1 + i * h2) % self.width for i in range(self.depth)], dtype=np.int64)
+
+    def add(self, term: str, count: int = 1, positions: Optional[np.ndarray] = None) -> int:
+        """Count a term; returns its new estimate"""
+        positions = self.positions(term) if positions is None else positions
+        cells = self.table[self._rows, positions]
+        estimate = int(cells.min()) + count
+        self.table[self._rows, positions] = np.maximum(cells, estimate)
+        return estimate
+
+    def estimate(self, term: str, positions: Optional[np.ndarray] = None) -> int:
+        positions = self.positions(term) if positions is None else positions
+        return int(self.table[self._rows, positions].min())
+
+    def clear(self) -> None:
+        self.table[:] = 0
+
+
+class SpaceSaving:
+    """Top-k heavy hitters in at most k counters (Metwally et al.)
+
+    When a new term arrives and all counters are taken, it replaces the term
+    with the smallest count and inherits that count as its error bound, so
+    every term with a true count above total / k is guaranteed to be present.
+    The smallest counter is found through a min-heap with lazy deletion:
+    stale (count, term) entries are skipped when popped, and the heap is
+    rebuilt from the counters once it grows past a few times k.
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.counts: Dict[str, int] = {}
+        self.errors: Dict[str, int] = {}
+        self._heap: List[Tuple[int, str]] = []
+
+    def _push(self, term: str, count: int) -> None:
+        self.counts[term] = count
+        heapq.heappush(self._heap, (count, term))
+        if len(self._heap) > 4 * self.capacity:
+            self._heap = [(c, t) for t, c in self.counts.items()]
+            heapq.heapify(self._heap)
+
+    def add(self, term: str, count: int = 1) -> None:
+        if term in self.counts:
+            self._push(term, self.counts[term] + count)
+            return
+        if len(self.counts) < self.capacity:
+            self.errors[term] = 0
+            self._push(term, count)
+            return
+        while True:
+            floor, evicted = heapq.heappop(self._heap)
+            if self.counts.get(evicted) == floor:
+                break
+        del self.counts[evicted]
+        del self.errors[evicted]
+        self.errors[term] = floor
+        self._push(term, floor + count)
+
+    def top(self, n: int) -> List[Tuple[str, int, int]]:
+        """(term, count upper bound, error) for the n largest counters"""
+        ranked = sorted(self.counts.items(), key=lambda item: -item[1])[:n]
+        return [(term, count, self.errors[term]) for term, count in ranked]
+
+    def clear(self) -> None:
+        self.counts.clear()
+        self.errors.clear()
+        self._heap.clear()
+
+
+@dataclass
+class TrendingTerm:
+    """A term whose count in the current bucket jumped against its baseline"""
+    term: str
+    count: int
+    baseline: float
+    ratio: float
+    bucket_start: str
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'term': self.term,
+            'count': self.count,
+            'baseline': round(self.baseline, 2),
+            'ratio': round(self.ratio, 2),
+            'bucket_start': self.bucket_start
+        }
+
+
+class TrendTracker:
+    """Fixed-memory term counts over a ring of time buckets
+
+    Each of the `baseline_buckets` + 1 buckets (`bucket_seconds` long) holds
+    a count-min sketch for estimating any term's count and a Space-Saving
+    summary of its `top_k` heaviest terms, so memory is independent of how
+    many distinct hashtags show up. Buckets follow tweet timestamps; posts
+    older than the ring are dropped (`late`) and a newer bucket recycles the
+    oldest slot.
+
+    emerging() compares each heavy hitter of the newest bucket with its mean
+    count over the preceding buckets; terms with at least `min_count` posts
+    and (count + 1) / (baseline + 1) >= `min_ratio` are reported, strongest
+    jump first. top() gives the live top-N over the whole ring.
+    """
+
+    def __init__(self, bucket_seconds: Optional[float] = None, baseline_buckets: Optional[int] = None,
+                 width: Optional[int] = None, depth: Optional[int] = None, top_k: Optional[int] = None,
+                 min_count: Optional[int] = None, min_ratio: Optional[float] = None):
+        settings = TwitterConfig.get_trend_settings()
+        self.bucket_seconds = bucket_seconds or settings['bucket_seconds']
+        self.baseline_buckets = baseline_buckets or settings['baseline_buckets']
+        self.slots = self.baseline_buckets + 1
+        self.width = width or settings['sketch_width']
+        self.depth = depth or settings['sketch_depth']
+        self.top_k = top_k or settings['top_k']
+        self.min_count = min_count or settings['min_count']
+        self.min_ratio = min_ratio or settings['min_ratio']
+
+        tables = np.zeros((self.slots, self.depth, self.width), dtype=np.int32)
+        self._sketches = [CountMinSketch(self.width, self.depth, tables[i]) for i in range(self.slots)]
+        self._heavy = [SpaceSaving(self.top_k) for _ in range(self.slots)]
+        self._buckets = np.full(self.slots, -1, dtype=np.int64)
+        self.newest = -1
+        self.late = 0
+        self._reported: Dict[str, int] = {}
+
+    def _slot(self, bucket: int) -> Optional[int]:
+        """Ring slot for an absolute bucket number, recycling stale slots; None if too old"""
+        if bucket <= self.newest - self.slots:
+            return None
+        slot = bucket % self.slots
+        if self._buckets[slot] != bucket:
+            self._sketches[slot].clear()
+            self._heavy[slot].clear()
+            self._buckets[slot] = bucket
+        if bucket > self.newest:
+            self.newest = bucket
+        return slot
+
+    def observe(self, term: str, timestamp: float, count: int = 1) -> None:
+        slot = self._slot(int(timestamp // self.bucket_seconds))
+        if slot is None:
+            self.late += 1
+            return
+        self._sketches[slot].add(term, count)
+        self._heavy[slot].add(term, count)
+
+    def add(self, records: Iterable[TweetRecord], captured_at: Optional[str] = None) -> int:
+        """Count the terms of a batch of records; returns the number of terms counted"""
+        fallback = parse_timestamp(captured_at) or time.time()
+        counted = 0
+        for record in records:
+            timestamp = parse_timestamp(record.timestamp) or fallback
+            for term in record_terms(record):
+                self.observe(term, timestamp)
+                counted += 1
+        return counted
+
+    def _live_slots(self) -> List[int]:
+        return [slot for slot in range(self.slots) if self._buckets[slot] > self.newest - self.slots]
+
+    def estimate(self, term: str, bucket: Optional[int] = None) -> int:
+        """Estimated count of a term in one bucket (the newest by default)"""
+        bucket = self.newest if bucket is None else bucket
+        slot = bucket % self.slots
+        if bucket < 0 or self._buckets[slot] != bucket:
+            return 0
+        return self._sketches[slot].estimate(term)
+
+    def emerging(self, limit: int = 20) -> List[TrendingTerm]:
+        """Heavy hitters of the newest bucket whose count jumped against the preceding buckets"""
+        if self.newest < 0:
+            return []
+        current_slot = self.newest % self.slots
+        baseline_slots = [slot for slot in self._live_slots() if slot != current_slot]
+        trending = []
+        for term, _, _ in self._heavy[current_slot].top(self.top_k):
+            positions = self._sketches[current_slot].positions(term)
+            count = self._sketches[current_slot].estimate(term, positions)
+            if count < self.min_count:
+                continue
+            # Buckets with no data yet count as zero, so a fresh tracker does not flag everything at once
+            history = sum(self._sketches[slot].estimate(term, positions) for slot in baseline_slots)
+            baseline = history / self.baseline_buckets
+            ratio = (count + 1) / (baseline + 1)
+            if ratio >= self.min_ratio:
+                trending.append(TrendingTerm(term, count, baseline, ratio, self._bucket_start(self.newest)))
+        trending.sort(key=lambda t: (-t.ratio, -t.count))
+        return trending[:limit]
+
+    def top(self, n: int = 20) -> List[Tuple[str, int]]:
+        """Live top-N terms over every bucket in the ring, by summed sketch estimates"""
+        slots = self._live_slots()
+        candidates = {term for slot in slots for term, _, _ in self._heavy[slot].top(self.top_k)}
+        totals = []
+        for term in candidates:
+            positions = self._sketches[slots[0]].positions(term)
+            totals.append((term, sum(self._sketches[slot].estimate(term, positions) for slot in slots)))
+        totals.sort(key=lambda item: (-item[1], item[0]))
+        return totals[:n]
+
+    def consume(self, records: List[TweetRecord], query: Optional[str],
+                captured_at: Optional[str]) -> List[TrendingTerm]:
+        """IngestPipeline consumer: count records and log terms that start trending in the newest bucket"""
+        self.add(records, captured_at)
+        fresh = []
+        for trend in self.emerging():
+            if self._reported.get(trend.term) == self.newest:
+                continue
+            self._reported[trend.term] = self.newest
+            fresh.append(trend)
+            logger.info(f"📈 Emerging {trend.term}: {trend.count} posts since {trend.bucket_start} "
+                        f"({trend.ratio:.1f}x baseline {trend.baseline:.1f})")
+        # Only the newest bucket's reports matter for suppressing repeats
+        self._reported = {term: bucket for term, bucket in self._reported.items() if bucket == self.newest}
+        return fresh
+
+    def _bucket_start(self, bucket: int) -> str:
+        return datetime.fromtimestamp(bucket * self.bucket_seconds, timezone.utc).isoformat(timespec='seconds')
+
+    def memory_bytes(self) -> int:
+        """Size of the sketch tables (Space-Saving summaries add at most top_k entries per bucket)"""
+        return self.slots * self.depth * self.width * 4
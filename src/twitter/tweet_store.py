@@ -0,0 +1,192 @@
+"""
+Tweet Store Module
+Columnar storage for extracted tweets in Parquet files partitioned by capture date and query
+"""
+
+import os
+import uuid
+import logging
+from datetime import datetime, timezone
+from typing import Optional, List, Iterable, Union
+from urllib.parse import quote
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from .config import TwitterConfig
+from .extractor import TweetRecord
+
+logger = logging.getLogger(__name__)
+
+TimeLike = Union[str, datetime]
+
+
+def _to_utc(value: Optional[TimeLike]) -> Optional[datetime]:
+    """Parse ISO strings / datetimes into aware UTC datetimes"""
+    if value is None or value == '':
+        return None
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value.replace('Z', '+00:00'))
+        except ValueError:
+            return None
+    if value.tzinfo is None:
+        value = value.astimezone()
+    return value.astimezone(timezone.utc)
+
+
+class ParquetTweetStore:
+    """Append-only Parquet dataset of extracted tweets
+
+    Layout: <root>/capture_date=YYYY-MM-DD/query=<url-encoded query>/part-*.parquet
+
+    Reads go through pyarrow.dataset, so query and capture-date filters prune
+    whole partition directories and author/time filters are pushed down to the
+    Parquet row groups instead of being applied after loading.
+    """
+
+    SCHEMA = pa.schema([
+        ('tweet_id', pa.string()),
+        ('author', pa.string()),
+        ('display_name', pa.string()),
+        ('timestamp', pa.timestamp('ms', tz='UTC')),
+        ('text', pa.string()),
+        ('reply_count', pa.int64()),
+        ('retweet_count', pa.int64()),
+        ('like_count', pa.int64()),
+        ('view_count', pa.int64()),
+        ('mentions', pa.list_(pa.string())),
+        ('in_reply_to', pa.string()),
+        ('retweeted_by', pa.string()),
+        ('captured_at', pa.timestamp('ms', tz='UTC'))
+    ])
+
+    PARTITIONING = ds.partitioning(
+        pa.schema([('capture_date', pa.string()), ('query', pa.string())]),
+        flavor='hive'
+    )
+
+    def __init__(self, root: Optional[str] = None):
+        self.root = root or TwitterConfig.get_storage_settings()['tweet_store_dir']
+        os.makedirs(self.root, exist_ok=True)
+
+    def _partition_dir(self, capture_date: str, query: str) -> str:
+        return os.path.join(self.root, f"capture_date={capture_date}", f"query={quote(query, safe='')}")
+
+    def _to_table(self, records: List[TweetRecord], captured_at: datetime) -> pa.Table:
+        columns = {name: [] for name in self.SCHEMA.names}
+        for record in records:
+            columns['tweet_id'].append(record.tweet_id)
+            columns['author'].append(record.author)
+            columns['display_name'].append(record.display_name)
+            columns['timestamp'].append(_to_utc(record.timestamp))
+            columns['text'].append(record.text)
+            columns['reply_count'].append(record.reply_count)
+            columns['retweet_count'].append(record.retweet_count)
+            columns['like_count'].append(record.like_count)
+            columns['view_count'].append(record.view_count)
+            columns['mentions'].append(record.mentions)
+            columns['in_reply_to'].append(record.in_reply_to)
+            columns['retweeted_by'].append(record.retweeted_by)
+            columns['captured_at'].append(captured_at)
+        return pa.table(columns, schema=self.SCHEMA)
+
+    def append(self, records: Iterable[TweetRecord], query: str, captured_at: Optional[TimeLike] = None) -> int:
+        """Write one capture's records as a new part file in its partition"""
+        records = list(records)
+        if not records:
+            return 0
+
+        captured = _to_utc(captured_at) or datetime.now(timezone.utc)
+        partition = self._partition_dir(captured.strftime('%Y-%m-%d'), query)
+        os.makedirs(partition, exist_ok=True)
+
+        name = f"part-{captured.strftime('%H%M%S')}-{uuid.uuid4().hex[:12]}.parquet"
+        self._write_atomic(self._to_table(records, captured), partition, name)
+        return len(records)
+
+    @staticmethod
+    def _write_atomic(table: pa.Table, directory: str, name: str) -> None:
+        """Write under a hidden temp name first so readers never see partial files"""
+        tmp_path = os.path.join(directory, f".{name}.tmp")
+        pq.write_table(table, tmp_path, compression='zstd')
+        os.replace(tmp_path, os.path.join(directory, name))
+
+    def dataset(self) -> ds.Dataset:
+        return ds.dataset(
+            self.root,
+            format='parquet',
+            schema=self.SCHEMA.append(pa.field('capture_date', pa.string())).append(pa.field('query', pa.string())),
+            partitioning=self.PARTITIONING,
+            exclude_invalid_files=True,
+            ignore_prefixes=['.', '_']
+        )
+
+    def build_filter(self, queries: Optional[Iterable[str]] = None, authors: Optional[Iterable[str]] = None,
+                     start: Optional[TimeLike] = None, end: Optional[TimeLike] = None,
+                     capture_start: Optional[TimeLike] = None,
+                     capture_end: Optional[TimeLike] = None) -> Optional[ds.Expression]:
+        """Combine the supported predicates into one dataset expression"""
+        expressions = []
+        if queries is not None:
+            expressions.append(ds.field('query').isin(list(queries)))
+        if authors is not None:
+            expressions.append(ds.field('author').isin(list(authors)))
+
+        start, end = _to_utc(start), _to_utc(end)
+        if start is not None:
+            expressions.append(ds.field('timestamp') >= pa.scalar(start, type=pa.timestamp('ms', tz='UTC')))
+            # A tweet cannot be captured before it was posted, so older partitions can be skipped
+            expressions.append(ds.field('capture_date') >= start.strftime('%Y-%m-%d'))
+        if end is not None:
+            expressions.append(ds.field('timestamp') < pa.scalar(end, type=pa.timestamp('ms', tz='UTC')))
+
+        capture_start, capture_end = _to_utc(capture_start), _to_utc(capture_end)
+        if capture_start is not None:
+            expressions.append(ds.field('capture_date') >= capture_start.strftime('%Y-%m-%d'))
+            expressions.append(ds.field('captured_at') >= pa.scalar(capture_start, type=pa.timestamp('ms', tz='UTC')))
+        if capture_end is not None:
+            expressions.append(ds.field('capture_date') <= capture_end.strftime('%Y-%m-%d'))
+            expressions.append(ds.field('captured_at') < pa.scalar(capture_end, type=pa.timestamp('ms', tz='UTC')))
+
+        if not expressions:
+            return None
+        combined = expressions[0]
+        for expression in expressions[1:]:
+            combined = combined & expression
+        return combined
+
+    def read_table(self, columns: Optional[List[str]] = None, **filters) -> pa.Table:
+        """Read matching rows as an Arrow table (see build_filter for filter arguments)"""
+        if not os.listdir(self.root):
+            return self.SCHEMA.empty_table() if columns is None else self.SCHEMA.empty_table().select(
+                [c for c in columns if c in self.SCHEMA.names])
+        return self.dataset().to_table(columns=columns, filter=self.build_filter(**filters))
+
+    def read(self, columns: Optional[List[str]] = None, **filters) -> pd.DataFrame:
+        """Read matching rows as a pandas DataFrame"""
+        return self.read_table(columns=columns, **filters).to_pandas()
+
+    def compact(self, capture_date: str) -> int:
+        """Merge the part files of each partition for one capture date; returns files removed"""
+        date_dir = os.path.join(self.root, f"capture_date={capture_date}")
+        if not os.path.isdir(date_dir):
+            return 0
+
+        removed = 0
+        for query_dir in sorted(os.listdir(date_dir)):
+            partition = os.path.join(date_dir, query_dir)
+            parts = sorted(
+                os.path.join(partition, name) for name in os.listdir(partition) if name.endswith('.parquet')
+            )
+            if len(parts) < 2:
+                continue
+            table = pa.concat_tables(pq.read_table(part, schema=self.SCHEMA) for part in parts)
+            self._write_atomic(table, partition, f"part-compacted-{uuid.uuid4().hex[:12]}.parquet")
+            for part in parts:
+                os.remove(part)
+            removed += len(parts) - 1
+        logger.info(f"🧱 Compacted {capture_date}: {removed} part files merged")
+        return removed
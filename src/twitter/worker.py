@@ -0,0 +1,355 @@
+"""
+Queue Worker Module
+Scraping worker processes fed by the shared SQLite task queue, and a supervisor that runs K of them
+
+    python -m twitter.worker                  # one worker in this process
+    python -m twitter.worker --supervise 4    # supervisor with 4 worker processes
+
+Run from src/ (or with src/ on PYTHONPATH). Each worker owns its own
+browser and TwitterScraper; they coordinate only through the task queue,
+which hands every pending task to exactly one of them.
+"""
+
+import os
+import sys
+import time
+import signal
+import socket
+import asyncio
+import logging
+import argparse
+import subprocess
+from dataclasses import dataclass
+from typing import Optional, List, Dict
+
+from .config import TwitterConfig
+from .database import TwitterDatabase, ScrapingTask
+from .browser_pool import BrowserPool
+from .scraper import TwitterScraper
+from .rate_control import RateController
+from .metrics import metrics_from_settings
+from .pipeline import IngestPipeline
+from .analysis import attach_record_pipeline
+
+logger = logging.getLogger(__name__)
+
+SRC_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Worker exit codes; anything other than EXIT_OK makes the supervisor restart the worker
+EXIT_OK = 0
+EXIT_LOGIN_FAILED = 2
+
+
+def default_worker_id() -> str:
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+
+class QueueWorker:
+    """Claims tasks from the queue and scrapes them until stopped
+
+    A heartbeat (status, current task, counters) is written to the queue
+    database every WORKER_HEARTBEAT_SECONDS. SIGTERM or SIGINT starts a
+    drain: the task in progress finishes, no new task is claimed, and the
+    worker exits. The scraper session (context and login) is reused for up
+    to WORKER_SESSION_TASKS tasks, then closed so the browser pool can
+    recycle the browser; a session that hit a login redirect is replaced
+    right away, and the task it bounced goes back to the queue.
+    """
+
+    def __init__(self, worker_id: Optional[str] = None, db: Optional[TwitterDatabase] = None,
+                 max_tasks: Optional[int] = None, exit_when_empty: bool = False):
+        self.settings = TwitterConfig.get_worker_settings()
+        self.worker_id = worker_id or default_worker_id()
+        self.db = db or TwitterDatabase()
+        self.max_tasks = max_tasks
+        self.exit_when_empty = exit_when_empty
+
+        self.status = 'starting'
+        self.current_task: Optional[ScrapingTask] = None
+        self.completed = 0
+        self.failed = 0
+        self._stop: Optional[asyncio.Event] = None
+        self._scraper: Optional[TwitterScraper] = None
+        # Kept across scraper sessions so the learned rate survives browser recycling
+        self.rate = RateController()
+        self.metrics = metrics_from_settings()
+        # Network-mode ingestion, shared by every session so dedup and analysis state carry over
+        self.records: Optional[IngestPipeline] = None
+
+    @property
+    def stopping(self) -> bool:
+        return self._stop is not None and self._stop.is_set()
+
+    def stop(self) -> None:
+        """Drain: finish the current task, then exit"""
+        if not self.stopping:
+            logger.info(f"🛑 Worker {self.worker_id} draining")
+            self._stop.set()
+
+    def _install_signal_handlers(self) -> None:
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            try:
+                loop.add_signal_handler(sig, self.stop)
+            except (NotImplementedError, RuntimeError):
+                # Windows event loops have no add_signal_handler
+                signal.signal(sig, lambda *_: loop.call_soon_threadsafe(self.stop))
+
+    async def _beat(self, status: Optional[str] = None) -> None:
+        if status:
+            self.status = status
+        try:
+            await asyncio.to_thread(
+                self.db.heartbeat, self.worker_id, self.status, os.getpid(),
+                self.current_task.id if self.current_task else None, self.completed, self.failed
+            )
+        except Exception as e:
+            logger.warning(f"Heartbeat failed: {e}")
+
+    async def _heartbeat_loop(self) -> None:
+        while True:
+            await self._beat()
+            await asyncio.sleep(self.settings['heartbeat_interval'])
+
+    async def _sleep(self, seconds: float) -> None:
+        """Sleep that ends early when a drain is requested"""
+        try:
+            await asyncio.wait_for(self._stop.wait(), seconds)
+        except asyncio.TimeoutError:
+            pass
+
+    async def _session(self, pool: BrowserPool) -> TwitterScraper:
+        """The logged-in scraper, opening a new session when needed"""
+        if self._scraper is not None:
+            if not self._scraper.session_valid:
+                logger.info(f"🔒 Worker {self.worker_id} session expired, logging in again")
+            elif self._scraper.jobs_run < self.settings['session_tasks']:
+                return self._scraper
+        await self._close_session()
+        scraper = TwitterScraper(pool=pool, rate=self.rate, metrics=self.metrics)
+        scraper.db = self.db
+        self.records = attach_record_pipeline(scraper, self.records)
+        await scraper.setup_browser()
+        self._scraper = scraper
+        if not await scraper.login():
+            await self._close_session()
+            raise RuntimeError("Login failed")
+        return scraper
+
+    async def _close_session(self) -> None:
+        if self._scraper is not None:
+            scraper, self._scraper = self._scraper, None
+            await scraper.close()
+
+    async def run(self) -> int:
+        """Process tasks until drained, out of work (with exit_when_empty) or max_tasks; returns an exit code"""
+        self._stop = asyncio.Event()
+        self._install_signal_handlers()
+        heartbeat = asyncio.create_task(self._heartbeat_loop())
+        pool = BrowserPool(size=1)
+        exit_code = EXIT_OK
+        processed = 0
+        logger.info(f"👷 Worker {self.worker_id} started (pid {os.getpid()})")
+
+        # Tasks of workers that died without a supervisor would otherwise stay 'running' forever
+        requeued = await asyncio.to_thread(self.db.requeue_stale, self.settings['heartbeat_timeout'])
+        if requeued:
+            logger.info(f"♻️ Requeued {requeued} task(s) from workers with stale heartbeats")
+
+        try:
+            while not self.stopping:
+                if self.max_tasks is not None and processed >= self.max_tasks:
+                    break
+                task = await asyncio.to_thread(self.db.claim_next_task, self.worker_id)
+                if task is None:
+                    if self.exit_when_empty:
+                        break
+                    await self._beat('idle')
+                    await self._sleep(self.settings['poll_interval'])
+                    continue
+
+                self.current_task = task
+                await self._beat('running')
+                try:
+                    scraper = await self._session(pool)
+                except Exception as e:
+                    # Give the task back; the supervisor restarts this worker after a backoff
+                    await asyncio.to_thread(self.db.update_task_status, task.id, 'pending',
+                                            worker_id=self.worker_id)
+                    self.current_task = None
+                    logger.error(f"❌ Worker {self.worker_id} cannot start a session: {e}")
+                    exit_code = EXIT_LOGIN_FAILED
+                    break
+
+                logger.info(f"📋 Worker {self.worker_id} processing task {task.id}: {task.query}")
+                if await scraper.run_task(task):
+                    self.completed += 1
+                elif scraper.session_valid:
+                    self.failed += 1
+                # Otherwise the task was given back on a login redirect; the next claim logs in again
+                processed += 1
+                self.current_task = None
+                await self._beat('running')
+        finally:
+            if self.current_task is not None:
+                await asyncio.to_thread(self.db.update_task_status, self.current_task.id, 'pending',
+                                        worker_id=self.worker_id)
+                self.current_task = None
+            await self._close_session()
+            await pool.close()
+            heartbeat.cancel()
+            await self._beat('stopped')
+
+        logger.info(f"👷 Worker {self.worker_id} stopped: {self.completed} completed, {self.failed} failed")
+        return exit_code
+
+
+@dataclass
+class WorkerSlot:
+    """One supervised worker process and its restart state"""
+    worker_id: str
+    process: Optional[subprocess.Popen] = None
+    started_at: float = 0.0
+    restarts: int = 0
+    next_start: float = 0.0
+    finished: bool = False
+
+
+class WorkerSupervisor:
+    """Runs `count` worker processes, restarting crashed or hung ones
+
+    A worker that exits with a non-zero code, or whose heartbeat is older
+    than WORKER_HEARTBEAT_TIMEOUT, has its running task returned to the
+    queue and is restarted after an exponential backoff (capped at
+    WORKER_RESTART_BACKOFF_MAX, reset once a worker stays up for a minute).
+    A worker that exits cleanly is not restarted. SIGTERM or SIGINT is
+    forwarded to every worker so they drain, and workers still running
+    after WORKER_DRAIN_TIMEOUT are killed.
+    """
+
+    STABLE_AFTER = 60.0
+
+    def __init__(self, count: Optional[int] = None, db: Optional[TwitterDatabase] = None,
+                 worker_args: Optional[List[str]] = None):
+        self.settings = TwitterConfig.get_worker_settings()
+        self.count = max(1, count or self.settings['workers'])
+        self.db = db or TwitterDatabase()
+        self.worker_args = worker_args or []
+        host = socket.gethostname()
+        self.slots = [WorkerSlot(f"{host}-w{index}") for index in range(self.count)]
+        self.draining = False
+
+    def _start(self, slot: WorkerSlot) -> None:
+        env = dict(os.environ)
+        env['PYTHONPATH'] = os.pathsep.join(filter(None, [SRC_DIR, env.get('PYTHONPATH')]))
+        slot.process = subprocess.Popen(
+            [sys.executable, '-m', 'twitter.worker', '--id', slot.worker_id, *self.worker_args], env=env
+        )
+        slot.started_at = time.monotonic()
+        logger.info(f"▶️ Started worker {slot.worker_id} (pid {slot.process.pid})")
+
+    def _reap(self, slot: WorkerSlot, reason: str) -> None:
+        """Return a dead worker's task to the queue and schedule its restart"""
+        requeued = self.db.requeue_running(slot.worker_id)
+        if time.monotonic() - slot.started_at >= self.STABLE_AFTER:
+            slot.restarts = 0
+        backoff = min(self.settings['restart_backoff_max'], 2 ** slot.restarts)
+        slot.restarts += 1
+        slot.next_start = time.monotonic() + backoff
+        slot.process = None
+        logger.warning(f"⚠️ Worker {slot.worker_id} {reason}; requeued {requeued} task(s), "
+                       f"restarting in {backoff:.0f}s")
+
+    def _heartbeat_ages(self) -> Dict[str, float]:
+        try:
+            return {worker.worker_id: worker.heartbeat_age() for worker in self.db.get_workers()}
+        except Exception as e:
+            logger.debug(f"Heartbeats unavailable: {e}")
+            return {}
+
+    def _check(self) -> None:
+        ages = self._heartbeat_ages()
+        now = time.monotonic()
+        for slot in self.slots:
+            if slot.finished:
+                continue
+            if slot.process is None:
+                if now >= slot.next_start:
+                    self._start(slot)
+                continue
+            code = slot.process.poll()
+            if code == EXIT_OK:
+                logger.info(f"⏹️ Worker {slot.worker_id} finished")
+                slot.finished = True
+                slot.process = None
+            elif code is not None:
+                self._reap(slot, f"exited with code {code}")
+            elif now - slot.started_at > self.settings['heartbeat_timeout'] and \
+                    ages.get(slot.worker_id, 0.0) > self.settings['heartbeat_timeout']:
+                slot.process.kill()
+                slot.process.wait()
+                self._reap(slot, f"missed heartbeats for {ages[slot.worker_id]:.0f}s")
+
+    def request_drain(self, *_) -> None:
+        if self.draining:
+            return
+        self.draining = True
+        running = [slot for slot in self.slots if slot.process is not None and slot.process.poll() is None]
+        if running:
+            logger.info(f"🛑 Supervisor draining {len(running)} workers")
+        for slot in running:
+            slot.process.send_signal(signal.SIGTERM)
+
+    def _drain(self) -> None:
+        deadline = time.monotonic() + self.settings['drain_timeout']
+        for slot in self.slots:
+            if slot.process is None:
+                continue
+            try:
+                slot.process.wait(timeout=max(0.0, deadline - time.monotonic()))
+            except subprocess.TimeoutExpired:
+                logger.warning(f"⚠️ Worker {slot.worker_id} did not drain in time, killing it")
+                slot.process.kill()
+                slot.process.wait()
+            self.db.requeue_running(slot.worker_id)
+            slot.process = None
+
+    def run(self) -> int:
+        """Supervise until every worker finished or a drain completes"""
+        signal.signal(signal.SIGTERM, self.request_drain)
+        signal.signal(signal.SIGINT, self.request_drain)
+        logger.info(f"🧑‍✈️ Supervising {self.count} workers")
+        try:
+            while not self.draining and not all(slot.finished for slot in self.slots):
+                self._check()
+                time.sleep(1.0)
+        finally:
+            self.request_drain()
+            self._drain()
+        logger.info("🧑‍✈️ All workers stopped")
+        return EXIT_OK
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Scrape queued tasks from the shared task queue")
+    parser.add_argument('--supervise', type=int, nargs='?', const=0, metavar='K',
+                        help="run K worker processes under a supervisor (default WORKER_COUNT)")
+    parser.add_argument('--id', dest='worker_id', help="worker id recorded on claimed tasks")
+    parser.add_argument('--max-tasks', type=int, help="exit after this many tasks")
+    parser.add_argument('--exit-when-empty', action='store_true', help="exit once the queue is empty")
+    args = parser.parse_args(argv)
+
+    if args.supervise is not None:
+        worker_args = []
+        if args.max_tasks is not None:
+            worker_args += ['--max-tasks', str(args.max_tasks)]
+        if args.exit_when_empty:
+            worker_args.append('--exit-when-empty')
+        return WorkerSupervisor(args.supervise or None, worker_args=worker_args).run()
+
+    worker = QueueWorker(args.worker_id, max_tasks=args.max_tasks, exit_when_empty=args.exit_when_empty)
+    return asyncio.run(worker.run())
+
+
+if __name__ == '__main__':
+    sys.exit(main())
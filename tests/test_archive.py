@@ -0,0 +1,50 @@
+import os
+
+import pytest
+
+from twitter import archive as archive_module
+from twitter.archive import HtmlArchive, available_codec, parse_capture_filename
+
+
+def test_identical_payloads_share_one_blob(tmp_path):
+    archive = HtmlArchive(root=str(tmp_path), codec='gzip')
+    first = archive.put('<html>same</html>', 'q1', '2024-05-13T10:00:00')
+    second = archive.put('<html>same</html>', 'q2', '2024-05-13T11:00:00')
+    other = archive.put(b'<html>other</html>', 'q1', '2024-05-13T12:00:00')
+
+    assert first.hash == second.hash and (first.pack, first.offset) == (second.pack, second.offset)
+    assert archive.read(second) == '<html>same</html>'
+    assert other.read_bytes() == b'<html>other</html>'
+    stats = archive.stats()
+    assert (stats['captures'], stats['blobs']) == (3, 2)
+    # Only the latest capture of each payload is processed
+    assert [entry.id for entry in archive.find(unique=True)] == [second.id, other.id]
+    assert [entry.id for entry in archive.find(query='q1', since='2024-05-13T11:00:00')] == [other.id]
+
+
+def test_packs_roll_over_at_the_size_limit(tmp_path):
+    archive = HtmlArchive(root=str(tmp_path), codec='gzip', pack_size_limit=64)
+    entries = [archive.put(os.urandom(100), 'q', f"2024-05-13T10:00:0{i}") for i in range(3)]
+
+    assert [os.path.basename(entry.pack) for entry in entries] == [
+        'pack-00001.bin', 'pack-00002.bin', 'pack-00003.bin']
+    for entry in entries:
+        assert archive.get_entry(entry.id).read_bytes() == entry.read_bytes()
+
+
+def test_gzip_is_used_when_zstandard_is_missing(tmp_path, monkeypatch):
+    monkeypatch.setattr(archive_module, 'zstandard', None)
+    assert available_codec('zstd') == 'gzip'
+    with pytest.raises(ValueError):
+        available_codec('lz4')
+
+    archive = HtmlArchive(root=str(tmp_path), codec='zstd')
+    entry = archive.put('<html>fallback</html>', 'q')
+    assert archive.codec == entry.codec == 'gzip'
+    assert archive.read(entry) == '<html>fallback</html>'
+
+
+def test_capture_filenames_give_query_and_time(tmp_path):
+    path = tmp_path / 'twitter_search_free_speech_20240513_101500.html'
+    path.write_text('')
+    assert parse_capture_filename(str(path)) == ('free speech', '2024-05-13T10:15:00')
@@ -0,0 +1,74 @@
+import asyncio
+
+import pytest
+
+from twitter.browser_pool import BrowserPool, PooledBrowser
+
+
+class FakeBrowser:
+    def __init__(self):
+        self.closed = False
+
+    def is_connected(self):
+        return not self.closed
+
+    async def close(self):
+        self.closed = True
+
+
+def test_close_during_launch_closes_the_new_browser():
+    async def scenario():
+        pool = BrowserPool(headless=True, size=1, close_timeout=0.1)
+        launching = asyncio.Event()
+        finish = asyncio.Event()
+        browser = FakeBrowser()
+
+        async def launch():
+            launching.set()
+            await finish.wait()
+            return PooledBrowser(browser, 1)
+
+        pool._launch = launch
+        lease = asyncio.ensure_future(pool.acquire())
+        await launching.wait()
+        await pool.close()
+        finish.set()
+        with pytest.raises(RuntimeError, match="closed"):
+            await lease
+        return browser, pool
+
+    browser, pool = asyncio.run(scenario())
+    assert browser.closed
+    assert pool.info()['browsers'] == []
+
+
+def test_concurrent_launches_start_one_driver(monkeypatch):
+    starts = []
+
+    class FakeChromium:
+        async def launch(self, **kwargs):
+            return FakeBrowser()
+
+    class FakeDriver:
+        chromium = FakeChromium()
+
+        async def stop(self):
+            pass
+
+    class FakeStarter:
+        async def start(self):
+            starts.append(1)
+            await asyncio.sleep(0.01)
+            return FakeDriver()
+
+    monkeypatch.setattr('twitter.browser_pool.async_playwright', FakeStarter)
+
+    async def scenario():
+        pool = BrowserPool(headless=True, size=3, close_timeout=0.1)
+        leases = await asyncio.gather(*(pool.acquire() for _ in range(3)))
+        await pool.close()
+        return leases
+
+    leases = asyncio.run(scenario())
+    assert len(leases) == 3
+    assert len(starts) == 1
@@ -0,0 +1,72 @@
+import numpy as np
+import pytest
+
+from twitter.coordination import CoordinationDetector, HASHTAG, TEXT, extract_hashtags
+from twitter.extractor import TweetRecord
+
+START = 1_715_594_400.0  # 2024-05-13T10:00:00Z
+
+
+def detector(**overrides):
+    settings = dict(window_seconds=600, bucket_seconds=60, min_authors=5, max_keys=100,
+                    registers=64, min_text_chars=20)
+    settings.update(overrides)
+    return CoordinationDetector(**settings)
+
+
+def test_distinct_author_estimate_is_close_at_small_counts():
+    counter = detector()
+    for n in (5, 20, 60):
+        registers = np.zeros(counter.registers, dtype=np.uint8)
+        for i in range(n):
+            index, rank = counter._author_register(f"account{n}_{i}")
+            registers[index] = max(registers[index], rank)
+        assert counter._estimate(registers) == pytest.approx(n, rel=0.2)
+
+
+def test_burst_needs_distinct_authors_inside_the_window():
+    counter = detector()
+    # One account repeating itself never counts as coordination
+    assert all(counter.observe(HASHTAG, '#tag', 'solo', START + i) is None for i in range(20))
+
+    events = [counter.observe(HASHTAG, '#other', f"account{i}", START + i * 200) for i in range(8)]
+    # 200s apart, so a 600s window never holds more than four of them
+    assert events == [None] * 8
+
+    # 'solo' is the first distinct author, so the fourth new account crosses the threshold
+    events = [counter.observe(HASHTAG, '#tag', f"account{i}", START + 30 + i) for i in range(4)]
+    assert events[:3] == [None] * 3
+    assert events[3].authors == 5 and events[3].posts == 24
+    assert events[3].window_start == '2024-05-13T10:00:00+00:00'
+
+
+def test_alerts_repeat_only_when_authors_double_or_the_window_moves_on():
+    counter = detector()
+    raised = [counter.observe(HASHTAG, '#tag', f"account{i}", START + i) for i in range(12)]
+    alerts = [event for event in raised if event]
+    assert len(alerts) == 2
+    assert alerts[0].authors == 5 and alerts[1].authors >= 10
+
+    later = [counter.observe(HASHTAG, '#tag', f"late{i}", START + 1200 + i) for i in range(5)]
+    assert later[4] is not None and later[4].authors == 5
+
+
+def test_posts_older_than_the_window_are_dropped():
+    counter = detector()
+    counter.observe(HASHTAG, '#tag', 'a', START + 3600)
+    assert counter.observe(HASHTAG, '#tag', 'b', START) is None
+    assert counter.stats()['late'] == 1
+
+
+def test_records_feed_hashtag_and_text_keys_and_old_keys_are_evicted():
+    counter = detector(max_keys=2)
+    text = 'Copy and paste this exact message everywhere #Campaign'
+    records = [TweetRecord(tweet_id=str(i), author=f"account{i}", timestamp='2024-05-13T10:00:00.000Z',
+                           text=text) for i in range(5)]
+
+    events = counter.add(records)
+    assert sorted(event.kind for event in events) == [HASHTAG, TEXT]
+    assert extract_hashtags(text) == ['campaign']
+
+    counter.observe(HASHTAG, '#new', 'a', START)
+    assert counter.stats()['keys'] == 2 and counter.evicted == 1
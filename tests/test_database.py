@@ -0,0 +1,46 @@
+from datetime import datetime, timedelta
+
+from twitter.database import TwitterDatabase
+
+
+def test_abandoned_claim_is_released_for_requeue(tmp_path):
+    db = TwitterDatabase(db_path=str(tmp_path / 'queue.db'), claim_timeout=60)
+    db.add_task('example query')
+    task = db.claim_next_task(worker_id='gui')
+    # Nothing heartbeats for the GUI, so its claim only ages
+    with db._connect() as conn:
+        conn.execute("UPDATE tasks SET started_at = ? WHERE id = ?",
+                     ((datetime.now() - timedelta(minutes=5)).isoformat(), task.id))
+
+    assert db.add_task('example query') is None
+    reclaimed = db.claim_next_task(worker_id='cli')
+    assert reclaimed.id == task.id
+    assert reclaimed.attempts == 2
+
+
+def test_claims_of_live_workers_are_kept(tmp_path):
+    db = TwitterDatabase(db_path=str(tmp_path / 'queue.db'), claim_timeout=60)
+    db.add_task('example query')
+    task = db.claim_next_task(worker_id='worker-1')
+    db.heartbeat('worker-1', 'busy', current_task=task.id)
+    with db._connect() as conn:
+        conn.execute("UPDATE tasks SET started_at = ? WHERE id = ?",
+                     ((datetime.now() - timedelta(minutes=5)).isoformat(), task.id))
+
+    assert db.claim_next_task(worker_id='cli') is None
+
+
+def test_stale_owner_cannot_finish_a_reclaimed_task(tmp_path):
+    db = TwitterDatabase(db_path=str(tmp_path / 'queue.db'), claim_timeout=60)
+    db.add_task('example query')
+    first = db.claim_next_task(worker_id='gui')
+    with db._connect() as conn:
+        conn.execute("UPDATE tasks SET started_at = ? WHERE id = ?",
+                     ((datetime.now() - timedelta(minutes=5)).isoformat(), first.id))
+    second = db.claim_next_task(worker_id='cli')
+
+    assert db.update_task_status(first.id, 'failed', None, 'timed out', worker_id='gui') == 0
+    assert db.update_task_status(first.id, 'pending', worker_id='gui') == 0
+    assert db.get_task(first.id).status == 'running'
+    assert db.update_task_status(second.id, 'completed', 'result.json', worker_id='cli') == 1
+    assert db.get_task(second.id).status == 'completed'
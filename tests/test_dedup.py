@@ -0,0 +1,50 @@
+from twitter.dedup import BloomFilter, TweetDedupIndex, tweet_key, NEW, DUPLICATE, CHANGED
+from twitter.extractor import TweetRecord
+
+
+def tweet(tweet_id, text='Some post', author='someone', likes=0):
+    return TweetRecord(tweet_id=tweet_id, author=author, timestamp='2024-05-13T10:00:00.000Z',
+                       text=text, like_count=likes)
+
+
+def test_bloom_filter_has_no_false_negatives_and_few_false_positives():
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+    for key in range(1000):
+        bloom.add(key)
+
+    assert all(key in bloom for key in range(1000))
+    false_positives = sum(key in bloom for key in range(10_000, 20_000))
+    assert false_positives < 300
+
+
+def test_tweet_key_keeps_numeric_ids_and_hashes_others_negative():
+    assert tweet_key('1790000000000000000') == 1790000000000000000
+    assert tweet_key('abc') == tweet_key('abc') < 0
+    assert tweet_key('99999999999999999999') < 0
+
+
+def test_records_are_new_then_duplicate_or_changed(tmp_path):
+    with TweetDedupIndex(db_path=str(tmp_path / 'dedup.db'), bloom_capacity=100) as index:
+        assert index.record([tweet('1'), tweet('2')], 'q1', '2024-05-13T10:00:00') == [NEW, NEW]
+        # Engagement counts and whitespace/case do not make a tweet changed; new text does
+        assert index.record([tweet('1', text='  SOME   post', likes=50), tweet('2', text='Edited post')],
+                            'q2', '2024-05-13T11:00:00') == [DUPLICATE, CHANGED]
+        # Repeats inside one batch are caught before they reach the table
+        assert index.record([tweet('3'), tweet('3')]) == [NEW, DUPLICATE]
+
+        assert index.count() == 3
+        assert index.info('1') == {'first_seen': '2024-05-13T10:00:00', 'last_seen': '2024-05-13T11:00:00',
+                                   'seen_count': 2, 'queries': ['q1', 'q2']}
+        assert index.info('404') is None
+
+
+def test_known_tweets_survive_a_reopen(tmp_path):
+    path = str(tmp_path / 'dedup.db')
+    with TweetDedupIndex(db_path=path, bloom_capacity=100) as index:
+        index.record([tweet('1')])
+
+    with TweetDedupIndex(db_path=path, bloom_capacity=100) as index:
+        assert index.check(tweet('1')) == DUPLICATE
+        fresh, duplicates = index.filter_new([tweet('1'), tweet('2')])
+    assert [record.tweet_id for record in fresh] == ['2']
+    assert duplicates == 1
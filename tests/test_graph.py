@@ -0,0 +1,77 @@
+import numpy as np
+import pytest
+
+from twitter.extractor import TweetRecord
+from twitter.graph import GraphSnapshot, InteractionGraph, record_edges, MENTION, REPLY, RETWEET, IN, OUT
+
+
+def snapshot(edges, size):
+    src, dst, weights = (np.array(column) for column in zip(*edges))
+    return GraphSnapshot(np.arange(100, 100 + size), src.astype(np.int64), dst.astype(np.int64),
+                         weights.astype(np.float64))
+
+
+# A cycle 0 -> 1 -> 2 -> 0 fed by 3 (weight 2), a pair 5 -> 4 and a mutual pair 6 <-> 7
+EDGES = [(0, 1, 1), (1, 2, 1), (2, 0, 1), (3, 2, 2), (5, 4, 1), (6, 7, 1), (7, 6, 1)]
+
+
+def test_csr_adjacency_matches_the_edge_list():
+    graph = snapshot(EDGES, 8)
+
+    assert graph.neighbors(2, OUT).tolist() == [0]
+    assert graph.neighbors(2, IN).tolist() == [1, 3]
+    assert graph.neighbors(np.array([0, 5])).tolist() == [1, 2, 4]
+    assert graph.k_hop(3, 2, OUT) == {3: 0, 2: 1, 0: 2}
+    assert graph.k_hop(0, 5) == {0: 0, 1: 1, 2: 1, 3: 2}
+    assert graph.degree(IN).tolist() == [1, 1, 3, 0, 1, 0, 1, 1]
+    assert graph.degree(OUT, weighted=False).tolist() == [1, 1, 1, 1, 0, 1, 1, 1]
+    assert graph.index_of(103) == 3 and graph.index_of(999) is None
+
+
+def test_pagerank_matches_a_dense_power_iteration():
+    graph = snapshot(EDGES, 8)
+    n, damping = 8, 0.85
+    matrix = np.zeros((n, n))
+    for src, dst, weight in EDGES:
+        matrix[dst, src] += weight
+    out_weight = matrix.sum(axis=0)
+    dangling = out_weight == 0
+    matrix[:, ~dangling] /= out_weight[~dangling]
+    rank = np.full(n, 1.0 / n)
+    for _ in range(200):
+        rank = damping * (matrix @ rank + rank[dangling].sum() / n) + (1 - damping) / n
+
+    result = graph.pagerank(damping, tol=1e-12, max_iter=200)
+    np.testing.assert_allclose(result, rank, atol=1e-9)
+    assert result.sum() == pytest.approx(1.0)
+
+
+def test_components_label_each_node_with_its_smallest_member():
+    assert snapshot(EDGES, 8).components().tolist() == [0, 0, 0, 0, 4, 4, 6, 6]
+    # A long chain needs the pointer jumping to settle in a few rounds
+    chain = snapshot([(i + 1, i, 1) for i in range(199)], 200)
+    assert set(chain.components().tolist()) == {0}
+
+
+def test_interaction_graph_ranks_and_groups_accounts(tmp_path):
+    records = [
+        TweetRecord(tweet_id='1', author='origin', timestamp='2024-05-13T10:00:00.000Z', text='post',
+                    retweeted_by=f"amp{i}")
+        for i in range(3)
+    ] + [
+        TweetRecord(tweet_id='2', author='Origin', timestamp='2024-05-13T11:00:00.000Z', text='@amp0 thanks',
+                    mentions=['amp0', 'origin'], in_reply_to='amp1'),
+        TweetRecord(tweet_id='3', author='loner', timestamp='2024-05-13T11:00:00.000Z', text='@friend hi',
+                    mentions=['friend']),
+    ]
+    assert record_edges(records[3]) == [('Origin', 'amp0', MENTION), ('Origin', 'amp1', REPLY)]
+    assert record_edges(records[0]) == [('amp0', 'origin', RETWEET)]
+
+    with InteractionGraph(db_path=str(tmp_path / 'graph.db')) as graph:
+        assert graph.add(records) == 6
+        assert graph.rank('in_degree', limit=1) == [('origin', 3.0)]
+        assert graph.rank(limit=1)[0][0] == 'origin'
+        assert graph.components(min_size=2) == [['amp0', 'amp1', 'amp2', 'origin'], ['friend', 'loner']]
+        assert graph.k_hop('amp2', k=2, direction=OUT) == {'amp2': 0, 'origin': 1, 'amp0': 2, 'amp1': 2}
+        with pytest.raises(ValueError):
+            graph.rank('closeness')
@@ -0,0 +1,87 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from twitter.influence import InfluenceScorer, rank_window, _REBASE_HALF_LIVES
+
+WEIGHTS = {'views': 0.1, 'forwards': 0.4, 'replies': 0.2, 'reactions': 0.3}
+COLUMNS = ['view_count', 'retweet_count', 'reply_count', 'like_count']
+START = pd.Timestamp('2024-05-13T00:00:00Z')
+
+
+def frame(rows):
+    """rows of (tweet_id, author, hours after START, views, retweets, replies, likes)"""
+    data = pd.DataFrame(rows, columns=['tweet_id', 'author', 'hours', *COLUMNS])
+    data['timestamp'] = START + pd.to_timedelta(data.pop('hours'), unit='h')
+    return data
+
+
+def expected_author_scores(rows, half_life_hours):
+    """The influence formula evaluated directly over the tweets in the window"""
+    data = pd.DataFrame(rows, columns=['tweet_id', 'author', 'hours', *COLUMNS])
+    maxima = data[COLUMNS].max().to_numpy(dtype=float)
+    normalizers = np.divide(list(WEIGHTS.values()), maxima, out=np.zeros(4), where=maxima > 0)
+    decay = 0.5 ** ((data['hours'].max() - data['hours']) / half_life_hours)
+    data['score'] = data[COLUMNS].to_numpy(dtype=float) @ normalizers * decay
+    return data.groupby('author')['score'].sum().to_dict()
+
+
+def scores_of(scorer):
+    return dict(zip(*scorer.author_scores()[['author', 'score']].to_numpy().T))
+
+
+def test_author_scores_match_the_formula():
+    rows = [('1', 'alice', 0, 1000, 10, 5, 50), ('2', 'alice', 6, 200, 0, 1, 10),
+            ('3', 'bob', 12, 5000, 40, 0, 300), ('4', 'carol', 12, 0, 0, 0, 0)]
+    scorer = InfluenceScorer(WEIGHTS, half_life_hours=6, window_hours=0)
+    scorer.update(frame(rows))
+
+    result = scores_of(scorer)
+    for author, score in expected_author_scores(rows, 6).items():
+        assert result[author] == pytest.approx(score)
+    assert scorer.author_scores()['author'].tolist()[0] == 'bob'
+    assert rank_window(frame(rows), WEIGHTS, half_life_hours=6)['score'].tolist() == pytest.approx(
+        scorer.author_scores()['score'].tolist())
+
+
+def test_tweets_leave_the_window_and_their_rows_are_reused():
+    scorer = InfluenceScorer(WEIGHTS, half_life_hours=6, window_hours=24)
+    scorer.update(frame([(str(i), 'early', i * 0.1, 100, 1, 1, 1) for i in range(10)]))
+    later = [(str(100 + i), 'late', 30 + i * 0.1, 10, 0, 0, 5) for i in range(10)]
+    scorer.update(frame(later[:5]))
+    assert len(scorer) == 5
+    high_water = scorer._size
+
+    scorer.update(frame(later[5:]))
+    assert len(scorer) == 10
+    assert scorer._size == high_water
+    assert scorer.author_scores()['author'].tolist() == ['late']
+    assert scores_of(scorer)['late'] == pytest.approx(expected_author_scores(later, 6)['late'])
+    # Tweets already older than the window are never added
+    assert scorer.update(frame([('999', 'stale', 1, 10 ** 6, 0, 0, 0)])) == 0
+
+
+def test_recapture_replaces_counts_and_moves_expiry():
+    scorer = InfluenceScorer(WEIGHTS, half_life_hours=6, window_hours=10)
+    scorer.update(frame([('1', 'alice', 0, 100, 0, 0, 0), ('2', 'bob', 0, 100, 0, 0, 0)]))
+    scorer.update(frame([('1', 'alice', 8, 300, 0, 0, 0)]))
+    assert scorer.tweet_scores()['tweet_id'].tolist() == ['1', '2']
+
+    # Tweet 1's new timestamp keeps it alive once tweet 2 expires
+    scorer.update(frame([('3', 'carol', 12, 1, 0, 0, 0)]))
+    assert sorted(scorer.tweet_scores()['tweet_id']) == ['1', '3']
+    assert scorer.author_scores().set_index('author')['tweets'].to_dict() == {'alice': 1, 'carol': 1}
+
+
+def test_rebase_keeps_scores_finite_over_long_spans():
+    scorer = InfluenceScorer(WEIGHTS, half_life_hours=1, window_hours=0)
+    scorer.update(frame([('1', 'old', 0, 100, 1, 1, 1)]))
+    epoch = scorer._epoch
+    recent = [('2', 'new', _REBASE_HALF_LIVES + 100, 100, 1, 1, 1),
+              ('3', 'new', _REBASE_HALF_LIVES + 99, 50, 0, 0, 1)]
+    scorer.update(frame(recent))
+
+    assert scorer._epoch > epoch
+    assert np.isfinite(scorer._totals).all()
+    assert scores_of(scorer)['new'] == pytest.approx(expected_author_scores(recent, 1)['new'])
+    assert scores_of(scorer)['old'] == pytest.approx(0.0, abs=1e-12)
@@ -0,0 +1,36 @@
+import json
+
+from twitter.metrics import ScraperMetrics
+
+
+def test_render_and_write_jsonl(tmp_path):
+    path = tmp_path / 'metrics' / 'scraper.jsonl'
+    metrics = ScraperMetrics('jsonl', str(path))
+    assert metrics.render() is None
+
+    metrics.observe_seconds('navigation', 0.4)
+    metrics.count_retries('navigation', 2)
+    metrics.write(metrics.render())
+
+    snapshot = json.loads(path.read_text())
+    assert snapshot['histograms'][0]['labels'] == {'stage': 'navigation'}
+    assert snapshot['counters'][0]['value'] == 2
+
+
+def test_prometheus_text_has_histogram_and_counter_series(tmp_path):
+    metrics = ScraperMetrics('prometheus', str(tmp_path / 'scraper.prom'))
+    metrics.observe_seconds('navigation', 0.4)
+    metrics.count_retries('navigation', 1)
+    metrics.flush()
+
+    text = (tmp_path / 'scraper.prom').read_text()
+    assert '# TYPE twitter_scraper_stage_seconds histogram' in text
+    assert 'twitter_scraper_retries_total{stage="navigation"} 1' in text
+
+
+def test_write_failures_are_not_raised(tmp_path):
+    blocker = tmp_path / 'not_a_directory'
+    blocker.write_text('')
+    metrics = ScraperMetrics('jsonl', str(blocker / 'scraper.jsonl'))
+    metrics.observe_seconds('navigation', 0.4)
+    metrics.flush()
@@ -0,0 +1,77 @@
+import pytest
+
+from twitter.dedup import TweetDedupIndex
+from twitter.extractor import TweetRecord
+from twitter.graph import InteractionGraph
+from twitter.influence import InfluenceScorer
+from twitter import processor
+from twitter.archive import HtmlArchive
+from twitter.pipeline import IngestPipeline, INGEST_CHECKPOINT
+from twitter.processor import BatchProcessor, FileResult
+
+
+def retweet(retweeter):
+    return TweetRecord(tweet_id='100', author='origin', timestamp='2024-05-13T10:00:00.000Z',
+                       text='Original post text', retweeted_by=retweeter)
+
+
+def test_retweets_of_one_post_reach_the_graph(tmp_path):
+    dedup = TweetDedupIndex(db_path=str(tmp_path / 'dedup.db'))
+    graph = InteractionGraph(db_path=str(tmp_path / 'graph.db'))
+    fresh = []
+    pipeline = IngestPipeline(dedup=dedup)
+    pipeline.add_consumer(lambda records, query, captured_at: fresh.extend(records))
+    pipeline.add_consumer(graph.consume, include_duplicates=True)
+
+    stats = pipeline.ingest_records([retweet('amp1')], 'q', '2024-05-13T10:05:00+00:00')
+    pipeline.ingest_records([retweet('amp2')], 'q', '2024-05-13T10:06:00+00:00', stats)
+
+    assert stats.duplicates == 1
+    assert [record.retweeted_by for record in fresh] == ['amp1']
+    assert graph.neighbors('origin', direction='in', kinds=['retweet']) == [('amp1', 1), ('amp2', 1)]
+    dedup.close()
+    graph.close()
+
+
+def test_recaptured_counts_reach_the_influence_scorer(tmp_path):
+    dedup = TweetDedupIndex(db_path=str(tmp_path / 'dedup.db'))
+    influence = InfluenceScorer(window_hours=0)
+    pipeline = IngestPipeline(dedup=dedup)
+    pipeline.add_consumer(influence.consume, include_duplicates=True)
+
+    steady = TweetRecord(tweet_id='300', author='steady', timestamp='2024-05-13T10:00:00.000Z',
+                         text='Another post', like_count=100)
+    for likes in (1, 50, 500):
+        rising = TweetRecord(tweet_id='200', author='rising', timestamp='2024-05-13T10:00:00.000Z',
+                             text='Original post text', like_count=likes)
+        pipeline.ingest_records([rising, steady], 'q', '2024-05-13T11:00:00+00:00')
+
+    scores = influence.tweet_scores()
+    assert len(influence) == 2
+    assert scores['tweet_id'].tolist() == ['200', '300']
+    assert scores['score'].tolist() == pytest.approx([0.25, 0.05])
+    dedup.close()
+
+
+def test_checkpoint_skips_ingested_captures_and_stops_at_failures(tmp_path, monkeypatch):
+    archive = HtmlArchive(root=str(tmp_path / 'archive'))
+    first = archive.put('<html>one</html>', 'q', '2024-05-13T10:00:00')
+    pipeline = IngestPipeline(BatchProcessor(workers=1), archive=archive)
+    html_dir = str(tmp_path / 'loose')
+
+    pipeline.run(pipeline.find_new_captures(html_dir), checkpoint=INGEST_CHECKPOINT)
+    assert archive.get_checkpoint(INGEST_CHECKPOINT) == first.id
+    assert pipeline.find_new_captures(html_dir) == []
+
+    # Captures imported later count as new even when they were taken earlier
+    broken = archive.put('<html>two</html>', 'q', '2024-05-12T09:00:00')
+    later = archive.put('<html>three</html>', 'q', '2024-05-13T11:00:00')
+    extract = processor._process_file
+    monkeypatch.setattr(processor, '_process_file', lambda capture, extractor=None: (
+        FileResult(path=capture.label, error='boom', capture_id=capture.id)
+        if capture.id == broken.id else extract(capture, extractor)))
+
+    stats = pipeline.run(pipeline.find_new_captures(html_dir), checkpoint=INGEST_CHECKPOINT)
+    assert stats.failed_captures == [broken.id]
+    assert archive.get_checkpoint(INGEST_CHECKPOINT) == broken.id - 1
+    assert [capture.id for capture in pipeline.find_new_captures(html_dir)] == [broken.id, later.id]
@@ -0,0 +1,27 @@
+import os
+import multiprocessing
+
+import pytest
+
+from twitter import processor
+from twitter.processor import BatchProcessor, FileResult
+
+pytestmark = pytest.mark.skipif(multiprocessing.get_start_method() != 'fork',
+                                reason="workers must inherit the patched extraction function")
+
+
+def _extract_or_crash(capture, extractor=None):
+    if 'crash' in capture:
+        os._exit(1)
+    return FileResult(path=capture)
+
+
+def test_worker_crash_fails_only_the_crashing_capture(monkeypatch):
+    monkeypatch.setattr(processor, '_process_file', _extract_or_crash)
+    captures = [f"capture_{i:02d}.html" for i in range(40)]
+    captures[13] = 'capture_crash.html'
+
+    results = list(BatchProcessor(workers=2, chunk_size=4).iter_results(captures))
+
+    assert sorted(result.path for result in results) == sorted(captures)
+    assert [result.path for result in results if not result.ok] == ['capture_crash.html']
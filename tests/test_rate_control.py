@@ -0,0 +1,112 @@
+import asyncio
+
+import pytest
+
+from twitter import rate_control
+from twitter.rate_control import (RateController, classify_status, classify_error,
+                                  SUCCESS, ERROR, TIMEOUT, RATE_LIMITED)
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(rate_control, 'time', clock)
+    real_sleep = asyncio.sleep
+
+    async def sleep(seconds):
+        clock.now += seconds
+        await real_sleep(0)
+    monkeypatch.setattr(rate_control.asyncio, 'sleep', sleep)
+    return clock
+
+
+def controller(**overrides):
+    settings = dict(rate=10, min_rate=1, max_rate=20, burst=2, increase=1, decrease=0.5,
+                    cooldown=30, jitter=0, retry_base=1, retry_max=8, window=60)
+    settings.update(overrides)
+    return RateController(**settings)
+
+
+def test_rate_rises_additively_and_falls_multiplicatively_once_per_cooldown(clock):
+    rate = controller()
+    for _ in range(15):
+        rate.record_success()
+    assert rate.rate == 20
+
+    rate.record_failure(TIMEOUT)
+    rate.record_failure(ERROR)
+    assert rate.rate == 10
+    clock.now += 31
+    rate.record_failure()
+    assert rate.rate == 5
+    for _ in range(4):
+        clock.now += 31
+        rate.record_failure()
+    assert rate.rate == 1
+
+
+def test_tokens_pace_acquires_at_the_current_rate(clock):
+    rate = controller(rate=6)
+
+    async def acquire_three():
+        return [await rate.acquire() for _ in range(3)]
+
+    # One starting token, then one every 10 seconds at 6/min
+    assert asyncio.run(acquire_three()) == pytest.approx([0, 10, 10])
+    assert rate.waited == pytest.approx(20)
+
+
+def test_rate_limit_drops_banked_tokens(clock):
+    rate = controller(rate=6)
+    clock.now += 60
+    rate.record_failure(RATE_LIMITED)
+
+    assert rate.rate == 3
+    # A full interval at the reduced rate
+    assert asyncio.run(rate.acquire()) == pytest.approx(20)
+
+
+def test_retry_backs_off_with_capped_full_jitter(clock, monkeypatch):
+    monkeypatch.setattr(rate_control.random, 'uniform', lambda low, high: high)
+    rate = controller(cooldown=0)
+    calls = []
+
+    async def flaky():
+        calls.append(clock.now)
+        if len(calls) < 5:
+            raise TimeoutError("Timeout 30000ms exceeded")
+        return 'done'
+
+    assert asyncio.run(rate.retry(flaky, attempts=5)) == 'done'
+    assert [later - earlier for earlier, later in zip(calls, calls[1:])] == [1, 2, 4, 8]
+    assert rate.error_rate() == 1.0
+
+    async def broken():
+        raise RuntimeError("net::ERR_FAILED")
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(rate.retry(broken, attempts=2))
+
+
+def test_outcome_window_and_status_classification(clock):
+    rate = controller()
+    rate.record_failure()
+    clock.now += 45
+    rate.record_success()
+    assert rate.error_rate() == 0.5
+    clock.now += 30
+    assert rate.error_rate() == 0.0
+    assert rate.observed_rate() == 1.0
+
+    assert [classify_status(s) for s in (None, 200, 302, 429, 503)] == [
+        SUCCESS, SUCCESS, SUCCESS, RATE_LIMITED, ERROR]
+    assert classify_error(RuntimeError("Timeout 30000ms exceeded")) == TIMEOUT
+    assert classify_error(RuntimeError("net::ERR_FAILED")) == ERROR
@@ -0,0 +1,66 @@
+import json
+import os
+
+import numpy as np
+import pytest
+
+from twitter.scoring import KeywordTable, ThreatScorer
+
+TABLE = {
+    'categories': {
+        'violence': {'weight': 0.8, 'keywords': ['riot', 'attack now', 'हमला']},
+        'separatism': {'weight': 0.5, 'keywords': ['break away', 'riot'], 'patterns': [r'free\s+\w+stan']}
+    }
+}
+
+
+def scorer(data=TABLE):
+    return ThreatScorer(table=KeywordTable.from_dict(data))
+
+
+def test_scores_follow_category_weights_and_combine_independently():
+    scores = scorer().score_texts([
+        'We must ATTACK   now',
+        'a patriot march',
+        'Riot today, break away tomorrow',
+        None,
+        'free khalistan and हमलावर',
+    ])
+
+    assert scores.hits('violence').tolist() == [1, 0, 1, 0, 1]
+    assert scores.hits('separatism').tolist() == [0, 0, 2, 0, 1]
+    np.testing.assert_allclose(scores.category('violence'), [0.8, 0, 0.8, 0, 0.8])
+    # 1 - (1 - 0.8) * (1 - 0.5)
+    np.testing.assert_allclose(scores.threat_score, [0.8, 0, 0.9, 0, 0.9])
+    assert scores.flagged(0.85).tolist() == [2, 4]
+    with pytest.raises(KeyError):
+        scores.category('unknown')
+
+
+def test_texts_never_match_across_batch_boundaries():
+    scores = scorer().score_texts(['attack', 'now', 'plain text'])
+    assert scores.threat_score.tolist() == [0, 0, 0]
+
+
+def test_invalid_tables_are_rejected():
+    with pytest.raises(ValueError):
+        KeywordTable.from_dict({'categories': {'bad': {'weight': 1.5, 'keywords': ['x']}}})
+    with pytest.raises(ValueError):
+        KeywordTable.from_dict({'categories': {'bad': {'patterns': ['(group)']}}})
+
+
+def test_keyword_file_reloads_and_keeps_table_on_bad_edit(tmp_path):
+    path = tmp_path / 'keywords.json'
+    path.write_text(json.dumps(TABLE), encoding='utf-8')
+    threat = ThreatScorer(path=str(path), reload_interval=0)
+    assert threat.score_texts(['curfew']).threat_score.tolist() == [0]
+
+    path.write_text(json.dumps({'categories': {'unrest': {'weight': 0.6, 'keywords': ['curfew']}}}),
+                    encoding='utf-8')
+    os.utime(path, ns=(1, 1))
+    assert threat.score_texts(['curfew']).threat_score.tolist() == pytest.approx([0.6])
+
+    path.write_text('{not json', encoding='utf-8')
+    os.utime(path, ns=(2, 2))
+    assert threat.reload() is False
+    assert threat.score_texts(['curfew']).threat_score.tolist() == pytest.approx([0.6])
@@ -0,0 +1,17 @@
+from twitter.extractor import TweetRecord
+from twitter.similarity import NearDuplicateIndex
+
+TEXT = "Everyone should share this message about the election results right now"
+
+
+def test_cluster_keeps_the_first_post_as_its_origin(tmp_path):
+    index = NearDuplicateIndex(db_path=str(tmp_path / 'similarity.db'), min_authors=2)
+    index.add([TweetRecord(tweet_id='1', author='first', text=TEXT)], seen_at='2024-05-13T10:00:00')
+    clusters = index.add([TweetRecord(tweet_id='2', author='second', text=TEXT + '!!')],
+                         seen_at='2024-05-13T12:00:00')
+
+    assert len(clusters) == 1
+    assert clusters[0].first_seen == '2024-05-13T10:00:00'
+    assert clusters[0].last_seen == '2024-05-13T12:00:00'
+    assert clusters[0].sample_text == TEXT
+    index.close()
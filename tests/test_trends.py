@@ -0,0 +1,88 @@
+import random
+from collections import Counter
+
+from twitter.extractor import TweetRecord
+from twitter.trends import CountMinSketch, SpaceSaving, TrendTracker, record_terms
+
+HOUR = 3600.0
+START = 1_715_558_400.0  # 2024-05-13T00:00:00Z
+
+
+def zipf_stream(terms=2000, length=20000, seed=7):
+    rng = random.Random(seed)
+    weights = [1.0 / (rank + 1) for rank in range(terms)]
+    return rng.choices([f"#t{rank}" for rank in range(terms)], weights, k=length)
+
+
+def test_count_min_never_undercounts_and_stays_near_the_bound():
+    stream = zipf_stream()
+    sketch = CountMinSketch(width=512, depth=4)
+    for term in stream:
+        sketch.add(term)
+
+    truth = Counter(stream)
+    errors = [sketch.estimate(term) - count for term, count in truth.items()]
+    bound = len(stream) / 512 * 2.72
+    assert min(errors) >= 0
+    # Each estimate stays within e * total / width with probability 1 - e^-depth
+    assert sum(error <= bound for error in errors) / len(errors) >= 0.98
+
+
+def test_space_saving_keeps_every_heavy_hitter():
+    stream = zipf_stream()
+    summary = SpaceSaving(capacity=50)
+    for term in stream:
+        summary.add(term)
+
+    truth = Counter(stream)
+    assert len(summary.counts) == 50
+    heavy = {term for term, count in truth.items() if count > len(stream) / 50}
+    assert heavy <= set(summary.counts)
+    for term, upper, error in summary.top(10):
+        assert upper - error <= truth[term] <= upper
+
+
+def tracker(**overrides):
+    settings = dict(bucket_seconds=HOUR, baseline_buckets=4, width=256, depth=4, top_k=20,
+                    min_count=5, min_ratio=3.0)
+    settings.update(overrides)
+    return TrendTracker(**settings)
+
+
+def test_jump_against_the_baseline_is_emerging():
+    trends = tracker()
+    for hour in range(4):
+        for _ in range(3):
+            trends.observe('#steady', START + hour * HOUR)
+    for _ in range(30):
+        trends.observe('#breaking', START + 4 * HOUR + 60)
+    for _ in range(4):
+        trends.observe('#steady', START + 4 * HOUR + 60)
+
+    emerging = trends.emerging()
+    assert [trend.term for trend in emerging] == ['#breaking']
+    assert emerging[0].count == 30 and emerging[0].bucket_start == '2024-05-13T04:00:00+00:00'
+    assert trends.top(2) == [('#breaking', 30), ('#steady', 16)]
+
+
+def test_ring_recycles_old_buckets_and_drops_late_posts():
+    trends = tracker()
+    trends.observe('#old', START)
+    trends.observe('#new', START + 5 * HOUR)
+    assert trends.estimate('#old', bucket=int(START // HOUR)) == 0
+    assert trends.top() == [('#new', 1)]
+
+    trends.observe('#older', START - HOUR)
+    assert trends.late == 1
+
+
+def test_consume_reports_each_trend_once_per_bucket():
+    trends = tracker(min_count=3)
+    records = [TweetRecord(tweet_id=str(i), author=f"a{i}", timestamp='2024-05-13T10:00:00.000Z',
+                           text='#Rally now', mentions=['Leader']) for i in range(3)]
+    assert record_terms(records[0]) == ['#rally', '@leader']
+
+    first = trends.consume(records, 'q', None)
+    again = trends.consume(records, 'q', None)
+    assert sorted(trend.term for trend in first) == ['#rally', '@leader']
+    assert again == []
@@ -0,0 +1,53 @@
+import os
+
+from twitter.extractor import TweetRecord
+from twitter.tweet_store import ParquetTweetStore
+
+
+def tweet(tweet_id, author, timestamp):
+    return TweetRecord(tweet_id=tweet_id, author=author, timestamp=timestamp, text=f"post {tweet_id}",
+                       mentions=['someone'])
+
+
+def filled_store(tmp_path):
+    store = ParquetTweetStore(root=str(tmp_path))
+    store.append([tweet('1', 'alice', '2024-05-12T09:00:00.000Z')], 'free speech', '2024-05-12T10:00:00+00:00')
+    store.append([tweet('2', 'bob', '2024-05-13T09:00:00.000Z')], 'free speech', '2024-05-13T10:00:00+00:00')
+    store.append([tweet('3', 'alice', '2024-05-13T09:30:00.000Z'),
+                  tweet('4', 'carol', '2024-05-13T09:45:00.000Z')], '#news/live', '2024-05-13T11:00:00+00:00')
+    return store
+
+
+def fragment_dirs(store, **filters):
+    fragments = store.dataset().get_fragments(filter=store.build_filter(**filters))
+    return sorted(os.path.relpath(os.path.dirname(fragment.path), store.root) for fragment in fragments)
+
+
+def test_query_and_capture_date_filters_prune_partitions(tmp_path):
+    store = filled_store(tmp_path)
+
+    assert fragment_dirs(store, queries=['#news/live']) == [
+        os.path.join('capture_date=2024-05-13', 'query=%23news%2Flive')]
+    assert fragment_dirs(store, capture_start='2024-05-13T00:00:00+00:00', queries=['free speech']) == [
+        os.path.join('capture_date=2024-05-13', 'query=free%20speech')]
+    # Tweets posted after a date cannot sit in partitions captured before it
+    assert len(fragment_dirs(store, start='2024-05-13T00:00:00+00:00')) == 2
+
+
+def test_reads_apply_row_filters_and_decode_partition_values(tmp_path):
+    store = filled_store(tmp_path)
+
+    frame = store.read(columns=['tweet_id', 'query'], authors=['alice'])
+    assert sorted(zip(frame['tweet_id'], frame['query'])) == [('1', 'free speech'), ('3', '#news/live')]
+    frame = store.read(start='2024-05-13T09:40:00Z', end='2024-05-14T00:00:00Z')
+    assert list(frame['tweet_id']) == ['4']
+    assert list(frame['mentions'][0]) == ['someone']
+
+
+def test_compaction_merges_part_files_without_losing_rows(tmp_path):
+    store = filled_store(tmp_path)
+    store.append([tweet('5', 'dave', '2024-05-13T12:00:00.000Z')], 'free speech', '2024-05-13T12:30:00+00:00')
+
+    assert store.compact('2024-05-13') == 1
+    assert sorted(store.read(columns=['tweet_id'])['tweet_id']) == ['1', '2', '3', '4', '5']
+    assert len(fragment_dirs(store, queries=['free speech'], capture_start='2024-05-13T00:00:00+00:00')) == 1
@@ -0,0 +1,71 @@
+import asyncio
+
+from twitter import analysis
+from twitter.database import TwitterDatabase
+from twitter.metrics import NullMetrics
+from twitter.pipeline import IngestPipeline
+from twitter.scraper import TwitterScraper
+from twitter.worker import QueueWorker
+
+
+def bare_scraper(db, session_valid):
+    scraper = TwitterScraper.__new__(TwitterScraper)
+    scraper.db = db
+    scraper.jobs_run = 0
+    scraper.metrics = NullMetrics()
+    scraper.session_valid = session_valid
+
+    async def search_and_scrape(query, task_id=None, page=None):
+        # A login redirect marks the session invalid and yields no capture
+        scraper.session_valid = False
+        return None
+    scraper.search_and_scrape = search_and_scrape
+    return scraper
+
+
+def test_login_redirect_gives_the_task_back(tmp_path):
+    db = TwitterDatabase(db_path=str(tmp_path / 'queue.db'))
+    db.add_task('example query')
+    task = db.claim_next_task(worker_id='worker-1')
+
+    assert asyncio.run(bare_scraper(db, True).run_task(task)) is False
+    assert db.get_task(task.id).status == 'pending'
+
+
+def test_worker_replaces_an_expired_session(tmp_path, monkeypatch):
+    worker = QueueWorker('worker-1', db=TwitterDatabase(db_path=str(tmp_path / 'queue.db')))
+    expired = bare_scraper(worker.db, False)
+    closed = []
+
+    async def close():
+        closed.append(expired)
+    expired.close = close
+    worker._scraper = expired
+
+    async def setup_browser(self):
+        pass
+
+    async def login(self):
+        self.session_valid = True
+        return True
+    monkeypatch.setattr(TwitterScraper, 'setup_browser', setup_browser)
+    monkeypatch.setattr(TwitterScraper, 'login', login)
+
+    fresh = asyncio.run(worker._session(pool=None))
+    assert closed == [expired]
+    assert fresh is not expired and fresh.session_valid
+
+
+def test_network_sessions_share_one_record_pipeline(tmp_path, monkeypatch):
+    monkeypatch.setenv('CAPTURE_MODE', 'network')
+    monkeypatch.setattr(analysis, 'record_pipeline', IngestPipeline)
+    monkeypatch.setattr(TwitterScraper, 'setup_browser', lambda self: asyncio.sleep(0))
+    monkeypatch.setattr(TwitterScraper, 'login', lambda self: asyncio.sleep(0, result=True))
+    worker = QueueWorker('worker-1', db=TwitterDatabase(db_path=str(tmp_path / 'queue.db')))
+
+    first = asyncio.run(worker._session(pool=None))
+    worker._scraper = None
+    second = asyncio.run(worker._session(pool=None))
+
+    assert worker.records is not None
+    assert first.record_sink == second.record_sink == worker.records.ingest_records